@@ -0,0 +1,205 @@
+# cards.py - Startap kartochkalari: tayyor matn, klaviatura (JSON) va rasm file_id keshi
+#
+# Kalit: (startup_id, versiya, ko'rinish). Versiya - startups.updated_at va muallifning users.updated_at
+# (db.CARD_VERSION_COLUMNS), shuning uchun startap yoki muallif profili o'zgarsa (boshqa jarayonda bo'lsa ham)
+# eski kartochka ishlatilmaydi. Ko'rinish kartochka turi va unga ta'sir qiluvchi qiymatlar (sahifa, a'zolar soni).
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from telebot.types import InlineKeyboardButton, InlineKeyboardMarkup
+
+from media import is_bad_file_error, registry as media_registry
+
+logger = logging.getLogger(__name__)
+
+STATUS_TEXTS = {
+    'pending': '⏳ Kutilmoqda',
+    'active': '▶️ Boshlangan',
+    'completed': '✅ Yakunlangan',
+    'rejected': '❌ Rad etilgan'
+}
+
+class Card:
+    """Yuborishga tayyor kartochka: reply_markup JSON satr sifatida (telebot uni o'zgartirmasdan yuboradi)"""
+    __slots__ = ('caption', 'markup', 'photo')
+
+    def __init__(self, caption: str, markup: InlineKeyboardMarkup, photo: Optional[str] = None):
+        self.caption = caption
+        self.markup = markup.to_json()
+        self.photo = photo or None
+
+class CardCache:
+    """LRU kesh; versiyasi yo'q startap (JOIN siz so'rovdan) keshlanmaydi"""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, startup, view: tuple, render: Callable[[], Card]) -> Card:
+        if 'version' not in startup:
+            return render()
+        key = (startup['id'], startup['version'], startup.get('owner_updated_at'), view)
+        with self._lock:
+            card = self._entries.get(key)
+            if card is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return card
+            self.misses += 1
+
+        card = render()
+        with self._lock:
+            self._entries[key] = card
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return card
+
+    def invalidate(self, startup_id=None):
+        """Shu jarayondagi yozuvdan keyin eski versiyalarni xotiradan tashlash (startup_id bo'lmasa - hammasi)"""
+        with self._lock:
+            if startup_id is None:
+                self._entries.clear()
+                return
+            startup_id = int(startup_id)
+            for key in [key for key in self._entries if key[0] == startup_id]:
+                del self._entries[key]
+
+card_cache = CardCache(max_entries=int(os.getenv('CARD_CACHE_SIZE', 1024)))
+
+def owner_name(startup) -> str:
+    """Muallif ismi JOIN maydonlaridan (alohida get_user so'rovisiz)"""
+    name = f"{startup.get('owner_first_name') or ''} {startup.get('owner_last_name') or ''}".strip()
+    return name or "Noma'lum"
+
+# =========== KO'RINISHLAR ===========
+
+def browse_card(startup, page: int, total_pages: int) -> Card:
+    """Startaplar ro'yxatidagi bitta sahifa"""
+    def render():
+        text = (
+            f"<b>🌐 Startaplar</b>\n"
+            f"📄 Sahifa: <b>{page}/{total_pages}</b>\n\n"
+            f"🎯 <b>{startup['name']}</b>\n"
+            f"📌 {startup['description'][:200]}...\n"
+            f"👤 <b>Muallif:</b> {owner_name(startup)}"
+        )
+
+        markup = InlineKeyboardMarkup()
+        markup.add(InlineKeyboardButton('🤝 Startupga qo\'shilish', callback_data=f'join_startup_{startup["id"]}'))
+
+        nav_buttons = []
+        if page > 1:
+            nav_buttons.append(InlineKeyboardButton('⏮️ Oldingi', callback_data=f'startup_page_{page-1}'))
+        if page < total_pages:
+            nav_buttons.append(InlineKeyboardButton('⏭️ Keyingi', callback_data=f'startup_page_{page+1}'))
+
+        if nav_buttons:
+            markup.row(*nav_buttons)
+
+        markup.add(InlineKeyboardButton('🔙 Orqaga', callback_data='back_to_main_menu'))
+        return Card(text, markup, startup.get('logo'))
+    return card_cache.get(startup, ('browse', page, total_pages), render)
+
+def owner_card(startup, total_members: int) -> Card:
+    """Muallifning o'z startapi (Mening startaplarim -> startap)"""
+    def render():
+        startup_id = startup['id']
+        start_date = startup.get('started_at') or '—'
+        if start_date != '—':
+            start_date = start_date[:10]
+
+        text = (
+            f"🎯 <b>Nomi:</b> {startup['name']}\n"
+            f"📊 <b>Holati:</b> {STATUS_TEXTS.get(startup['status'], startup['status'])}\n"
+            f"📅 <b>Boshlanish sanasi:</b> {start_date}\n"
+            f"👤 <b>Muallif:</b> {owner_name(startup)}\n"
+            f"👥 <b>A'zolar:</b> {total_members} ta\n"
+            f"📌 <b>Tavsif:</b> {startup['description'][:500]}"
+        )
+
+        markup = InlineKeyboardMarkup()
+
+        if startup['status'] == 'pending':
+            markup.add(InlineKeyboardButton('⏳ Admin tasdigini kutyapti', callback_data='waiting_approval'))
+        elif startup['status'] == 'active':
+            markup.add(InlineKeyboardButton('👥 A\'zolar', callback_data=f'view_members_{startup_id}_1'))
+            markup.add(InlineKeyboardButton('⏹️ Yakunlash', callback_data=f'complete_startup_{startup_id}'))
+        elif startup['status'] == 'completed':
+            markup.add(InlineKeyboardButton('👥 A\'zolar', callback_data=f'view_members_{startup_id}_1'))
+            if startup.get('results'):
+                markup.add(InlineKeyboardButton('📊 Natijalar', callback_data=f'view_results_{startup_id}'))
+        elif startup['status'] == 'rejected':
+            markup.add(InlineKeyboardButton('❌ Rad etilgan', callback_data='rejected_info'))
+
+        markup.add(InlineKeyboardButton('🔙 Orqaga', callback_data='back_to_my_startups'))
+        return Card(text, markup, startup.get('logo'))
+    return card_cache.get(startup, ('owner', total_members), render)
+
+def admin_card(startup) -> Card:
+    """Admin paneldagi startap tafsilotlari"""
+    def render():
+        startup_id = startup['id']
+        owner_contact = f"@{startup['owner_username']}" if startup.get('owner_username') else f"ID: {startup['owner_id']}"
+
+        text = (
+            f"🖼 <b>Startup ma'lumotlari</b>\n\n"
+            f"🎯 <b>Nomi:</b> {startup['name']}\n"
+            f"📌 <b>Tavsif:</b> {startup['description']}\n\n"
+            f"👤 <b>Muallif:</b> {owner_name(startup)}\n"
+            f"📱 <b>Aloqa:</b> {owner_contact}\n"
+            f"🔗 <b>Guruh havolasi:</b> {startup['group_link']}\n"
+            f"📅 <b>Yaratilgan sana:</b> {startup['created_at'][:10] if startup.get('created_at') else '—'}\n"
+            f"📊 <b>Holati:</b> {startup['status']}"
+        )
+
+        markup = InlineKeyboardMarkup()
+
+        if startup['status'] == 'pending':
+            markup.add(
+                InlineKeyboardButton('✅ Tasdiqlash', callback_data=f'admin_approve_{startup_id}'),
+                InlineKeyboardButton('❌ Rad etish', callback_data=f'admin_reject_{startup_id}')
+            )
+        elif startup['status'] == 'active':
+            markup.add(InlineKeyboardButton('✅ Faol', callback_data='already_active'))
+        elif startup['status'] == 'completed':
+            markup.add(InlineKeyboardButton('✅ Yakunlangan', callback_data='already_completed'))
+        elif startup['status'] == 'rejected':
+            markup.add(InlineKeyboardButton('❌ Rad etilgan', callback_data='already_rejected'))
+
+        markup.add(InlineKeyboardButton('🔙 Orqaga', callback_data='pending_startups_1'))
+        return Card(text, markup, startup.get('logo'))
+    return card_cache.get(startup, ('admin',), render)
+
+def channel_card(startup, bot_username: str) -> Card:
+    """Tasdiqlangan startap uchun kanal posti"""
+    def render():
+        text = (
+            f"🚀 <b>{startup['name']}</b>\n\n"
+            f"📝 {startup['description']}\n\n"
+            f"👤 <b>Muallif:</b> {owner_name(startup)}\n\n"
+            f"👉 <b>Startupga qo'shilish uchun pastdagi tugmani bosing.</b>\n"
+            f"➕ <b>O'z startupingizni yaratish uchun:</b> @{bot_username}"
+        )
+
+        markup = InlineKeyboardMarkup()
+        markup.add(InlineKeyboardButton('🤝 Startupga qo\'shilish', callback_data=f'join_startup_{startup["id"]}'))
+        return Card(text, markup, startup.get('logo'))
+    return card_cache.get(startup, ('channel', bot_username), render)
+
+def send_card(bot, chat_id, card: Card):
+    """Rasmli bo'lsa send_photo, aks holda (yoki rasm yuborilmasa) send_message"""
+    if card.photo and media_registry.is_valid(card.photo):
+        try:
+            return bot.send_photo(chat_id, card.photo, caption=card.caption, reply_markup=card.markup)
+        except Exception as e:
+            # Yaroqsiz file_id keyingi safar so'ralmaydi - kartochka darhol matn bilan yuboriladi
+            if is_bad_file_error(e):
+                media_registry.invalidate(card.photo)
+            logger.error(f"Rasm yuborishda xatolik, matn yuboriladi: {e}")
+    return bot.send_message(chat_id, card.caption, reply_markup=card.markup)
@@ -0,0 +1,131 @@
+# compression.py - Javoblarni gzip/brotli bilan siqish (Accept-Encoding bo'yicha)
+import gzip
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Optional
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json', 'application/x-ndjson', 'application/javascript',
+    'text/html', 'text/css', 'text/javascript', 'text/plain', 'text/csv', 'image/svg+xml'
+}
+
+# Siqilgan ETag lar shu qo'shimchalarga ega bo'ladi ("abc" -> "abc-gzip")
+ETAG_SUFFIXES = ('-br', '-gzip')
+
+class Compressor:
+    """after_request hook: javob tanasini siqish; statik fayllar siqilgan holda keshlanadi"""
+
+    def __init__(self, app=None, min_size: int = 500, gzip_level: int = 6,
+                 brotli_quality: int = 5, static_cache_size: int = 64):
+        self.min_size = min_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.static_cache_size = static_cache_size
+        self._static_cache = OrderedDict()
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.after_request(self.after_request)
+
+    def choose_encoding(self, request, streamed: bool = False) -> Optional[str]:
+        """Mijoz qabul qiladigan eng yaxshi kodlash"""
+        accept = request.accept_encodings
+        if brotli is not None and not streamed and accept['br'] > 0:
+            return 'br'
+        if accept['gzip'] > 0:
+            return 'gzip'
+        return None
+
+    def compress(self, data: bytes, encoding: str) -> bytes:
+        if encoding == 'br':
+            return brotli.compress(data, quality=self.brotli_quality)
+        return gzip.compress(data, compresslevel=self.gzip_level, mtime=0)
+
+    def _compress_stream(self, iterable):
+        # wbits=31 - gzip konteyneri
+        compressor = zlib.compressobj(self.gzip_level, zlib.DEFLATED, 31)
+        for chunk in iterable:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.flush()
+
+    def _static_body(self, key, data_loader, encoding: str) -> bytes:
+        with self._lock:
+            body = self._static_cache.get(key)
+            if body is not None:
+                self._static_cache.move_to_end(key)
+                return body
+        body = self.compress(data_loader(), encoding)
+        with self._lock:
+            self._static_cache[key] = body
+            while len(self._static_cache) > self.static_cache_size:
+                self._static_cache.popitem(last=False)
+        return body
+
+    def after_request(self, response):
+        from flask import request
+
+        if (response.status_code != 200
+                or 'Content-Encoding' in response.headers
+                or response.mimetype not in COMPRESSIBLE_MIMETYPES
+                or request.method == 'HEAD'):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        is_static = response.direct_passthrough
+        streamed = response.is_streamed and not is_static
+
+        encoding = self.choose_encoding(request, streamed=streamed)
+        if encoding is None:
+            return response
+
+        etag, weak = response.get_etag()
+        if etag and request.if_none_match.contains_weak(f"{etag}-{encoding}"):
+            # Mijozda shu kodlashdagi nusxa bor - tanani siqmasdan 304
+            response.status_code = 304
+            response.direct_passthrough = False
+            response.set_data(b'')
+            response.set_etag(f"{etag}-{encoding}", weak=weak)
+            response.headers.pop('Content-Length', None)
+            return response
+
+        if streamed:
+            # Uzunligi noma'lum oqim - gzip bo'laklab siqiladi
+            response.response = self._compress_stream(response.response)
+            response.headers.pop('Content-Length', None)
+        else:
+            content_length = response.content_length
+            if content_length is not None and content_length < self.min_size:
+                return response
+
+            if is_static:
+                # send_file javobi: fayl bir marta o'qilib, siqilgan nusxa ETag bo'yicha keshlanadi
+                response.direct_passthrough = False
+                key = (request.path, response.headers.get('ETag'), encoding)
+                body = self._static_body(key, response.get_data, encoding)
+            else:
+                data = response.get_data()
+                if len(data) < self.min_size:
+                    return response
+                body = self.compress(data, encoding)
+            response.set_data(body)
+
+        response.headers['Content-Encoding'] = encoding
+        if etag:
+            response.set_etag(f"{etag}-{encoding}", weak=weak)
+        return response
+
+def etag_variants(etag: str):
+    """Asl ETag va uning siqilgan ko'rinishlari"""
+    return (etag,) + tuple(etag + suffix for suffix in ETAG_SUFFIXES)
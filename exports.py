@@ -0,0 +1,63 @@
+# exports.py - Partiyalab keladigan qatorlarni CSV / JSON lines ko'rinishida oqim (stream) qilish
+import csv
+import io
+import os
+import threading
+from datetime import datetime
+from typing import Iterable, List, Sequence
+
+from flask import Response
+
+from json_provider import dumpb
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson'
+}
+
+# Bir vaqtda ishlaydigan eksportlar (har biri pooldan bitta ulanishni oqim davomida band qiladi)
+EXPORT_MAX_CONCURRENT = int(os.getenv('EXPORT_MAX_CONCURRENT', 2))
+_export_slots = threading.BoundedSemaphore(EXPORT_MAX_CONCURRENT)
+
+class ExportBusy(Exception):
+    """Bo'sh eksport sloti yo'q"""
+
+def csv_chunks(columns: Sequence[str], batches: Iterable[List[tuple]]) -> Iterable[bytes]:
+    # BOM - Excel UTF-8 (kirill/lotin) matnni to'g'ri ochishi uchun
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield b'\xef\xbb\xbf' + buffer.getvalue().encode('utf-8')
+    for rows in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(rows)
+        yield buffer.getvalue().encode('utf-8')
+
+def jsonl_chunks(columns: Sequence[str], batches: Iterable[List[tuple]]) -> Iterable[bytes]:
+    for rows in batches:
+        yield b''.join(dumpb(dict(zip(columns, row))) + b'\n' for row in rows)
+
+def export_response(name: str, fmt: str, columns: Sequence[str], batches: Iterable[List[tuple]]) -> Response:
+    """Eksport javobi; slot oqim tugaguncha (yoki mijoz uzilguncha) band turadi"""
+    if not _export_slots.acquire(blocking=False):
+        raise ExportBusy("Boshqa eksportlar ishlamoqda, keyinroq urinib ko'ring")
+
+    chunks = csv_chunks if fmt == 'csv' else jsonl_chunks
+
+    def generate():
+        try:
+            yield from chunks(columns, batches)
+        finally:
+            batches_close = getattr(batches, 'close', None)
+            if batches_close is not None:
+                # Mijoz uzilsa ham named cursor yopilib, ulanish poolga darhol qaytadi
+                batches_close()
+
+    filename = f"{name}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.{fmt}"
+    response = Response(generate(), mimetype=EXPORT_FORMATS[fmt])
+    # Javob yopilganda (oqim o'qilmagan bo'lsa ham) slot bo'shatiladi
+    response.call_on_close(_export_slots.release)
+    response.headers['Content-Disposition'] = f'attachment; filename={filename}'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
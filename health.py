@@ -0,0 +1,138 @@
+# health.py - Fon health monitor: DB, pool va bot holati xotirada keshlanadi (/livez, /readyz)
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+from db import db_instance, is_db_ready, check_database_connection
+
+logger = logging.getLogger(__name__)
+
+# DB tekshiruvlari orasidagi interval (soniya)
+HEALTH_CHECK_INTERVAL = float(os.getenv('HEALTH_CHECK_INTERVAL', 10))
+# Pool shu ulushdan ko'p band bo'lsa servis tayyor emas deb hisoblanadi
+POOL_SATURATION_THRESHOLD = float(os.getenv('HEALTH_POOL_SATURATION', 0.9))
+
+def pool_stats(database=db_instance) -> Dict:
+    """Pool holati - faqat xotiradagi ro'yxatlar o'qiladi, DB ga murojaat yo'q"""
+    pool = database._connection_pool
+    if pool is None:
+        return {'ready': False, 'in_use': 0, 'idle': 0, 'max': 0, 'utilization': 0.0,
+                'reconnecting': database.is_reconnecting}
+    in_use = len(pool._used)
+    return {
+        'ready': True,
+        'in_use': in_use,
+        'idle': len(pool._pool),
+        'max': pool.maxconn,
+        'utilization': round(in_use / pool.maxconn, 3) if pool.maxconn else 0.0,
+        'reconnecting': False
+    }
+
+class HealthMonitor:
+    """Komponentlarni fonda tekshiradi; probelar faqat oxirgi natijani o'qiydi"""
+
+    def __init__(self, interval: float = HEALTH_CHECK_INTERVAL,
+                 saturation_threshold: float = POOL_SATURATION_THRESHOLD):
+        self.interval = interval
+        self.saturation_threshold = saturation_threshold
+        self.started_at = time.time()
+        self._checks: Dict[str, Callable[[], bool]] = {'database': self._check_database}
+        self._status: Dict[str, Dict] = {}
+        self._last_run: Optional[float] = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def register(self, name: str, check: Callable[[], bool]):
+        """Qo'shimcha komponent (masalan bot) tekshiruvi"""
+        self._checks[name] = check
+
+    def start(self):
+        """Fon threadini ishga tushirish (takroriy chaqiruv xavfsiz)"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='health-monitor', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.run_checks()
+            self._stop.wait(self.interval)
+
+    def _check_database(self) -> bool:
+        if not is_db_ready():
+            return False
+        stats = pool_stats()
+        if stats['max'] and stats['in_use'] >= stats['max']:
+            # Pool to'la - SELECT 1 uchun ulanish olinmaydi, oxirgi natija saqlanadi
+            previous = self._status.get('database')
+            return previous['ok'] if previous else True
+        return check_database_connection()
+
+    def run_checks(self):
+        """Barcha tekshiruvlarni bir marta bajarish"""
+        for name, check in list(self._checks.items()):
+            start = time.perf_counter()
+            error = None
+            try:
+                ok = bool(check())
+            except Exception as e:
+                ok = False
+                error = str(e)
+            now = time.time()
+            previous = self._status.get(name) or {}
+            status = {
+                'ok': ok,
+                'checked_at': datetime.fromtimestamp(now).isoformat(timespec='seconds'),
+                'latency_ms': round((time.perf_counter() - start) * 1000, 2),
+                'last_ok_at': datetime.fromtimestamp(now).isoformat(timespec='seconds') if ok else previous.get('last_ok_at')
+            }
+            if error:
+                status['error'] = error
+            if ok != previous.get('ok', ok):
+                logger.warning(f"Health: {name} {'tiklandi' if ok else 'ishlamayapti'}")
+            self._status[name] = status
+        self._last_run = time.time()
+
+    def ensure_started(self):
+        """Birinchi probe da: hali tekshiruv bo'lmagan bo'lsa sinxron bajarib, threadni ishga tushirish"""
+        if self._last_run is None:
+            with self._lock:
+                if self._last_run is None:
+                    self.run_checks()
+        if self._thread is None:
+            self.start()
+
+    @property
+    def is_stale(self) -> bool:
+        """Monitor threadi osilib qolgan (natijalar juda eski)"""
+        return self._last_run is None or time.time() - self._last_run > self.interval * 3 + 5
+
+    def liveness(self) -> Dict:
+        self.ensure_started()
+        return {
+            'status': 'dead' if self.is_stale else 'alive',
+            'uptime_seconds': int(time.time() - self.started_at)
+        }
+
+    def readiness(self) -> Dict:
+        self.ensure_started()
+        pool = pool_stats()
+        saturated = pool['ready'] and pool['utilization'] >= self.saturation_threshold
+        database = self._status.get('database', {'ok': False})
+        ready = database['ok'] and pool['ready'] and not saturated and not self.is_stale
+        return {
+            'status': 'ready' if ready else 'not_ready',
+            'checks': dict(self._status),
+            'pool': dict(pool, saturated=saturated)
+        }
+
+health_monitor = HealthMonitor()
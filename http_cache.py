@@ -0,0 +1,132 @@
+# http_cache.py - Faqat o'qiladigan admin endpointlari uchun ETag/Last-Modified va javob keshi
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime, time as dt_time
+from functools import wraps
+
+from flask import current_app, request
+from werkzeug.http import http_date, parse_date
+
+from compression import etag_variants
+from db import get_data_version
+
+class ResponseCache:
+    """Route + argumentlar bo'yicha keshlangan javoblar; ma'lumot versiyasi o'zgarsa eskiradi"""
+
+    def __init__(self, max_entries: int = 256, version_ttl: float = 2.0):
+        self.max_entries = max_entries
+        # Versiya tokeni shu muddat (soniya) davomida DB ga qayta so'ralmaydi
+        self.version_ttl = version_ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = None
+        self._version_checked_at = 0.0
+        self.hits = 0
+        self.misses = 0
+
+    def invalidate(self):
+        """Shu jarayondagi yozuvdan keyin: barcha kesh va versiya tokenini tashlash"""
+        with self._lock:
+            self._entries.clear()
+            self._version_checked_at = 0.0
+
+    def data_version(self):
+        """Keshlangan ma'lumot versiyasi (oxirgi o'zgarish vaqti) yoki None"""
+        now = time.monotonic()
+        if now - self._version_checked_at < self.version_ttl:
+            return self._version
+        version = get_data_version()
+        with self._lock:
+            self._version = version
+            self._version_checked_at = now if version is not None else 0.0
+        return version
+
+    def _etag(self, key, version) -> str:
+        # Faqat ma'lumot versiyasi va sanadan - barcha gunicorn workerlarda bir xil ETag.
+        # Sana: "bugun" ga bog'liq statistikalar kun almashganda yangilanadi
+        raw = f"{key}|{version.timestamp()}|{date.today().isoformat()}"
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def _get(self, key, etag):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != etag:
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def _put(self, key, etag, body: bytes, mimetype: str):
+        with self._lock:
+            self._entries[key] = (etag, body, mimetype)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def cached(self, view):
+        """GET view uchun: 304 javoblar, ETag/Last-Modified va server tomonidagi kesh"""
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            version = self.data_version()
+            if version is None:
+                # Versiya noma'lum (DB muammosi) - keshsiz ishlash
+                return view(*args, **kwargs)
+
+            key = (request.path, tuple(sorted(request.args.items(multi=True))))
+            etag = self._etag(key, version)
+            # Kun boshidan oldingi sana qaytarilmaydi (If-Modified-Since ham kun almashganda eskiradi)
+            modified = max(version, datetime.combine(date.today(), dt_time.min).astimezone())
+            headers = {
+                'ETag': f'"{etag}"',
+                'Last-Modified': http_date(modified),
+                'Cache-Control': 'private, no-cache'
+            }
+
+            if self._not_modified(etag, modified):
+                self.hits += 1
+                return current_app.response_class(status=304, headers=headers)
+
+            entry = self._get(key, etag)
+            if entry is not None:
+                self.hits += 1
+                response = current_app.response_class(entry[1], mimetype=entry[2], headers=headers)
+                response.headers['X-Cache'] = 'HIT'
+                return response
+
+            self.misses += 1
+            response = current_app.make_response(view(*args, **kwargs))
+            if response.status_code == 200 and not response.is_streamed:
+                self._put(key, etag, response.get_data(), response.mimetype)
+                response.headers.update(headers)
+                response.headers['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+
+    def invalidates(self, view):
+        """Keshlangan ma'lumotni o'zgartiradigan view uchun: muvaffaqiyatli javobdan keyin keshni tozalash"""
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            response = current_app.make_response(view(*args, **kwargs))
+            if response.status_code < 400:
+                self.invalidate()
+            return response
+        return wrapper
+
+    @staticmethod
+    def _not_modified(etag: str, modified) -> bool:
+        if_none_match = request.if_none_match
+        if if_none_match:
+            # Siqilgan javobning ETag i ("<etag>-gzip") ham mos keladi
+            return any(if_none_match.contains(variant) for variant in etag_variants(etag))
+        if_modified_since = request.headers.get('If-Modified-Since')
+        if if_modified_since:
+            since = parse_date(if_modified_since)
+            return since is not None and int(modified.timestamp()) <= int(since.timestamp())
+        return False
+
+response_cache = ResponseCache(
+    max_entries=int(os.getenv('HTTP_CACHE_MAX_ENTRIES', 256)),
+    version_ttl=float(os.getenv('HTTP_CACHE_VERSION_TTL', 2))
+)
@@ -0,0 +1,78 @@
+# json_provider.py - Flask uchun tezkor JSON provider (orjson bo'lsa undan foydalanadi)
+import json
+import decimal
+from datetime import date, datetime
+from typing import Any, Dict, Iterable
+
+from flask import Response
+from flask.json.provider import JSONProvider
+
+from models import Row
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Katta massivlar shu o'lchamdagi bo'laklarda kodlanadi
+STREAM_CHUNK_SIZE = 500
+
+if orjson is not None:
+    ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+def _default(obj: Any) -> Any:
+    """Standart JSON kodlay olmaydigan turlar"""
+    if isinstance(obj, Row):
+        return obj.to_dict()
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dumpb(obj: Any) -> bytes:
+    """Obyektni ixcham (pretty-print siz) UTF-8 JSON baytlariga kodlash"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=ORJSON_OPTIONS)
+    return json.dumps(obj, default=_default, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+class FastJSONProvider(JSONProvider):
+    """jsonify() va request.json uchun provider"""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if kwargs:
+            kwargs.setdefault('default', _default)
+            kwargs.setdefault('ensure_ascii', False)
+            return json.dumps(obj, **kwargs)
+        return dumpb(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs: Any) -> Any:
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumpb(obj), mimetype='application/json')
+
+def stream_json(envelope: Dict, key: str, items: Iterable, chunk_size: int = STREAM_CHUNK_SIZE) -> Response:
+    """{**envelope, key: [items...]} javobini bo'laklab yuborish (butun massiv xotirada yig'ilmaydi)"""
+    def generate():
+        head = dumpb(envelope)[:-1]
+        yield head + (b',' if envelope else b'') + dumpb(key) + b':['
+
+        first = True
+        chunk = []
+        for item in items:
+            chunk.append(item)
+            if len(chunk) >= chunk_size:
+                yield (b'' if first else b',') + dumpb(chunk)[1:-1]
+                first = False
+                chunk = []
+        if chunk:
+            yield (b'' if first else b',') + dumpb(chunk)[1:-1]
+        yield b']}'
+
+    return Response(generate(), mimetype='application/json')
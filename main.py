@@ -1,6 +1,8 @@
 # main.py - PostgreSQL version
+import io
 import os
 import logging
+import threading
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 import telebot
@@ -11,6 +13,13 @@ from telebot import types
 from telebot.types import InlineKeyboardMarkup, InlineKeyboardButton, ReplyKeyboardMarkup, KeyboardButton, ReplyKeyboardRemove
 from dotenv import load_dotenv
 
+import metrics
+import profiler
+import telegram_api
+import tracing
+from cards import admin_card, browse_card, card_cache, channel_card, owner_card, send_card
+from media import PhotoFanout, registry as media_registry
+
 # Environment o'qish
 load_dotenv()
 
@@ -30,6 +39,9 @@ except ValueError:
 
 bot = telebot.TeleBot(BOT_TOKEN, parse_mode='HTML')
 
+# Telegram API so'rovlari umumiy transport orqali (latency va 429 metrikalari)
+telegram_api.install()
+
 # Logger sozlash - Render uchun
 logging.basicConfig(
     level=logging.INFO,
@@ -41,37 +53,17 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# PostgreSQL import
-try:
-    from db import (
-        init_db,
-        get_user, save_user, update_user_field,
-        create_startup, get_startup, get_startups_by_owner,
-        get_pending_startups, get_active_startups, update_startup_status, update_startup_results,
-        add_startup_member, get_join_request_id, update_join_request,
-        get_startup_members, get_statistics, get_all_users,
-        get_recent_users, get_recent_startups, get_completed_startups,
-        get_rejected_startups, get_all_startup_members,
-        check_database_connection
-    )
-    DB_AVAILABLE = True
-except ImportError as e:
-    logger.error(f"Database import xatosi: {e}")
-    DB_AVAILABLE = False
-except Exception as e:
-    logger.error(f"Database ulanish xatosi: {e}")
-    DB_AVAILABLE = False
-
-# Database initialization
-try:
-    if DB_AVAILABLE:
-        init_db()
-        logger.info("PostgreSQL database muvaffaqiyatli ishga tushirildi")
-    else:
-        logger.warning("Database ulanmagan, faqat cheklangan funksiyalar ishlaydi")
-except Exception as e:
-    logger.error(f"Database ishga tushirish xatosi: {e}")
-    DB_AVAILABLE = False
+# PostgreSQL import (ulanish birinchi murojaatda ochiladi)
+from db import (
+    init_db, db_instance, is_db_ready,
+    get_user, save_user, update_user_field,
+    create_startup, get_startup, get_startups_by_owner,
+    get_pending_startups, get_active_startups, update_startup_status, update_startup_results,
+    add_startup_member, get_join_request_id, update_join_request,
+    get_startup_members, get_statistics, get_all_users,
+    get_recent_users, get_recent_startups, get_completed_startups,
+    get_rejected_startups, get_all_startup_members
+)
 
 # User state management
 user_states = {}
@@ -92,6 +84,8 @@ def create_back_button():
     markup.add(KeyboardButton('🔙 Orqaga'))
     return markup
 
+MAIN_MENU_TEXT = "👋 <b>Assalomu alaykum!</b>\n\n🚀 <b>GarajHub</b> — startaplar uchun platforma.\n\nQuyidagilardan birini tanlang:"
+
 # Asosiy menyu tugmalari
 def create_main_menu(user_id: int):
     markup = ReplyKeyboardMarkup(resize_keyboard=True, row_width=2)
@@ -116,7 +110,7 @@ def start_command(message):
         username = message.from_user.username or ""
         first_name = message.from_user.first_name or ""
         
-        if DB_AVAILABLE:
+        if is_db_ready():
             save_user(user_id, username, first_name)
         else:
             logger.warning(f"Database ulanmagan, foydalanuvchi saqlanmadi: {user_id}")
@@ -137,19 +131,23 @@ def start_command(message):
         logger.error(f"Start command xatosi: {e}")
         bot.send_message(message.chat.id, "⚠️ <b>Xatolik yuz berdi. Iltimos, keyinroq urinib ko'ring.</b>")
 
+def build_subscription_prompt():
+    """Kanalga obuna so'rovi: matn va tugmalar (main_async bilan umumiy)"""
+    markup = InlineKeyboardMarkup()
+    markup.row(
+        InlineKeyboardButton('🔗 Kanalga o\'tish', url=f'https://t.me/{CHANNEL_USERNAME[1:]}'),
+        InlineKeyboardButton('✅ Tekshirish', callback_data='check_subscription')
+    )
+    text = (
+        "🤖 <b>GarajHub Bot</b>\n\n"
+        "Botdan foydalanish uchun avval kanalimizga obuna bo'ling 👇"
+    )
+    return text, markup
+
 def ask_for_subscription(message):
     try:
-        markup = InlineKeyboardMarkup()
-        markup.row(
-            InlineKeyboardButton('🔗 Kanalga o\'tish', url=f'https://t.me/{CHANNEL_USERNAME[1:]}'),
-            InlineKeyboardButton('✅ Tekshirish', callback_data='check_subscription')
-        )
-        bot.send_message(
-            message.chat.id,
-            "🤖 <b>GarajHub Bot</b>\n\n"
-            "Botdan foydalanish uchun avval kanalimizga obuna bo'ling 👇",
-            reply_markup=markup
-        )
+        text, markup = build_subscription_prompt()
+        bot.send_message(message.chat.id, text, reply_markup=markup)
     except Exception as e:
         logger.error(f"Ask for subscription xatosi: {e}")
 
@@ -182,20 +180,43 @@ def show_main_menu(message_or_call):
         user_id = message_or_call.from_user.id if isinstance(message_or_call, types.CallbackQuery) else message_or_call.from_user.id
         clear_user_state(user_id)
         
-        text = "👋 <b>Assalomu alaykum!</b>\n\n🚀 <b>GarajHub</b> — startaplar uchun platforma.\n\nQuyidagilardan birini tanlang:"
-        
-        bot.send_message(chat_id, text, reply_markup=create_main_menu(user_id))
+        bot.send_message(chat_id, MAIN_MENU_TEXT, reply_markup=create_main_menu(user_id))
     except Exception as e:
         logger.error(f"Show main menu xatosi: {e}")
 
 # 2. PROFIL
+def build_profile(user):
+    """Profil matni va tahrirlash tugmalari (main_async bilan umumiy)"""
+    profile_text = (
+        "👤 <b>Profil ma'lumotlari:</b>\n\n"
+        f"🧑 <b>Ism:</b> {user.get('first_name', '—')}\n"
+        f"🧾 <b>Familiya:</b> {user.get('last_name', '—')}\n"
+        f"⚧️ <b>Jins:</b> {user.get('gender', '—')}\n"
+        f"📞 <b>Telefon:</b> {user.get('phone', '—')}\n"
+        f"🎂 <b>Tug'ilgan sana:</b> {user.get('birth_date', '—')}\n"
+        f"📝 <b>Bio:</b> {user.get('bio', '—')}\n\n"
+        "🛠 <b>Tahrirlash uchun tugmalardan birini tanlang:</b>"
+    )
+    
+    markup_inline = InlineKeyboardMarkup(row_width=2)
+    markup_inline.add(
+        InlineKeyboardButton('✏️ Ism', callback_data='edit_first_name'),
+        InlineKeyboardButton('✏️ Familiya', callback_data='edit_last_name'),
+        InlineKeyboardButton('📞 Telefon', callback_data='edit_phone'),
+        InlineKeyboardButton('⚧️ Jins', callback_data='edit_gender'),
+        InlineKeyboardButton('🎂 Tug\'ilgan sana', callback_data='edit_birth_date'),
+        InlineKeyboardButton('📝 Bio', callback_data='edit_bio')
+    )
+    markup_inline.add(InlineKeyboardButton('🔙 Orqaga', callback_data='back_to_main_menu'))
+    return profile_text, markup_inline
+
 @bot.message_handler(func=lambda message: message.text == '👤 Profil')
 def show_profile(message):
     try:
         user_id = message.from_user.id
         set_user_state(user_id, 'in_profile')
         
-        if not DB_AVAILABLE:
+        if not is_db_ready():
             bot.send_message(message.chat.id, "⚠️ <b>Database ulanmagan. Profil ma'lumotlari ko'rsatilmaydi.</b>")
             return
         
@@ -204,27 +225,7 @@ def show_profile(message):
             save_user(user_id, message.from_user.username or "", message.from_user.first_name or "")
             user = get_user(user_id)
         
-        profile_text = (
-            "👤 <b>Profil ma'lumotlari:</b>\n\n"
-            f"🧑 <b>Ism:</b> {user.get('first_name', '—')}\n"
-            f"🧾 <b>Familiya:</b> {user.get('last_name', '—')}\n"
-            f"⚧️ <b>Jins:</b> {user.get('gender', '—')}\n"
-            f"📞 <b>Telefon:</b> {user.get('phone', '—')}\n"
-            f"🎂 <b>Tug'ilgan sana:</b> {user.get('birth_date', '—')}\n"
-            f"📝 <b>Bio:</b> {user.get('bio', '—')}\n\n"
-            "🛠 <b>Tahrirlash uchun tugmalardan birini tanlang:</b>"
-        )
-        
-        markup_inline = InlineKeyboardMarkup(row_width=2)
-        markup_inline.add(
-            InlineKeyboardButton('✏️ Ism', callback_data='edit_first_name'),
-            InlineKeyboardButton('✏️ Familiya', callback_data='edit_last_name'),
-            InlineKeyboardButton('📞 Telefon', callback_data='edit_phone'),
-            InlineKeyboardButton('⚧️ Jins', callback_data='edit_gender'),
-            InlineKeyboardButton('🎂 Tug\'ilgan sana', callback_data='edit_birth_date'),
-            InlineKeyboardButton('📝 Bio', callback_data='edit_bio')
-        )
-        markup_inline.add(InlineKeyboardButton('🔙 Orqaga', callback_data='back_to_main_menu'))
+        profile_text, markup_inline = build_profile(user)
 
         bot.send_message(message.chat.id, profile_text, reply_markup=markup_inline)
     except Exception as e:
@@ -236,7 +237,7 @@ def handle_edit_profile(call):
     try:
         user_id = call.from_user.id
         
-        if not DB_AVAILABLE:
+        if not is_db_ready():
             bot.answer_callback_query(call.id, "⚠️ Database ulanmagan!", show_alert=True)
             return
         
@@ -291,7 +292,7 @@ def process_first_name(message):
             clear_user_state(user_id)
             return
         
-        if DB_AVAILABLE:
+        if is_db_ready():
             update_user_field(user_id, 'first_name', message.text)
             bot.send_message(message.chat.id, "✅ <b>Ismingiz muvaffaqiyatli saqlandi</b>", reply_markup=create_back_button())
             show_profile(message)
@@ -309,7 +310,7 @@ def process_last_name(message):
             clear_user_state(user_id)
             return
         
-        if DB_AVAILABLE:
+        if is_db_ready():
             update_user_field(user_id, 'last_name', message.text)
             bot.send_message(message.chat.id, "✅ <b>Familiyangiz muvaffaqiyatli saqlandi</b>", reply_markup=create_back_button())
             show_profile(message)
@@ -339,7 +340,7 @@ def process_phone(message):
             bot.register_next_step_handler(msg, process_phone)
             return
         
-        if DB_AVAILABLE:
+        if is_db_ready():
             update_user_field(user_id, 'phone', phone)
             bot.send_message(message.chat.id, "✅ <b>Telefon raqami muvaffaqiyatli saqlandi</b>", reply_markup=create_back_button())
             show_profile(message)
@@ -354,15 +355,8 @@ def process_gender(call):
         user_id = call.from_user.id
         gender = 'Erkak' if call.data == 'gender_male' else 'Ayol'
         
-        if DB_AVAILABLE:
-            # PostgreSQL uchun gender maydoni qo'shish
-            from db import db_instance
-            with db_instance.get_cursor() as cur:
-                cur.execute("""
-                    UPDATE users 
-                    SET gender = %s, updated_at = CURRENT_TIMESTAMP
-                    WHERE user_id = %s
-                """, (gender, user_id))
+        if is_db_ready():
+            update_user_field(user_id, 'gender', gender)
             
             bot.delete_message(call.message.chat.id, call.message.message_id)
             bot.send_message(call.message.chat.id, "✅ <b>Jins muvaffaqiyatli saqlandi</b>", reply_markup=create_back_button())
@@ -407,15 +401,8 @@ def process_birth_date(message):
             bot.register_next_step_handler(msg, process_birth_date)
             return
         
-        if DB_AVAILABLE:
-            # PostgreSQL uchun birth_date maydoni qo'shish
-            from db import db_instance
-            with db_instance.get_cursor() as cur:
-                cur.execute("""
-                    UPDATE users 
-                    SET birth_date = %s, updated_at = CURRENT_TIMESTAMP
-                    WHERE user_id = %s
-                """, (birth_date, user_id))
+        if is_db_ready():
+            update_user_field(user_id, 'birth_date', birth_date)
             
             bot.send_message(message.chat.id, "✅ <b>Tug'ilgan sana muvaffaqiyatli saqlandi</b>", reply_markup=create_back_button())
             show_profile(message)
@@ -433,7 +420,7 @@ def process_bio(message):
             clear_user_state(user_id)
             return
         
-        if DB_AVAILABLE:
+        if is_db_ready():
             update_user_field(user_id, 'bio', message.text)
             bot.send_message(message.chat.id, "✅ <b>Bio saqlandi</b>", reply_markup=create_back_button())
             show_profile(message)
@@ -449,7 +436,7 @@ def show_startups(message):
         user_id = message.from_user.id
         set_user_state(user_id, 'viewing_startups')
         
-        if not DB_AVAILABLE:
+        if not is_db_ready():
             bot.send_message(message.chat.id, "⚠️ <b>Database ulanmagan. Startaplar ko'rsatilmaydi.</b>")
             return
         
@@ -460,7 +447,7 @@ def show_startups(message):
 
 def show_startup_page(chat_id, page):
     try:
-        if not DB_AVAILABLE:
+        if not is_db_ready():
             bot.send_message(chat_id, "⚠️ <b>Database ulanmagan.</b>", reply_markup=create_back_button())
             return
         
@@ -471,42 +458,9 @@ def show_startup_page(chat_id, page):
             bot.send_message(chat_id, "📭 <b>Hozircha startup mavjud emas.</b>", reply_markup=create_back_button())
             return
         
-        startup = startups[0]
-        user = get_user(startup['owner_id'])
-        owner_name = f"{user.get('first_name', '')} {user.get('last_name', '')}".strip() if user else "Noma'lum"
-        
+        # Muallif ismi JOIN dan; kartochka (startap, versiya, sahifa) bo'yicha keshdan
         total_pages = max(1, (total + per_page - 1) // per_page)
-        
-        text = (
-            f"<b>🌐 Startaplar</b>\n"
-            f"📄 Sahifa: <b>{page}/{total_pages}</b>\n\n"
-            f"🎯 <b>{startup['name']}</b>\n"
-            f"📌 {startup['description'][:200]}...\n"
-            f"👤 <b>Muallif:</b> {owner_name}"
-        )
-        
-        markup = InlineKeyboardMarkup()
-        markup.add(InlineKeyboardButton('🤝 Startupga qo\'shilish', callback_data=f'join_startup_{startup["id"]}'))
-
-        nav_buttons = []
-        if page > 1:
-            nav_buttons.append(InlineKeyboardButton('⏮️ Oldingi', callback_data=f'startup_page_{page-1}'))
-        if page < total_pages:
-            nav_buttons.append(InlineKeyboardButton('⏭️ Keyingi', callback_data=f'startup_page_{page+1}'))
-        
-        if nav_buttons:
-            markup.row(*nav_buttons)
-        
-        markup.add(InlineKeyboardButton('🔙 Orqaga', callback_data='back_to_main_menu'))
-        
-        try:
-            if startup.get('logo'):
-                bot.send_photo(chat_id, startup['logo'], caption=text, reply_markup=markup)
-            else:
-                bot.send_message(chat_id, text, reply_markup=markup)
-        except Exception as e:
-            logger.error(f"Xabar yuborishda xatolik: {e}")
-            bot.send_message(chat_id, text, reply_markup=markup)
+        send_card(bot, chat_id, browse_card(startups[0], page, total_pages))
     except Exception as e:
         logger.error(f"Show startup page xatosi: {e}")
 
@@ -521,10 +475,27 @@ def handle_startup_page(call):
         logger.error(f"Handle startup page xatosi: {e}")
         bot.answer_callback_query(call.id, "⚠️ Xatolik yuz berdi!", show_alert=True)
 
+def build_join_request(user, startup, request_id: int):
+    """Startup egasiga boriladigan qo'shilish so'rovi (main_async bilan umumiy)"""
+    text = (
+        f"🆕 <b>Startupga qo'shilish so'rovi</b>\n\n"
+        f"👤 <b>Foydalanuvchi:</b> {user.get('first_name', '')} {user.get('last_name', '')}\n"
+        f"📱 <b>Telefon:</b> {user.get('phone', '—')}\n"
+        f"📝 <b>Bio:</b> {user.get('bio', '—')}\n\n"
+        f"🎯 <b>Startup:</b> {startup['name']}"
+    )
+    
+    markup = InlineKeyboardMarkup()
+    markup.add(
+        InlineKeyboardButton('✅ Tasdiqlash', callback_data=f'approve_join_{request_id}'),
+        InlineKeyboardButton('❌ Rad etish', callback_data=f'reject_join_{request_id}')
+    )
+    return text, markup
+
 @bot.callback_query_handler(func=lambda call: call.data.startswith('join_startup_'))
 def handle_join_startup(call):
     try:
-        if not DB_AVAILABLE:
+        if not is_db_ready():
             bot.answer_callback_query(call.id, "⚠️ Database ulanmagan!", show_alert=True)
             return
         
@@ -548,22 +519,11 @@ def handle_join_startup(call):
             user = get_user(user_id)
             
             if startup and user:
-                text = (
-                    f"🆕 <b>Startupga qo'shilish so'rovi</b>\n\n"
-                    f"👤 <b>Foydalanuvchi:</b> {user.get('first_name', '')} {user.get('last_name', '')}\n"
-                    f"📱 <b>Telefon:</b> {user.get('phone', '—')}\n"
-                    f"📝 <b>Bio:</b> {user.get('bio', '—')}\n\n"
-                    f"🎯 <b>Startup:</b> {startup['name']}"
-                )
-                
-                markup = InlineKeyboardMarkup()
-                markup.add(
-                    InlineKeyboardButton('✅ Tasdiqlash', callback_data=f'approve_join_{request_id}'),
-                    InlineKeyboardButton('❌ Rad etish', callback_data=f'reject_join_{request_id}')
-                )
+                text, markup = build_join_request(user, startup, request_id)
                 
                 try:
-                    bot.send_message(startup['owner_id'], text, reply_markup=markup)
+                    with telegram_api.priority(telegram_api.NOTIFICATION):
+                        bot.send_message(startup['owner_id'], text, reply_markup=markup)
                 except Exception as e:
                     logger.error(f"Egaga xabar yuborishda xatolik: {e}")
                     try:
@@ -577,7 +537,7 @@ def handle_join_startup(call):
 @bot.callback_query_handler(func=lambda call: call.data.startswith('approve_join_'))
 def approve_join_request(call):
     try:
-        if not DB_AVAILABLE:
+        if not is_db_ready():
             bot.answer_callback_query(call.id, "⚠️ Database ulanmagan!", show_alert=True)
             return
         
@@ -585,7 +545,6 @@ def approve_join_request(call):
         update_join_request(request_id, 'accepted')
         
         # PostgreSQL dan ma'lumot olish
-        from db import db_instance
         with db_instance.get_cursor() as cur:
             cur.execute("""
                 SELECT sm.startup_id, sm.user_id, s.name, s.group_link
@@ -599,13 +558,14 @@ def approve_join_request(call):
                 startup_id, user_id, startup_name, group_link = result
                 
                 try:
-                    bot.send_message(
-                        user_id,
-                        f"🎉 <b>Tabriklaymiz!</b>\n\n"
-                        f"✅ Sizning so'rovingiz qabul qilindi.\n\n"
-                        f"🎯 <b>Startup:</b> {startup_name}\n"
-                        f"🔗 <b>Guruhga qo'shilish:</b> {group_link}"
-                    )
+                    with telegram_api.priority(telegram_api.NOTIFICATION):
+                        bot.send_message(
+                            user_id,
+                            f"🎉 <b>Tabriklaymiz!</b>\n\n"
+                            f"✅ Sizning so'rovingiz qabul qilindi.\n\n"
+                            f"🎯 <b>Startup:</b> {startup_name}\n"
+                            f"🔗 <b>Guruhga qo'shilish:</b> {group_link}"
+                        )
                 except Exception as e:
                     logger.error(f"Foydalanuvchiga xabar yuborishda xatolik: {e}")
         
@@ -623,14 +583,13 @@ def approve_join_request(call):
 @bot.callback_query_handler(func=lambda call: call.data.startswith('reject_join_'))
 def reject_join_request(call):
     try:
-        if not DB_AVAILABLE:
+        if not is_db_ready():
             bot.answer_callback_query(call.id, "⚠️ Database ulanmagan!", show_alert=True)
             return
         
         request_id = call.data.split('_')[2]
         
         # PostgreSQL dan ma'lumot olish
-        from db import db_instance
         with db_instance.get_cursor() as cur:
             cur.execute("""
                 SELECT user_id FROM startup_members WHERE id = %s
@@ -664,7 +623,7 @@ def show_my_startups(message):
         user_id = message.from_user.id
         set_user_state(user_id, 'viewing_my_startups')
         
-        if not DB_AVAILABLE:
+        if not is_db_ready():
             bot.send_message(message.chat.id, "⚠️ <b>Database ulanmagan. Startaplaringiz ko'rsatilmaydi.</b>")
             return
         
@@ -673,9 +632,58 @@ def show_my_startups(message):
     except Exception as e:
         logger.error(f"Show my startups xatosi: {e}")
 
+def build_my_startups_page(startups, page: int):
+    """Mening startaplarim sahifasi: matn va tugmalar (main_async bilan umumiy)"""
+    per_page = 5
+    total = len(startups)
+    total_pages = (total + per_page - 1) // per_page
+    page = min(max(1, page), total_pages)
+    
+    start_idx = (page - 1) * per_page
+    end_idx = min(start_idx + per_page, total)
+    page_startups = startups[start_idx:end_idx]
+    
+    text = f"<b>📌 Mening startaplarim</b>\n📄 Sahifa: <b>{page}/{total_pages}</b>\n\n"
+    for i, startup in enumerate(page_startups, start=start_idx + 1):
+        status_emoji = {
+            'pending': '⏳',
+            'active': '▶️',
+            'completed': '✅',
+            'rejected': '❌'
+        }.get(startup['status'], '❓')
+        text += f"{i}. {startup['name']} {status_emoji}\n"
+    
+    markup = InlineKeyboardMarkup(row_width=5)
+    
+    # Page numbers
+    buttons = []
+    start_page = max(1, page - 2)
+    end_page = min(total_pages, start_page + 4)
+    
+    for i in range(start_page, end_page + 1):
+        buttons.append(InlineKeyboardButton(f'{i}', callback_data=f'my_startup_page_{i}'))
+    
+    if buttons:
+        markup.row(*buttons)
+    
+    # Navigation
+    if page > 1:
+        markup.add(InlineKeyboardButton('⏮️ Oldingi', callback_data=f'my_startup_page_{page-1}'))
+    if page < total_pages:
+        markup.add(InlineKeyboardButton('⏭️ Keyingi', callback_data=f'my_startup_page_{page+1}'))
+    
+    # Startup selection
+    if page_startups:
+        for i, startup in enumerate(page_startups):
+            markup.add(InlineKeyboardButton(f'{start_idx + i + 1}. {startup["name"][:15]}...', 
+                                           callback_data=f'view_startup_{startup["id"]}'))
+    
+    markup.add(InlineKeyboardButton('🔙 Orqaga', callback_data='back_to_main_menu'))
+    return text, markup
+
 def show_my_startups_page(chat_id, user_id, page):
     try:
-        if not DB_AVAILABLE:
+        if not is_db_ready():
             bot.send_message(chat_id, "⚠️ <b>Database ulanmagan.</b>", reply_markup=create_back_button())
             return
         
@@ -685,51 +693,7 @@ def show_my_startups_page(chat_id, user_id, page):
             bot.send_message(chat_id, "📭 <b>Sizda hali startup mavjud emas.</b>", reply_markup=create_back_button())
             return
         
-        per_page = 5
-        total = len(startups)
-        total_pages = (total + per_page - 1) // per_page
-        page = min(max(1, page), total_pages)
-        
-        start_idx = (page - 1) * per_page
-        end_idx = min(start_idx + per_page, total)
-        page_startups = startups[start_idx:end_idx]
-        
-        text = f"<b>📌 Mening startaplarim</b>\n📄 Sahifa: <b>{page}/{total_pages}</b>\n\n"
-        for i, startup in enumerate(page_startups, start=start_idx + 1):
-            status_emoji = {
-                'pending': '⏳',
-                'active': '▶️',
-                'completed': '✅',
-                'rejected': '❌'
-            }.get(startup['status'], '❓')
-            text += f"{i}. {startup['name']} {status_emoji}\n"
-        
-        markup = InlineKeyboardMarkup(row_width=5)
-        
-        # Page numbers
-        buttons = []
-        start_page = max(1, page - 2)
-        end_page = min(total_pages, start_page + 4)
-        
-        for i in range(start_page, end_page + 1):
-            buttons.append(InlineKeyboardButton(f'{i}', callback_data=f'my_startup_page_{i}'))
-        
-        if buttons:
-            markup.row(*buttons)
-        
-        # Navigation
-        if page > 1:
-            markup.add(InlineKeyboardButton('⏮️ Oldingi', callback_data=f'my_startup_page_{page-1}'))
-        if page < total_pages:
-            markup.add(InlineKeyboardButton('⏭️ Keyingi', callback_data=f'my_startup_page_{page+1}'))
-        
-        # Startup selection
-        if page_startups:
-            for i, startup in enumerate(page_startups):
-                markup.add(InlineKeyboardButton(f'{start_idx + i + 1}. {startup["name"][:15]}...', 
-                                               callback_data=f'view_startup_{startup["id"]}'))
-        
-        markup.add(InlineKeyboardButton('🔙 Orqaga', callback_data='back_to_main_menu'))
+        text, markup = build_my_startups_page(startups, page)
         
         bot.send_message(chat_id, text, reply_markup=markup)
     except Exception as e:
@@ -749,7 +713,7 @@ def handle_my_startup_page(call):
 @bot.callback_query_handler(func=lambda call: call.data.startswith('view_startup_'))
 def view_startup_details(call):
     try:
-        if not DB_AVAILABLE:
+        if not is_db_ready():
             bot.answer_callback_query(call.id, "⚠️ Database ulanmagan!", show_alert=True)
             return
         
@@ -760,56 +724,12 @@ def view_startup_details(call):
             bot.answer_callback_query(call.id, "❌ Startup topilmadi!", show_alert=True)
             return
         
-        user = get_user(startup['owner_id'])
-        owner_name = f"{user.get('first_name', '')} {user.get('last_name', '')}".strip() if user else "Noma'lum"
-        
         # Get member count
         members, total_members = get_startup_members(startup_id, 1, 1)
         
-        status_texts = {
-            'pending': '⏳ Kutilmoqda',
-            'active': '▶️ Boshlangan',
-            'completed': '✅ Yakunlangan',
-            'rejected': '❌ Rad etilgan'
-        }
-        
-        status_text = status_texts.get(startup['status'], startup['status'])
-        
-        start_date = startup.get('started_at', '—')
-        if start_date and start_date != '—':
-            start_date = start_date[:10]
-        
-        text = (
-            f"🎯 <b>Nomi:</b> {startup['name']}\n"
-            f"📊 <b>Holati:</b> {status_text}\n"
-            f"📅 <b>Boshlanish sanasi:</b> {start_date}\n"
-            f"👤 <b>Muallif:</b> {owner_name}\n"
-            f"👥 <b>A'zolar:</b> {total_members} ta\n"
-            f"📌 <b>Tavsif:</b> {startup['description'][:500]}"
-        )
-        
-        markup = InlineKeyboardMarkup()
-        
-        if startup['status'] == 'pending':
-            markup.add(InlineKeyboardButton('⏳ Admin tasdigini kutyapti', callback_data='waiting_approval'))
-        elif startup['status'] == 'active':
-            markup.add(InlineKeyboardButton('👥 A\'zolar', callback_data=f'view_members_{startup_id}_1'))
-            markup.add(InlineKeyboardButton('⏹️ Yakunlash', callback_data=f'complete_startup_{startup_id}'))
-        elif startup['status'] == 'completed':
-            markup.add(InlineKeyboardButton('👥 A\'zolar', callback_data=f'view_members_{startup_id}_1'))
-            if startup.get('results'):
-                markup.add(InlineKeyboardButton('📊 Natijalar', callback_data=f'view_results_{startup_id}'))
-        elif startup['status'] == 'rejected':
-            markup.add(InlineKeyboardButton('❌ Rad etilgan', callback_data='rejected_info'))
-        
-        markup.add(InlineKeyboardButton('🔙 Orqaga', callback_data='back_to_my_startups'))
-        
+        card = owner_card(startup, total_members)
         bot.delete_message(call.message.chat.id, call.message.message_id)
-        
-        if startup.get('logo'):
-            bot.send_photo(call.message.chat.id, startup['logo'], caption=text, reply_markup=markup)
-        else:
-            bot.send_message(call.message.chat.id, text, reply_markup=markup)
+        send_card(bot, call.message.chat.id, card)
         
         bot.answer_callback_query(call.id)
     except Exception as e:
@@ -829,7 +749,7 @@ def back_to_my_startups(call):
 @bot.callback_query_handler(func=lambda call: call.data.startswith('view_members_'))
 def view_startup_members(call):
     try:
-        if not DB_AVAILABLE:
+        if not is_db_ready():
             bot.answer_callback_query(call.id, "⚠️ Database ulanmagan!", show_alert=True)
             return
         
@@ -884,7 +804,7 @@ def view_startup_members(call):
 @bot.callback_query_handler(func=lambda call: call.data.startswith('view_results_'))
 def view_startup_results(call):
     try:
-        if not DB_AVAILABLE:
+        if not is_db_ready():
             bot.answer_callback_query(call.id, "⚠️ Database ulanmagan!", show_alert=True)
             return
         
@@ -914,7 +834,7 @@ def view_startup_results(call):
 @bot.callback_query_handler(func=lambda call: call.data.startswith('complete_startup_'))
 def complete_startup(call):
     try:
-        if not DB_AVAILABLE:
+        if not is_db_ready():
             bot.answer_callback_query(call.id, "⚠️ Database ulanmagan!", show_alert=True)
             return
         
@@ -976,11 +896,12 @@ def process_startup_photo(message, startup_id, results_text):
             return
         
         if message.photo:
-            photo_id = message.photo[-1].file_id
+            photo_id = media_registry.register(message.photo, 'startup_results')
             
             # Update startup status and results
             update_startup_status(startup_id, 'completed')
             update_startup_results(startup_id, results_text)
+            card_cache.invalidate(startup_id)
             
             # Get all members
             members = get_all_startup_members(startup_id)
@@ -990,22 +911,26 @@ def process_startup_photo(message, startup_id, results_text):
             # Send notification to all members
             end_date = datetime.now().strftime('%d-%m-%Y')
             success_count = 0
+            # Rasm foydalanuvchidan kelgan file_id - a'zolarga qayta yuklanmaydi
+            photo = PhotoFanout(photo_id, 'startup_results')
             
-            for member_id in members:
-                try:
-                    bot.send_photo(
-                        member_id,
-                        photo_id,
-                        caption=(
-                            f"🏁 <b>Startup yakunlandi</b>\n\n"
-                            f"🎯 <b>{startup['name']}</b>\n"
-                            f"📅 <b>Yakunlangan sana:</b> {end_date}\n"
-                            f"📝 <b>Natijalar:</b> {results_text}"
+            # A'zolarga xabarnoma - interaktiv javoblardan keyin; eskirganlari tashlanadi
+            with telegram_api.priority(telegram_api.NOTIFICATION):
+                for member_id in members:
+                    try:
+                        photo.send(
+                            bot,
+                            member_id,
+                            caption=(
+                                f"🏁 <b>Startup yakunlandi</b>\n\n"
+                                f"🎯 <b>{startup['name']}</b>\n"
+                                f"📅 <b>Yakunlangan sana:</b> {end_date}\n"
+                                f"📝 <b>Natijalar:</b> {results_text}"
+                            )
                         )
-                    )
-                    success_count += 1
-                except:
-                    pass
+                        success_count += 1
+                    except:
+                        pass
             
             bot.send_message(message.chat.id, 
                             f"✅ <b>Startup muvaffaqiyatli yakunlandi!</b>\n\n"
@@ -1046,7 +971,7 @@ def start_creation(message):
         user_id = message.from_user.id
         set_user_state(user_id, 'creating_startup')
         
-        if not DB_AVAILABLE:
+        if not is_db_ready():
             bot.send_message(message.chat.id, "⚠️ <b>Database ulanmagan. Startup yaratish imkoni yo'q.</b>")
             return
         
@@ -1096,7 +1021,7 @@ def process_startup_logo(message, data):
             return
         
         if message.photo:
-            data['logo'] = message.photo[-1].file_id
+            data['logo'] = media_registry.register(message.photo, 'startup_logo')
             msg = bot.send_message(message.chat.id, 
                                   "🔗 <b>Guruh yoki kanal havolasini kiriting (majburiy):</b>\n\n"
                                   "Masalan: <code>https://t.me/group_name</code>", 
@@ -1203,7 +1128,7 @@ def admin_panel(message):
         )
         
         # Welcome message with statistics
-        stats = get_statistics() if DB_AVAILABLE else {'total_users': 0, 'total_startups': 0, 'pending_startups': 0, 'active_startups': 0, 'completed_startups': 0}
+        stats = get_statistics() if is_db_ready() else {'total_users': 0, 'total_startups': 0, 'pending_startups': 0, 'active_startups': 0, 'completed_startups': 0}
         
         welcome_text = (
             f"👨‍💼 <b>Admin Panel</b>\n\n"
@@ -1222,9 +1147,9 @@ def admin_panel(message):
 @bot.message_handler(func=lambda message: message.text == '📊 Dashboard' and message.from_user.id == ADMIN_ID)
 def admin_dashboard(message):
     try:
-        stats = get_statistics() if DB_AVAILABLE else {'total_users': 0, 'total_startups': 0, 'pending_startups': 0, 'active_startups': 0, 'completed_startups': 0}
-        recent_users = get_recent_users(5) if DB_AVAILABLE else []
-        recent_startups = get_recent_startups(5) if DB_AVAILABLE else []
+        stats = get_statistics() if is_db_ready() else {'total_users': 0, 'total_startups': 0, 'pending_startups': 0, 'active_startups': 0, 'completed_startups': 0}
+        recent_users = get_recent_users(5) if is_db_ready() else []
+        recent_startups = get_recent_startups(5) if is_db_ready() else []
         
         # Dashboard text
         dashboard_text = (
@@ -1279,7 +1204,7 @@ def admin_startups_menu(message):
             InlineKeyboardButton('🔙 Orqaga', callback_data='back_to_admin_panel')
         )
         
-        stats = get_statistics() if DB_AVAILABLE else {'pending_startups': 0, 'active_startups': 0, 'completed_startups': 0, 'rejected_startups': 0}
+        stats = get_statistics() if is_db_ready() else {'pending_startups': 0, 'active_startups': 0, 'completed_startups': 0, 'rejected_startups': 0}
         text = (
             f"🚀 <b>Startaplar boshqaruvi</b>\n\n"
             f"📊 <b>Statistikalar:</b>\n"
@@ -1300,7 +1225,7 @@ def show_pending_startups(call):
             bot.answer_callback_query(call.id, "❌ Ruxsat yo'q!", show_alert=True)
             return
         
-        if not DB_AVAILABLE:
+        if not is_db_ready():
             bot.answer_callback_query(call.id, "⚠️ Database ulanmagan!", show_alert=True)
             return
         
@@ -1359,7 +1284,7 @@ def admin_view_startup_details(call):
             bot.answer_callback_query(call.id, "❌ Ruxsat yo'q!", show_alert=True)
             return
         
-        if not DB_AVAILABLE:
+        if not is_db_ready():
             bot.answer_callback_query(call.id, "⚠️ Database ulanmagan!", show_alert=True)
             return
         
@@ -1370,43 +1295,9 @@ def admin_view_startup_details(call):
             bot.answer_callback_query(call.id, "❌ Startup topilmadi!", show_alert=True)
             return
         
-        user = get_user(startup['owner_id'])
-        owner_name = f"{user.get('first_name', '')} {user.get('last_name', '')}".strip() if user else "Noma'lum"
-        owner_contact = f"@{user.get('username', '')}" if user and user.get('username') else f"ID: {startup['owner_id']}"
-        
-        text = (
-            f"🖼 <b>Startup ma'lumotlari</b>\n\n"
-            f"🎯 <b>Nomi:</b> {startup['name']}\n"
-            f"📌 <b>Tavsif:</b> {startup['description']}\n\n"
-            f"👤 <b>Muallif:</b> {owner_name}\n"
-            f"📱 <b>Aloqa:</b> {owner_contact}\n"
-            f"🔗 <b>Guruh havolasi:</b> {startup['group_link']}\n"
-            f"📅 <b>Yaratilgan sana:</b> {startup['created_at'][:10] if startup.get('created_at') else '—'}\n"
-            f"📊 <b>Holati:</b> {startup['status']}"
-        )
-        
-        markup = InlineKeyboardMarkup()
-        
-        if startup['status'] == 'pending':
-            markup.add(
-                InlineKeyboardButton('✅ Tasdiqlash', callback_data=f'admin_approve_{startup_id}'),
-                InlineKeyboardButton('❌ Rad etish', callback_data=f'admin_reject_{startup_id}')
-            )
-        elif startup['status'] == 'active':
-            markup.add(InlineKeyboardButton('✅ Faol', callback_data='already_active'))
-        elif startup['status'] == 'completed':
-            markup.add(InlineKeyboardButton('✅ Yakunlangan', callback_data='already_completed'))
-        elif startup['status'] == 'rejected':
-            markup.add(InlineKeyboardButton('❌ Rad etilgan', callback_data='already_rejected'))
-        
-        markup.add(InlineKeyboardButton('🔙 Orqaga', callback_data='pending_startups_1'))
-        
+        card = admin_card(startup)
         bot.delete_message(call.message.chat.id, call.message.message_id)
-        
-        if startup.get('logo'):
-            bot.send_photo(call.message.chat.id, startup['logo'], caption=text, reply_markup=markup)
-        else:
-            bot.send_message(call.message.chat.id, text, reply_markup=markup)
+        send_card(bot, call.message.chat.id, card)
         
         bot.answer_callback_query(call.id)
     except Exception as e:
@@ -1420,47 +1311,32 @@ def admin_approve_startup(call):
             bot.answer_callback_query(call.id, "❌ Ruxsat yo'q!", show_alert=True)
             return
         
-        if not DB_AVAILABLE:
+        if not is_db_ready():
             bot.answer_callback_query(call.id, "⚠️ Database ulanmagan!", show_alert=True)
             return
         
         startup_id = call.data.split('_')[2]
         update_startup_status(startup_id, 'active')
+        card_cache.invalidate(startup_id)
         
         # Notify owner
         startup = get_startup(startup_id)
         if startup:
             try:
-                bot.send_message(
-                    startup['owner_id'],
-                    f"🎉 <b>Tabriklaymiz!</b>\n\n"
-                    f"✅ Sizning '<b>{startup['name']}</b>' startupingiz tasdiqlandi va kanalga joylandi!"
-                )
+                with telegram_api.priority(telegram_api.NOTIFICATION):
+                    bot.send_message(
+                        startup['owner_id'],
+                        f"🎉 <b>Tabriklaymiz!</b>\n\n"
+                        f"✅ Sizning '<b>{startup['name']}</b>' startupingiz tasdiqlandi va kanalga joylandi!"
+                    )
             except Exception as e:
                 logger.error(f"Ownerga xabar yuborish xatosi: {e}")
         
         # Post to channel
         try:
-            user = get_user(startup['owner_id'])
-            owner_name = f"{user.get('first_name', '')} {user.get('last_name', '')}".strip() if user else "Noma'lum"
-            
-            channel_text = (
-                f"🚀 <b>{startup['name']}</b>\n\n"
-                f"📝 {startup['description']}\n\n"
-                f"👤 <b>Muallif:</b> {owner_name}\n\n"
-                f"👉 <b>Startupga qo'shilish uchun pastdagi tugmani bosing.</b>\n"
-                f"➕ <b>O'z startupingizni yaratish uchun:</b> @{bot.get_me().username}"
-            )
-            
-            markup = InlineKeyboardMarkup()
-            markup.add(
-                InlineKeyboardButton('🤝 Startupga qo\'shilish', callback_data=f'join_startup_{startup_id}')
-            )
-            
-            if startup.get('logo'):
-                bot.send_photo(CHANNEL_USERNAME, startup['logo'], caption=channel_text, reply_markup=markup)
-            else:
-                bot.send_message(CHANNEL_USERNAME, channel_text, reply_markup=markup)
+            # bot.user - get_me() bir marta so'raladi
+            with telegram_api.priority(telegram_api.NOTIFICATION):
+                send_card(bot, CHANNEL_USERNAME, channel_card(startup, bot.user.username))
         except Exception as e:
             logger.error(f"Kanalga post yuborishda xatolik: {e}")
         
@@ -1485,22 +1361,24 @@ def admin_reject_startup(call):
             bot.answer_callback_query(call.id, "❌ Ruxsat yo'q!", show_alert=True)
             return
         
-        if not DB_AVAILABLE:
+        if not is_db_ready():
             bot.answer_callback_query(call.id, "⚠️ Database ulanmagan!", show_alert=True)
             return
         
         startup_id = call.data.split('_')[2]
         update_startup_status(startup_id, 'rejected')
+        card_cache.invalidate(startup_id)
         
         # Notify owner
         startup = get_startup(startup_id)
         if startup:
             try:
-                bot.send_message(
-                    startup['owner_id'],
-                    f"❌ <b>Xabar!</b>\n\n"
-                    f"Sizning '<b>{startup['name']}</b>' startupingiz rad etildi."
-                )
+                with telegram_api.priority(telegram_api.NOTIFICATION):
+                    bot.send_message(
+                        startup['owner_id'],
+                        f"❌ <b>Xabar!</b>\n\n"
+                        f"Sizning '<b>{startup['name']}</b>' startupingiz rad etildi."
+                    )
             except Exception as e:
                 logger.error(f"Ownerga xabar yuborish xatosi: {e}")
         
@@ -1545,7 +1423,7 @@ def handle_refresh_dashboard(call):
 @bot.callback_query_handler(func=lambda call: call.data == 'full_stats')
 def handle_full_stats(call):
     try:
-        stats = get_statistics() if DB_AVAILABLE else {'total_users': 0, 'total_startups': 0, 'pending_startups': 0, 'active_startups': 0, 'completed_startups': 0, 'rejected_startups': 0}
+        stats = get_statistics() if is_db_ready() else {'total_users': 0, 'total_startups': 0, 'pending_startups': 0, 'active_startups': 0, 'completed_startups': 0, 'rejected_startups': 0}
         bot.answer_callback_query(call.id, 
                                  f"👥 Foydalanuvchilar: {stats.get('total_users', 0)}\n"
                                  f"🚀 Startaplar: {stats.get('total_startups', 0)}\n"
@@ -1557,6 +1435,40 @@ def handle_full_stats(call):
     except Exception as e:
         logger.error(f"Full stats xatosi: {e}")
 
+# Jarayonni profil qilish: /profile [soniya]
+@bot.message_handler(commands=['profile'], func=lambda message: message.from_user.id == ADMIN_ID)
+def handle_profile_command(message):
+    parts = message.text.split()
+    try:
+        seconds = float(parts[1]) if len(parts) > 1 else 10
+    except ValueError:
+        bot.send_message(message.chat.id, "❌ Format: /profile [soniya]")
+        return
+    
+    if profiler.is_running():
+        bot.send_message(message.chat.id, "⏳ Profil allaqachon ishlamoqda, keyinroq urinib ko'ring.")
+        return
+    
+    def run():
+        try:
+            result = profiler.profile(seconds)
+            top = '\n'.join(f"{share * 100:5.1f}% {label}" for label, share in profiler.top_functions(result, 5))
+            document = io.BytesIO(profiler.collapsed(result).encode('utf-8'))
+            document.name = f"profile-{datetime.now().strftime('%Y%m%d-%H%M%S')}.collapsed"
+            bot.send_document(
+                message.chat.id, document,
+                caption=f"🔥 Profil: {result['seconds']}s, {result['samples']} ta namuna\n\n{top}"[:1024],
+                parse_mode=None
+            )
+        except profiler.ProfilerBusy:
+            bot.send_message(message.chat.id, "⏳ Profil allaqachon ishlamoqda, keyinroq urinib ko'ring.")
+        except Exception as e:
+            logger.error(f"Profile xatosi: {e}")
+    
+    # Handler threadi band qilinmaydi
+    bot.send_message(message.chat.id, f"🔎 {min(seconds, profiler.MAX_PROFILE_SECONDS):g} soniya profil qilinmoqda...")
+    threading.Thread(target=run, name='profile', daemon=True).start()
+
 # To'ldirish kerak bo'lgan qismlar
 @bot.message_handler(func=lambda message: message.text in ['👥 Foydalanuvchilar', '📢 Xabar yuborish', '⚙️ Sozlamalar'] and message.from_user.id == ADMIN_ID)
 def admin_placeholder(message):
@@ -1640,6 +1552,10 @@ def handle_other_messages(message):
         logger.error(f"Unhandled message error: {e}")
 
 # Botni ishga tushirish - Render uchun
+# Barcha handlerlar ro'yxatdan o'tgach: har biri davomiylik metrikasi va trace bilan o'raladi
+metrics.instrument_bot(bot)
+tracing.instrument_bot(bot)
+
 if __name__ == '__main__':
     # Render uchun webhook ni o'chirish
     try:
@@ -1653,18 +1569,20 @@ if __name__ == '__main__':
     print(f"👨‍💼 Admin ID: {ADMIN_ID}")
     print(f"📢 Kanal: {CHANNEL_USERNAME}")
     print(f"🤖 Bot token: ...{BOT_TOKEN[-10:] if BOT_TOKEN else 'TOPILMADI'}")
-    print(f"🗄️ Database: {'Online' if DB_AVAILABLE else 'Offline'}")
     print("=" * 60)
     
-    # Database ulanishini tekshirish
-    if DB_AVAILABLE:
-        try:
-            if check_database_connection():
-                print("✅ PostgreSQL ga muvaffaqiyatli ulanildi")
-            else:
-                print("❌ PostgreSQL ga ulanib bo'lmadi")
-        except Exception as e:
-            print(f"⚠️ Database tekshirish xatosi: {e}")
+    # Metrikalar alohida portda (server.py da /metrics Flask orqali)
+    metrics_port = os.getenv('METRICS_PORT')
+    if metrics_port:
+        metrics.start_http_server(int(metrics_port))
+        print(f"📈 Metrikalar: http://{metrics.METRICS_HOST}:{metrics_port}/metrics")
+    
+    # Database sxemasi har ulanishda (qayta ulanishda ham) tekshiriladi
+    db_instance.on_connect(init_db)
+    if is_db_ready():
+        print("✅ PostgreSQL ga muvaffaqiyatli ulanildi")
+    else:
+        print("❌ PostgreSQL ga ulanib bo'lmadi, fonda qayta ulanish davom etadi")
     
     # Botni polling rejimida ishga tushirish
     while True:
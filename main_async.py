@@ -0,0 +1,331 @@
+# main_async.py - Botning asyncio varianti: AsyncTeleBot + db_async (asyncpg)
+#
+#   python main_async.py      # sinxron variant avvalgidek: python main.py
+#
+# Ko'p ishlatiladigan handlerlar (start, obuna, profil, startaplar ro'yxati, qo'shilish, mening startaplarim)
+# shu yerda asinxron - kutish (Telegram API, DB) thread band qilmaydi. Qolganlari (ko'p bosqichli formalar,
+# admin panel, tasdiqlash) main.py dagi sinxron botga executor orqali uzatiladi; next_step kutayotgan
+# chatlarning barcha xabarlari ham sinxron botga boradi.
+import asyncio
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from telebot import types, util
+from telebot.async_telebot import AsyncTeleBot
+
+import main
+import metrics
+import telegram_api
+import tracing
+from cards import browse_card
+from db_async import (
+    db_instance as async_db, is_db_ready,
+    get_user, save_user, get_startup, get_startups_by_owner, get_active_startups,
+    add_startup_member, get_join_request_id, invalidate_media_file
+)
+from main import (
+    ADMIN_ID, CHANNEL_USERNAME, MAIN_MENU_TEXT,
+    set_user_state, clear_user_state, create_back_button, create_main_menu,
+    build_profile, build_join_request, build_my_startups_page, build_subscription_prompt
+)
+from media import is_bad_file_error, registry as media_registry
+
+logger = logging.getLogger(__name__)
+
+ALL_CONTENT_TYPES = util.content_type_media + util.content_type_service
+
+# Sinxron handlerlar shu executor threadlarida bajariladi (telebot ning o'z worker pooliga emas)
+SYNC_HANDLER_WORKERS = int(os.getenv('SYNC_HANDLER_WORKERS', 8))
+_executor = ThreadPoolExecutor(max_workers=SYNC_HANDLER_WORKERS, thread_name_prefix='sync-handler')
+sync_bot = main.bot
+sync_bot.threaded = False
+
+# Sinxron bot bilan bir xil rate limiter va 429 qayta urinish
+telegram_api.install_async()
+
+bot = AsyncTeleBot(main.BOT_TOKEN, parse_mode='HTML')
+
+# =========== SINXRON BOTGA UZATISH ===========
+
+def _has_next_step(message) -> bool:
+    # get_handlers() handlerlarni olib tashlaydi - shuning uchun lug'atning o'zi tekshiriladi
+    return message.chat.id in sync_bot.next_step_backend.handlers
+
+async def _run_sync(process, update):
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(_executor, tracing.bind(process), [update])
+
+# Birinchi ro'yxatdan o'tadi: main.py dagi kabi next_step handlerlar buyruqlardan ham ustun
+@bot.message_handler(func=_has_next_step, content_types=ALL_CONTENT_TYPES)
+async def delegate_next_step(message):
+    await _run_sync(sync_bot.process_new_messages, message)
+
+# =========== START VA OBUNA ===========
+
+async def show_main_menu(message_or_call):
+    try:
+        if isinstance(message_or_call, types.CallbackQuery):
+            chat_id = message_or_call.message.chat.id
+            try:
+                await bot.delete_message(chat_id, message_or_call.message.message_id)
+            except Exception:
+                pass
+        else:
+            chat_id = message_or_call.chat.id
+
+        user_id = message_or_call.from_user.id
+        clear_user_state(user_id)
+        await bot.send_message(chat_id, MAIN_MENU_TEXT, reply_markup=create_main_menu(user_id))
+    except Exception as e:
+        logger.error(f"Show main menu xatosi: {e}")
+
+async def _is_subscribed(user_id: int) -> bool:
+    chat_member = await bot.get_chat_member(CHANNEL_USERNAME, user_id)
+    return chat_member.status in ['member', 'administrator', 'creator']
+
+@bot.message_handler(commands=['start', 'help', 'boshlash'])
+async def start_command(message):
+    try:
+        user_id = message.from_user.id
+        # Saqlash va obuna tekshiruvi bir-biriga bog'liq emas - parallel
+        saved, subscribed = await asyncio.gather(
+            save_user(user_id, message.from_user.username or "", message.from_user.first_name or ""),
+            _is_subscribed(user_id),
+            return_exceptions=True
+        )
+        if saved is not True:
+            logger.warning(f"Database ulanmagan, foydalanuvchi saqlanmadi: {user_id}")
+
+        if isinstance(subscribed, Exception):
+            logger.error(f"Obuna tekshirishda xatolik: {subscribed}")
+            # Agar kanalga ulana olmasa, to'g'ridan-to'g'ri menyuni ko'rsatish
+            await show_main_menu(message)
+        elif subscribed:
+            await show_main_menu(message)
+        else:
+            text, markup = build_subscription_prompt()
+            await bot.send_message(message.chat.id, text, reply_markup=markup)
+    except Exception as e:
+        logger.error(f"Start command xatosi: {e}")
+        await bot.send_message(message.chat.id, "⚠️ <b>Xatolik yuz berdi. Iltimos, keyinroq urinib ko'ring.</b>")
+
+@bot.callback_query_handler(func=lambda call: call.data == 'check_subscription')
+async def check_subscription_callback(call):
+    try:
+        if await _is_subscribed(call.from_user.id):
+            await show_main_menu(call)
+            await bot.answer_callback_query(call.id, "✅ Obuna tasdiqlandi!")
+        else:
+            await bot.answer_callback_query(call.id, "❌ Iltimos, kanalga obuna bo'ling!", show_alert=True)
+    except Exception as e:
+        logger.error(f"Obuna tekshirishda xatolik: {e}")
+        await bot.answer_callback_query(call.id, "⚠️ Xatolik yuz berdi!", show_alert=True)
+
+# =========== PROFIL ===========
+
+@bot.message_handler(func=lambda message: message.text == '👤 Profil')
+async def show_profile(message):
+    try:
+        user_id = message.from_user.id
+        set_user_state(user_id, 'in_profile')
+
+        if not await is_db_ready():
+            await bot.send_message(message.chat.id, "⚠️ <b>Database ulanmagan. Profil ma'lumotlari ko'rsatilmaydi.</b>")
+            return
+
+        user = await get_user(user_id)
+        if not user:
+            await save_user(user_id, message.from_user.username or "", message.from_user.first_name or "")
+            user = await get_user(user_id)
+
+        profile_text, markup_inline = build_profile(user)
+        await bot.send_message(message.chat.id, profile_text, reply_markup=markup_inline)
+    except Exception as e:
+        logger.error(f"Show profile xatosi: {e}")
+        await bot.send_message(message.chat.id, "⚠️ <b>Profilni yuklashda xatolik yuz berdi.</b>")
+
+# =========== STARTAPLAR ===========
+
+@bot.message_handler(func=lambda message: message.text == '🌐 Startaplar')
+async def show_startups(message):
+    try:
+        set_user_state(message.from_user.id, 'viewing_startups')
+
+        if not await is_db_ready():
+            await bot.send_message(message.chat.id, "⚠️ <b>Database ulanmagan. Startaplar ko'rsatilmaydi.</b>")
+            return
+
+        # Sarlavha va sahifa so'rovi parallel; xabarlar tartibi saqlanadi
+        header = asyncio.ensure_future(
+            bot.send_message(message.chat.id, "🌐 <b>Startaplar ro'yxati:</b>", reply_markup=create_back_button()))
+        page = asyncio.ensure_future(_startup_page(1))
+        await header
+        await _send_startup_page(message.chat.id, await page)
+    except Exception as e:
+        logger.error(f"Show startups xatosi: {e}")
+
+async def _startup_page(page: int):
+    """Sahifa kartochkasi (cards.py keshidan) yoki None"""
+    per_page = 1
+    startups, total = await get_active_startups(page, per_page=per_page)
+    if not startups:
+        return None
+    total_pages = max(1, (total + per_page - 1) // per_page)
+    return browse_card(startups[0], page, total_pages)
+
+async def _send_startup_page(chat_id, card):
+    if card is None:
+        await bot.send_message(chat_id, "📭 <b>Hozircha startup mavjud emas.</b>", reply_markup=create_back_button())
+        return
+    if card.photo and media_registry.is_valid(card.photo):
+        try:
+            await bot.send_photo(chat_id, card.photo, caption=card.caption, reply_markup=card.markup)
+            return
+        except Exception as e:
+            if is_bad_file_error(e):
+                media_registry.mark_invalid(card.photo)
+                await invalidate_media_file(card.photo)
+            logger.error(f"Xabar yuborishda xatolik: {e}")
+    await bot.send_message(chat_id, card.caption, reply_markup=card.markup)
+
+@bot.callback_query_handler(func=lambda call: call.data.startswith('startup_page_'))
+async def handle_startup_page(call):
+    try:
+        page = int(call.data.split('_')[2])
+        chat_id = call.message.chat.id
+        _, card = await asyncio.gather(bot.delete_message(chat_id, call.message.message_id), _startup_page(page))
+        await _send_startup_page(chat_id, card)
+        await bot.answer_callback_query(call.id)
+    except Exception as e:
+        logger.error(f"Handle startup page xatosi: {e}")
+        await bot.answer_callback_query(call.id, "⚠️ Xatolik yuz berdi!", show_alert=True)
+
+@bot.callback_query_handler(func=lambda call: call.data.startswith('join_startup_'))
+async def handle_join_startup(call):
+    try:
+        if not await is_db_ready():
+            await bot.answer_callback_query(call.id, "⚠️ Database ulanmagan!", show_alert=True)
+            return
+
+        startup_id = int(call.data.split('_')[2])
+        user_id = call.from_user.id
+
+        if await get_join_request_id(startup_id, user_id):
+            await bot.answer_callback_query(call.id, "📩 Sizning so'rovingiz hali ko'rib chiqilmoqda!", show_alert=True)
+            return
+
+        request_id = await add_startup_member(startup_id, user_id) or await get_join_request_id(startup_id, user_id)
+        _, startup, user = await asyncio.gather(
+            bot.answer_callback_query(call.id, "✅ So'rov yuborildi. Startup egasi tasdiqlasa, sizga xabar yuboriladi.", show_alert=True),
+            get_startup(startup_id),
+            get_user(user_id)
+        )
+
+        if startup and user:
+            text, markup = build_join_request(user, startup, request_id)
+            try:
+                await bot.send_message(startup['owner_id'], text, reply_markup=markup)
+            except Exception as e:
+                logger.error(f"Egaga xabar yuborishda xatolik: {e}")
+                try:
+                    await bot.send_message(ADMIN_ID, f"⚠️ Ownerga xabar yuborilmadi (ID: {startup['owner_id']}) for join request {request_id}")
+                except Exception:
+                    pass
+    except Exception as e:
+        logger.error(f"Join startup xatosi: {e}")
+        await bot.answer_callback_query(call.id, "⚠️ Xatolik yuz berdi!", show_alert=True)
+
+# =========== MENING STARTAPLARIM ===========
+
+@bot.message_handler(func=lambda message: message.text == '📌 Mening startaplarim')
+async def show_my_startups(message):
+    try:
+        user_id = message.from_user.id
+        set_user_state(user_id, 'viewing_my_startups')
+
+        if not await is_db_ready():
+            await bot.send_message(message.chat.id, "⚠️ <b>Database ulanmagan. Startaplaringiz ko'rsatilmaydi.</b>")
+            return
+
+        header = asyncio.ensure_future(
+            bot.send_message(message.chat.id, "📌 <b>Mening startaplarim:</b>", reply_markup=create_back_button()))
+        startups = asyncio.ensure_future(get_startups_by_owner(user_id))
+        await header
+        await _send_my_startups_page(message.chat.id, await startups, 1)
+    except Exception as e:
+        logger.error(f"Show my startups xatosi: {e}")
+
+async def _send_my_startups_page(chat_id, startups, page: int):
+    try:
+        if not startups:
+            await bot.send_message(chat_id, "📭 <b>Sizda hali startup mavjud emas.</b>", reply_markup=create_back_button())
+            return
+        text, markup = build_my_startups_page(startups, page)
+        await bot.send_message(chat_id, text, reply_markup=markup)
+    except Exception as e:
+        logger.error(f"Show my startups page xatosi: {e}")
+
+@bot.callback_query_handler(func=lambda call: call.data.startswith('my_startup_page_'))
+async def handle_my_startup_page(call):
+    try:
+        page = int(call.data.split('_')[3])
+        chat_id = call.message.chat.id
+        _, startups = await asyncio.gather(bot.delete_message(chat_id, call.message.message_id),
+                                           get_startups_by_owner(call.from_user.id))
+        await _send_my_startups_page(chat_id, startups, page)
+        await bot.answer_callback_query(call.id)
+    except Exception as e:
+        logger.error(f"Handle my startup page xatosi: {e}")
+        await bot.answer_callback_query(call.id, "⚠️ Xatolik yuz berdi!", show_alert=True)
+
+# =========== QOLGANLARI - SINXRON BOT ===========
+
+# Oxirida ro'yxatdan o'tadi: yuqoridagilarga mos kelmagan barcha xabar va callbacklar
+@bot.message_handler(func=lambda message: True, content_types=ALL_CONTENT_TYPES)
+async def delegate_message(message):
+    await _run_sync(sync_bot.process_new_messages, message)
+
+@bot.callback_query_handler(func=lambda call: True)
+async def delegate_callback(call):
+    await _run_sync(sync_bot.process_new_callback_query, call)
+
+metrics.instrument_bot(bot)
+tracing.instrument_bot(bot)
+
+async def run():
+    # Sxema migratsiyasi sinxron pool orqali (main.py dagi kabi); async pool birinchi so'rovda ochiladi
+    main.db_instance.on_connect(main.init_db)
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(_executor, main.is_db_ready)
+    if await is_db_ready():
+        print("✅ PostgreSQL (async) ga muvaffaqiyatli ulanildi")
+    else:
+        print("❌ PostgreSQL ga ulanib bo'lmadi, keyingi so'rovlarda qayta urinadi")
+
+    try:
+        await bot.delete_webhook()
+    except Exception:
+        pass
+
+    try:
+        await bot.infinity_polling(timeout=60, request_timeout=90, logger_level=logging.ERROR)
+    finally:
+        await bot.close_session()
+        await async_db.close()
+        _executor.shutdown(wait=False)
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("🚀 GarajHub Bot (asyncio versiyasi) ishga tushdi...")
+    print(f"👨‍💼 Admin ID: {ADMIN_ID}")
+    print(f"📢 Kanal: {CHANNEL_USERNAME}")
+    print(f"🔁 Sinxron handlerlar uchun threadlar: {SYNC_HANDLER_WORKERS}")
+    print("=" * 60)
+
+    metrics_port = os.getenv('METRICS_PORT')
+    if metrics_port:
+        metrics.start_http_server(int(metrics_port))
+        print(f"📈 Metrikalar: http://{metrics.METRICS_HOST}:{metrics_port}/metrics")
+
+    asyncio.run(run())
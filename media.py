@@ -0,0 +1,130 @@
+# media.py - Telegram media registry: file_id lar va ularning metama'lumotlari (media_files jadvali)
+#
+# Telegram yuklangan har bir faylga file_id beradi; shu file_id bilan rasm istalgan chatga qayta yuklanmasdan,
+# kichik so'rov bilan yuboriladi. Registry foydalanuvchi yuborgan rasmlarni (logo, natijalar) o'lchami bilan
+# saqlaydi, admin yuklagan baytlarni SHA-256 bo'yicha eslab qoladi (bir rasm ikki marta yuklanmaydi).
+# file_id lar oldindan tekshirilmaydi: Telegram rad etganda (wrong file identifier) yaroqsiz deb belgilanadi.
+import hashlib
+import logging
+import os
+import threading
+from typing import Optional
+
+from db import get_media_file_by_hash, invalidate_media_file, save_media_file
+
+logger = logging.getLogger(__name__)
+
+# Ixtiyoriy: fan-out dan oldin fayl yuklanadigan chat (masalan yopiq kanal); bo'lmasa birinchi qabul qiluvchiga
+MEDIA_STORAGE_CHAT_ID = os.getenv('MEDIA_STORAGE_CHAT_ID')
+# Bot API cheklovlari: sendPhoto uchun fayl hajmi va caption uzunligi
+MAX_PHOTO_SIZE = 10 * 1024 * 1024
+MAX_CAPTION_LENGTH = 1024
+
+_BAD_FILE_ERRORS = ('wrong file identifier', 'wrong remote file identifier', 'file_reference')
+
+def is_bad_file_error(error) -> bool:
+    """Telegram file_id ni rad etdimi (sync va async ApiTelegramException uchun)"""
+    description = str(getattr(error, 'description', '') or '').lower()
+    return getattr(error, 'error_code', None) == 400 and any(text in description for text in _BAD_FILE_ERRORS)
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+class MediaRegistry:
+    """Jarayon ichidagi kesh (yaroqsiz file_id lar, hash -> file_id) + media_files jadvali"""
+
+    def __init__(self):
+        self._invalid = set()
+        self._by_hash = {}
+        self._lock = threading.Lock()
+
+    def register(self, photo_sizes, source: str, data_hash: Optional[str] = None) -> Optional[str]:
+        """message.photo (PhotoSize ro'yxati) dagi eng katta o'lcham: jadvalga yoziladi, file_id qaytariladi"""
+        if not photo_sizes:
+            return None
+        photo = photo_sizes[-1]
+        save_media_file(photo.file_id, photo.file_unique_id, 'photo', source, data_hash,
+                        photo.file_size, photo.width, photo.height)
+        with self._lock:
+            self._invalid.discard(photo.file_id)
+            if data_hash:
+                self._by_hash[data_hash] = photo.file_id
+        return photo.file_id
+
+    def find(self, data_hash: str) -> Optional[str]:
+        """Shu baytlar avval yuklanganmi - yaroqli file_id yoki None"""
+        with self._lock:
+            file_id = self._by_hash.get(data_hash)
+        if file_id is None:
+            row = get_media_file_by_hash(data_hash)
+            file_id = row['file_id'] if row else None
+        if file_id is None or not self.is_valid(file_id):
+            return None
+        with self._lock:
+            self._by_hash[data_hash] = file_id
+        return file_id
+
+    def is_valid(self, file_id: str) -> bool:
+        return file_id not in self._invalid
+
+    def mark_invalid(self, file_id: str):
+        """Faqat shu jarayonda (async kod jadvalni db_async orqali yangilaydi)"""
+        with self._lock:
+            self._invalid.add(file_id)
+            for data_hash in [h for h, f in self._by_hash.items() if f == file_id]:
+                del self._by_hash[data_hash]
+        logger.warning(f"Telegram file_id yaroqsiz: {file_id[:24]}...")
+
+    def invalidate(self, file_id: str):
+        self.mark_invalid(file_id)
+        invalidate_media_file(file_id)
+
+registry = MediaRegistry()
+
+class PhotoFanout:
+    """Bitta rasmni ko'p chatga yuborish: fayl ko'pi bilan bir marta yuklanadi, keyin faqat file_id.
+
+    photo - file_id (str) yoki rasm baytlari. Bitta fan-out tsikli ichida ishlatiladi (thread-safe emas).
+    """
+
+    def __init__(self, photo, source: str):
+        self.source = source
+        self.uploads = 0
+        if isinstance(photo, (bytes, bytearray)):
+            self.data = bytes(photo)
+            self.hash = content_hash(self.data)
+            self.file_id = registry.find(self.hash)
+        else:
+            self.data = None
+            self.hash = None
+            self.file_id = photo if photo and registry.is_valid(photo) else None
+
+    def preupload(self, bot) -> bool:
+        """MEDIA_STORAGE_CHAT_ID bo'lsa faylni oldindan o'sha chatga yuklash (file_id tayyor bo'lsa - hech narsa)"""
+        if self.file_id is not None or self.data is None or not MEDIA_STORAGE_CHAT_ID:
+            return self.file_id is not None
+        try:
+            self.send(bot, MEDIA_STORAGE_CHAT_ID, disable_notification=True)
+        except Exception as e:
+            logger.error(f"Rasmni oldindan yuklashda xatolik: {e}")
+        return self.file_id is not None
+
+    def send(self, bot, chat_id, **kwargs):
+        if self.file_id is not None:
+            try:
+                return bot.send_photo(chat_id, self.file_id, **kwargs)
+            except Exception as e:
+                if not is_bad_file_error(e):
+                    raise
+                registry.invalidate(self.file_id)
+                self.file_id = None
+                if self.data is None:
+                    raise
+
+        if self.data is None:
+            raise ValueError("Rasm file_id si yaroqsiz va qayta yuklash uchun fayl yo'q")
+
+        message = bot.send_photo(chat_id, self.data, **kwargs)
+        self.uploads += 1
+        self.file_id = registry.register(message.photo, self.source, self.hash)
+        return message
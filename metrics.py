@@ -0,0 +1,450 @@
+# metrics.py - Prometheus formatidagi metrikalar (Counter, Gauge, Histogram) va /metrics
+import inspect
+import math
+import os
+import threading
+import time
+from functools import wraps
+from typing import Callable, Dict, Iterable, Optional, Sequence, Tuple
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Bot jarayonidagi /metrics server manzili: tashqi scraper uchun 0.0.0.0 ni ochiq ko'rsatish kerak
+METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')
+
+# Standart gistogramma chegaralari (soniya)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+INF_LABEL = 'le="+Inf"'
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _format_labels(names: Sequence[str], values: Sequence, extra: str = '') -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+class Metric:
+    """Label lar bo'yicha bolalar (child) ni saqlovchi asosiy klass"""
+    kind = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple, object] = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._default = self._new_child()
+            self._children[()] = self._default
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values):
+        """Label qiymatlari uchun child (bir marta yaratiladi, keyin lug'atdan olinadi)"""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name}: {len(self.labelnames)} ta label kutilgan")
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def samples(self):
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return '\n'.join(lines)
+
+class _CounterChild:
+    __slots__ = ('value', '_lock')
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+class Counter(Metric):
+    kind = 'counter'
+    _new_child = _CounterChild
+
+    def inc(self, amount: float = 1.0):
+        self._default.inc(amount)
+
+    def samples(self):
+        for values, child in list(self._children.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.value)}"
+
+class _GaugeChild:
+    __slots__ = ('value', 'function', '_lock')
+
+    def __init__(self):
+        self.value = 0.0
+        self.function = None
+        self._lock = threading.Lock()
+
+    def set(self, value: float):
+        self.value = value
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        self.inc(-amount)
+
+    def set_function(self, function: Callable[[], float]):
+        """Qiymat har /metrics so'rovida shu funksiyadan olinadi"""
+        self.function = function
+
+    def get(self) -> float:
+        if self.function is not None:
+            try:
+                return float(self.function())
+            except Exception:
+                return float('nan')
+        return self.value
+
+class Gauge(Metric):
+    kind = 'gauge'
+    _new_child = _GaugeChild
+
+    def set(self, value: float):
+        self._default.set(value)
+
+    def inc(self, amount: float = 1.0):
+        self._default.inc(amount)
+
+    def dec(self, amount: float = 1.0):
+        self._default.dec(amount)
+
+    def set_function(self, function: Callable[[], float]):
+        self._default.set_function(function)
+
+    def samples(self):
+        for values, child in list(self._children.items()):
+            value = child.get()
+            if not math.isnan(value):
+                yield f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(value)}"
+
+class _HistogramChild:
+    __slots__ = ('buckets', 'counts', 'sum', 'count', '_lock')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        with self._lock:
+            self.sum += value
+            self.count += 1
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self.counts[i] += 1
+                    break
+
+    def time(self):
+        return _Timer(self.observe)
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        self._default.observe(value)
+
+    def time(self):
+        return self._default.time()
+
+    def samples(self):
+        for values, child in list(self._children.items()):
+            with child._lock:
+                counts, total, count = list(child.counts), child.sum, child.count
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, values, le)} {cumulative}"
+            yield f"{self.name}_bucket{_format_labels(self.labelnames, values, INF_LABEL)} {count}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, values)} {_format_value(total)}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, values)} {count}"
+
+class _Timer:
+    """with histogram.time(): ... - blok davomiyligini yozish"""
+    __slots__ = ('_observe', '_start')
+
+    def __init__(self, observe):
+        self._observe = observe
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._observe(time.perf_counter() - self._start)
+        return False
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: Metric) -> Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return '\n'.join(metric.render() for metric in metrics) + '\n'
+
+REGISTRY = Registry()
+
+def counter(name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+    return REGISTRY.register(Counter(name, documentation, labelnames))
+
+def gauge(name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+    return REGISTRY.register(Gauge(name, documentation, labelnames))
+
+def histogram(name: str, documentation: str, labelnames: Iterable[str] = (),
+              buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+    return REGISTRY.register(Histogram(name, documentation, labelnames, buckets))
+
+# =========== ILOVA METRIKALARI ===========
+
+HTTP_REQUEST_DURATION = histogram(
+    'http_request_duration_seconds', "Admin API so'rovlari davomiyligi", ('method', 'route', 'status'))
+DB_QUERY_DURATION = histogram(
+    'db_query_duration_seconds', "db.py funksiyalaridagi so'rovlar davomiyligi", ('function',))
+DB_QUERIES = counter(
+    'db_queries_total', "db.py funksiyalaridagi so'rovlar soni", ('function', 'status'))
+DB_POOL_CONNECTIONS = gauge(
+    'db_pool_connections', "Pooldagi ulanishlar (in_use/idle/max)", ('state',))
+BOT_HANDLER_DURATION = histogram(
+    'bot_handler_duration_seconds', "Bot handlerlari davomiyligi", ('handler',))
+BOT_HANDLER_ERRORS = counter(
+    'bot_handler_errors_total', "Xato bilan tugagan bot handlerlari", ('handler',))
+TELEGRAM_API_DURATION = histogram(
+    'telegram_api_request_duration_seconds', "Telegram Bot API so'rovlari davomiyligi", ('method',),
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 65.0))
+TELEGRAM_API_REQUESTS = counter(
+    'telegram_api_requests_total', "Telegram Bot API so'rovlari (HTTP status bo'yicha)", ('method', 'status'))
+TELEGRAM_API_RATE_LIMITED = counter(
+    'telegram_api_rate_limited_total', "Telegram qaytargan 429 (Too Many Requests) javoblari", ('method',))
+TELEGRAM_API_THROTTLE_WAIT = histogram(
+    'telegram_api_throttle_wait_seconds', "Rate limiter navbatida kutilgan vaqt", ('priority',),
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0))
+TELEGRAM_API_DROPPED = counter(
+    'telegram_api_dropped_total', "Navbati to'lgani yoki muddati o'tgani uchun yuborilmagan so'rovlar", ('method', 'priority'))
+TELEGRAM_API_QUEUED = gauge(
+    'telegram_api_queued', "Rate limiter ni kutayotgan so'rovlar (ustuvorlik klassi bo'yicha)", ('priority',))
+TELEGRAM_API_CONNECTIONS = gauge(
+    'telegram_api_http_connections', "Telegram API HTTP ulanishlari (opened - jami ochilgan, idle, max)", ('state',))
+BROADCAST_MESSAGES = counter(
+    'broadcast_messages_total', "Broadcast orqali yuborilgan xabarlar", ('result',))
+BROADCAST_DURATION = histogram(
+    'broadcast_duration_seconds', "Bitta broadcast ning umumiy davomiyligi",
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1800))
+
+# =========== DECORATORLAR ===========
+
+def timed(metric: Histogram, *label_values, errors: Optional[Counter] = None):
+    """Funksiya davomiyligini gistogrammaga yozish (xatolar ixtiyoriy counterga)"""
+    child = metric.labels(*label_values) if label_values else metric._default
+    error_child = errors.labels(*label_values) if errors is not None and label_values else None
+
+    def decorator(fn):
+        if inspect.iscoroutinefunction(fn):
+            # AsyncTeleBot handlerlari: await tugaguncha o'lchanadi
+            @wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return await fn(*args, **kwargs)
+                except Exception:
+                    if error_child is not None:
+                        error_child.inc()
+                    raise
+                finally:
+                    child.observe(time.perf_counter() - start)
+            return async_wrapper
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            except Exception:
+                if error_child is not None:
+                    error_child.inc()
+                raise
+            finally:
+                child.observe(time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+# TeleBot va AsyncTeleBot dagi handler ro'yxatlari (metrikalar va tracing ikkalasi shu yerdan o'raydi)
+BOT_HANDLER_LISTS = (
+    'message_handlers', 'edited_message_handlers', 'callback_query_handlers',
+    'inline_handlers', 'chat_join_request_handlers', 'my_chat_member_handlers'
+)
+
+def wrap_bot_handlers(bot, wrap: Callable[[Callable], Callable], flag: str):
+    """Ro'yxatdan o'tgan har bir handler funksiyasini wrap(function) bilan almashtirish.
+
+    flag - o'ralgan funksiyaga qo'yiladigan belgi: qayta chaqirilganda handler ikki marta o'ralmaydi.
+    """
+    for attr in BOT_HANDLER_LISTS:
+        for handler in getattr(bot, attr, None) or []:
+            function = handler.get('function')
+            if function is None or getattr(function, flag, False):
+                continue
+            wrapped = wrap(function)
+            setattr(wrapped, flag, True)
+            handler['function'] = wrapped
+
+def instrument_bot(bot):
+    """Ro'yxatdan o'tgan barcha handlerlarni davomiylik metrikasi bilan o'rash"""
+    wrap_bot_handlers(
+        bot, lambda function: timed(BOT_HANDLER_DURATION, function.__name__, errors=BOT_HANDLER_ERRORS)(function),
+        '_metrics_wrapped')
+
+def track_pool(database):
+    """Pool holatini har /metrics so'rovida o'qish"""
+    def state(name):
+        def read():
+            pool = database._connection_pool
+            if pool is None:
+                return 0
+            if name == 'in_use':
+                return len(pool._used)
+            if name == 'idle':
+                return len(pool._pool)
+            return pool.maxconn
+        return read
+
+    for name in ('in_use', 'idle', 'max'):
+        DB_POOL_CONNECTIONS.labels(name).set_function(state(name))
+
+def track_limiter(limiter):
+    """telegram_api rate limiter navbatlarini har /metrics so'rovida o'qish"""
+    def queued(name):
+        return lambda: limiter.queue_sizes()[name]
+
+    for name in limiter.queue_sizes():
+        TELEGRAM_API_QUEUED.labels(name).set_function(queued(name))
+
+def track_http_session(session):
+    """telegram_api keep-alive pool holatini har /metrics so'rovida o'qish"""
+    def pools():
+        return [pool for adapter in set(session.adapters.values())
+                for pool in list(adapter.poolmanager.pools._container.values())]
+
+    def state(name):
+        def read():
+            if name == 'opened':
+                return sum(pool.num_connections for pool in pools())
+            if name == 'idle':
+                return sum(1 for pool in pools() for conn in list(pool.pool.queue) if conn is not None)
+            return max((adapter._pool_maxsize for adapter in set(session.adapters.values())), default=0)
+        return read
+
+    for name in ('opened', 'idle', 'max'):
+        TELEGRAM_API_CONNECTIONS.labels(name).set_function(state(name))
+
+def render() -> str:
+    return REGISTRY.render()
+
+# =========== EKSPORT ===========
+
+def init_app(app, token: Optional[str] = None, auth: Optional[Callable] = None):
+    """Flask: har so'rov davomiyligi va /metrics endpointi.
+
+    /metrics METRICS_TOKEN (Authorization: Bearer) bilan; token yo'q bo'lsa auth decorator (masalan
+    login_required) bilan. Ikkalasi ham bo'lmasa endpoint qo'shilmaydi.
+    """
+    from flask import Response, g, request
+
+    token = token if token is not None else os.getenv('METRICS_TOKEN')
+
+    @app.before_request
+    def _start_timer():
+        g._metrics_start = time.perf_counter()
+
+    @app.after_request
+    def _record_request(response):
+        start = g.pop('_metrics_start', None)
+        if start is not None:
+            route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+            HTTP_REQUEST_DURATION.labels(request.method, route, response.status_code).observe(
+                time.perf_counter() - start)
+        return response
+
+    def metrics_endpoint():
+        return Response(render(), content_type=CONTENT_TYPE)
+
+    def token_required(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.headers.get('Authorization') != f'Bearer {token}':
+                return Response('Unauthorized\n', status=401, mimetype='text/plain')
+            return view(*args, **kwargs)
+        return wrapper
+
+    # Admin panel ochiq - /metrics hech qachon autentifikatsiyasiz berilmaydi
+    if token:
+        app.add_url_rule('/metrics', 'metrics', token_required(metrics_endpoint))
+    elif auth is not None:
+        app.add_url_rule('/metrics', 'metrics', auth(metrics_endpoint))
+
+def start_http_server(port: int, host: str = METRICS_HOST):
+    """Flask siz jarayonlar (main.py) uchun fon threadidagi /metrics server (standart faqat localhost)"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    thread = threading.Thread(target=server.serve_forever, name='metrics-http', daemon=True)
+    thread.start()
+    return server
@@ -0,0 +1,109 @@
+# migrate.py - Versiyalangan sxema migratsiyalari
+import os
+import re
+import sys
+import logging
+from contextlib import nullcontext
+from typing import List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Migratsiya fayllari: migrations/0001_nomi.sql, migrations/0002_nomi.sql, ...
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+MIGRATION_FILE_RE = re.compile(r'^(\d+)_([A-Za-z0-9_]+)\.sql$')
+
+# Bir vaqtda ishga tushgan jarayonlar (gunicorn workerlar, bot) uchun umumiy advisory lock kaliti
+MIGRATION_LOCK_KEY = 7220260026
+
+SCHEMA_VERSION_SQL = """
+    CREATE TABLE IF NOT EXISTS schema_version (
+        version INTEGER PRIMARY KEY,
+        name VARCHAR(200) NOT NULL,
+        applied_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+def discover_migrations(directory: str = MIGRATIONS_DIR) -> List[Tuple[int, str, str]]:
+    """Migratsiya fayllarini versiya tartibida topish: [(version, name, path), ...]"""
+    migrations = {}
+    for filename in os.listdir(directory):
+        match = MIGRATION_FILE_RE.match(filename)
+        if not match:
+            continue
+        version = int(match.group(1))
+        if version in migrations:
+            raise ValueError(f"Takrorlangan migratsiya versiyasi: {version} ({filename})")
+        migrations[version] = (version, match.group(2), os.path.join(directory, filename))
+    return [migrations[v] for v in sorted(migrations)]
+
+def latest_version(directory: str = MIGRATIONS_DIR) -> int:
+    """Diskdagi eng so'nggi migratsiya versiyasi"""
+    migrations = discover_migrations(directory)
+    return migrations[-1][0] if migrations else 0
+
+def get_current_version(cur) -> int:
+    """Database dagi joriy sxema versiyasi (jadval bo'lmasa 0)"""
+    cur.execute("SELECT to_regclass('public.schema_version')")
+    if cur.fetchone()[0] is None:
+        return 0
+    cur.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version")
+    return cur.fetchone()[0]
+
+def migrate(database=None, directory: str = MIGRATIONS_DIR) -> int:
+    """Kutilayotgan migratsiyalarni qo'llash va joriy versiyani qaytarish (database - pool yoki tayyor ulanish)"""
+    if database is None:
+        from db import db_instance as database
+
+    migrations = discover_migrations(directory)
+    target = migrations[-1][0] if migrations else 0
+
+    # tools/ skriptlari psycopg2 ulanishini to'g'ridan-to'g'ri beradi
+    connection = database.get_connection() if hasattr(database, 'get_connection') else nullcontext(database)
+    with connection as conn:
+        try:
+            # Tezkor yo'l: sxema yangi bo'lsa lock va DDL siz qaytish
+            with conn.cursor() as cur:
+                current = get_current_version(cur)
+            conn.commit()
+            if current >= target:
+                logger.debug(f"Sxema yangi (versiya {current}), migratsiya kerak emas")
+                return current
+
+            with conn.cursor() as cur:
+                # Lock tranzaksiya oxirida avtomatik bo'shatiladi
+                cur.execute("SELECT pg_advisory_xact_lock(%s)", (MIGRATION_LOCK_KEY,))
+                cur.execute(SCHEMA_VERSION_SQL)
+
+                # Lock kutilayotganda boshqa jarayon migratsiya qilgan bo'lishi mumkin
+                current = get_current_version(cur)
+                for version, name, path in migrations:
+                    if version <= current:
+                        continue
+                    with open(path, encoding='utf-8') as f:
+                        sql = f.read()
+                    logger.info(f"Migratsiya qo'llanmoqda: {version:04d}_{name}")
+                    cur.execute(sql)
+                    cur.execute(
+                        "INSERT INTO schema_version (version, name) VALUES (%s, %s)",
+                        (version, name)
+                    )
+                    current = version
+            conn.commit()
+            logger.info(f"Sxema versiyasi: {current}")
+            return current
+        except Exception:
+            conn.rollback()
+            raise
+
+# Qo'lda ishga tushirish: python migrate.py [status]
+if __name__ == '__main__':
+    from db import db_instance
+
+    if len(sys.argv) > 1 and sys.argv[1] == 'status':
+        with db_instance.get_cursor() as cur:
+            current = get_current_version(cur)
+        print(f"🗄️ Joriy versiya: {current}, oxirgi versiya: {latest_version()}")
+        for version, name, _ in discover_migrations():
+            print(f"   {'✅' if version <= current else '⏳'} {version:04d}_{name}")
+    else:
+        print(f"✅ Sxema versiyasi: {migrate(db_instance)}")
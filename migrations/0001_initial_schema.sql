@@ -0,0 +1,91 @@
+-- 0001: Initial schema (previously executed by init_db on every start)
+
+-- Users table
+CREATE TABLE IF NOT EXISTS users (
+    id SERIAL PRIMARY KEY,
+    user_id BIGINT UNIQUE NOT NULL,
+    username VARCHAR(100),
+    first_name VARCHAR(100),
+    last_name VARCHAR(100),
+    phone VARCHAR(20),
+    bio TEXT,
+    joined_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    last_seen TIMESTAMP WITH TIME ZONE,
+    status VARCHAR(20) DEFAULT 'active'
+);
+
+-- Indexes for users
+CREATE INDEX IF NOT EXISTS idx_users_user_id ON users(user_id);
+CREATE INDEX IF NOT EXISTS idx_users_username ON users(username);
+CREATE INDEX IF NOT EXISTS idx_users_joined_at ON users(joined_at);
+CREATE INDEX IF NOT EXISTS idx_users_status ON users(status);
+
+-- Startups table
+CREATE TABLE IF NOT EXISTS startups (
+    id SERIAL PRIMARY KEY,
+    name VARCHAR(200) NOT NULL,
+    description TEXT,
+    logo VARCHAR(500),
+    group_link VARCHAR(500),
+    owner_id BIGINT NOT NULL REFERENCES users(user_id),
+    status VARCHAR(20) DEFAULT 'pending',
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMP WITH TIME ZONE,
+    ended_at TIMESTAMP WITH TIME ZONE,
+    results TEXT,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Indexes for startups
+CREATE INDEX IF NOT EXISTS idx_startups_owner_id ON startups(owner_id);
+CREATE INDEX IF NOT EXISTS idx_startups_status ON startups(status);
+CREATE INDEX IF NOT EXISTS idx_startups_created_at ON startups(created_at);
+CREATE INDEX IF NOT EXISTS idx_startups_status_created ON startups(status, created_at DESC);
+
+-- Startup members table
+CREATE TABLE IF NOT EXISTS startup_members (
+    id SERIAL PRIMARY KEY,
+    startup_id INTEGER NOT NULL REFERENCES startups(id) ON DELETE CASCADE,
+    user_id BIGINT NOT NULL REFERENCES users(user_id),
+    status VARCHAR(20) DEFAULT 'pending',
+    joined_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE(startup_id, user_id)
+);
+
+-- Indexes for startup_members
+CREATE INDEX IF NOT EXISTS idx_startup_members_startup_id ON startup_members(startup_id);
+CREATE INDEX IF NOT EXISTS idx_startup_members_user_id ON startup_members(user_id);
+CREATE INDEX IF NOT EXISTS idx_startup_members_status ON startup_members(status);
+CREATE INDEX IF NOT EXISTS idx_startup_members_startup_status ON startup_members(startup_id, status);
+
+-- Messages table for broadcast
+CREATE TABLE IF NOT EXISTS broadcast_messages (
+    id SERIAL PRIMARY KEY,
+    message TEXT NOT NULL,
+    recipient_type VARCHAR(20) DEFAULT 'all',
+    sent_by VARCHAR(100),
+    sent_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    sent_count INTEGER DEFAULT 0,
+    failed_count INTEGER DEFAULT 0
+);
+
+-- Admin activity log
+CREATE TABLE IF NOT EXISTS admin_logs (
+    id SERIAL PRIMARY KEY,
+    admin_username VARCHAR(100),
+    action VARCHAR(200),
+    details JSONB,
+    ip_address VARCHAR(45),
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Analytics cache
+CREATE TABLE IF NOT EXISTS analytics_cache (
+    id SERIAL PRIMARY KEY,
+    cache_key VARCHAR(100) UNIQUE NOT NULL,
+    data JSONB NOT NULL,
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,4 @@
+-- 0002: Profile fields written by the bot (gender, birth date)
+
+ALTER TABLE users ADD COLUMN IF NOT EXISTS gender VARCHAR(20);
+ALTER TABLE users ADD COLUMN IF NOT EXISTS birth_date VARCHAR(20);
@@ -0,0 +1,5 @@
+-- 0003: Indexes backing get_data_version() (MAX(updated_at) per table)
+
+CREATE INDEX IF NOT EXISTS idx_users_updated_at ON users(updated_at);
+CREATE INDEX IF NOT EXISTS idx_startups_updated_at ON startups(updated_at);
+CREATE INDEX IF NOT EXISTS idx_startup_members_updated_at ON startup_members(updated_at);
@@ -0,0 +1,20 @@
+-- 0004: Telegram file_id registry for media sent to many chats (logos, results photos, broadcast images)
+
+CREATE TABLE IF NOT EXISTS media_files (
+    id SERIAL PRIMARY KEY,
+    file_id TEXT NOT NULL,
+    file_unique_id VARCHAR(100) UNIQUE NOT NULL,
+    kind VARCHAR(20) NOT NULL DEFAULT 'photo',
+    source VARCHAR(50),
+    -- SHA-256 of the uploaded bytes, so the same image is never uploaded twice
+    content_hash CHAR(64),
+    file_size INTEGER,
+    width INTEGER,
+    height INTEGER,
+    is_valid BOOLEAN DEFAULT TRUE,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_media_files_file_id ON media_files(file_id);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_media_files_content_hash ON media_files(content_hash) WHERE is_valid;
@@ -0,0 +1,98 @@
+# models.py - Database qatorlari uchun yengil (__slots__) modellar
+from typing import Callable, Dict, Sequence
+
+class Row:
+    """__slots__ asosidagi qator: dict kabi o'qiladi (get, [], in, keys), JSON uchun to_dict()"""
+    __slots__ = ()
+    _fields = frozenset()
+    _mappers: Dict[tuple, Callable] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._fields = frozenset(cls.__slots__)
+
+    @classmethod
+    def mapper(cls, columns: Sequence[str]) -> Callable:
+        """cursor.description ustunlari bo'yicha tuple -> model konstruktori (keshlanadi)"""
+        key = (cls, tuple(columns))
+        make = Row._mappers.get(key)
+        if make is None:
+            # Modelda yo'q ustunlar tashlab yuboriladi
+            targets = ', '.join(f'obj.{name}' if name in cls._fields else '_' for name in columns)
+            source = (
+                f"def make(row, _new=_new, _cls=_cls):\n"
+                f"    obj = _new(_cls)\n"
+                f"    {targets}, = row\n"
+                f"    return obj\n"
+            )
+            namespace = {'_new': object.__new__, '_cls': cls}
+            exec(source, namespace)
+            make = Row._mappers[key] = namespace['make']
+        return make
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Row':
+        obj = object.__new__(cls)
+        for name, value in data.items():
+            if name in cls._fields:
+                setattr(obj, name, value)
+        return obj
+
+    def get(self, key, default=None):
+        if key not in self._fields:
+            return default
+        return getattr(self, key, default)
+
+    def __getitem__(self, key):
+        if key in self._fields:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                pass
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        return key in self._fields and hasattr(self, key)
+
+    def keys(self):
+        """So'rovda tanlangan (to'ldirilgan) maydonlar"""
+        return [name for name in self.__slots__ if hasattr(self, name)]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def to_dict(self) -> Dict:
+        return {name: getattr(self, name) for name in self.keys()}
+
+    def __eq__(self, other):
+        if isinstance(other, Row):
+            return type(self) is type(other) and self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+class User(Row):
+    """users jadvali qatori"""
+    __slots__ = (
+        'id', 'user_id', 'username', 'first_name', 'last_name', 'phone', 'bio',
+        'gender', 'birth_date', 'joined_at', 'updated_at', 'last_seen', 'status'
+    )
+
+class Startup(Row):
+    """startups jadvali qatori (+ egasi haqidagi JOIN maydonlari va cards.py kesh versiyasi)"""
+    __slots__ = (
+        'id', 'name', 'description', 'logo', 'group_link', 'owner_id', 'status',
+        'created_at', 'started_at', 'ended_at', 'results', 'updated_at',
+        'owner_first_name', 'owner_last_name', 'owner_username', 'owner_phone',
+        'version', 'owner_updated_at'
+    )
+
+class StartupMember(Row):
+    """Startup a'zosi: startup_members + users JOIN qatori"""
+    __slots__ = (
+        'id', 'startup_id', 'user_id', 'first_name', 'last_name', 'username',
+        'phone', 'bio', 'status', 'joined_at'
+    )
@@ -0,0 +1,138 @@
+# profiler.py - Ishlab turgan jarayon uchun sampling profiler (flamegraph uchun collapsed stack)
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from typing import Dict, Optional
+
+# Bitta profil davomiyligi chegarasi (soniya)
+MAX_PROFILE_SECONDS = float(os.getenv('PROFILE_MAX_SECONDS', 60))
+DEFAULT_INTERVAL = 0.005
+
+# Eng yuqori frame shu funksiyalardan biri bo'lsa thread kutmoqda (CPU ishlatmayapti)
+IDLE_FUNCTIONS = {
+    'wait', 'sleep', 'select', 'poll', 'accept', 'get', 'recv', 'recv_into', 'readinto',
+    '_wait_for_tstate_lock', 'serve_forever', 'handle_request', 'read', '_recv', 'epoll'
+}
+
+class ProfilerBusy(Exception):
+    """Boshqa profil hali tugamagan"""
+
+_lock = threading.Lock()
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    filename = code.co_filename
+    # Loyiha fayllari qisqa nom bilan, kutubxonalar site-packages dan keyingi yo'l bilan
+    marker = 'site-packages' + os.sep
+    if marker in filename:
+        filename = filename.split(marker, 1)[1]
+    else:
+        filename = os.path.basename(filename)
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(';', ':')
+
+def _sample(stacks: Counter, own_thread: int, names: Dict[int, str], include_idle: bool):
+    for thread_id, frame in sys._current_frames().items():
+        if thread_id == own_thread:
+            continue
+        if not include_idle and frame.f_code.co_name in IDLE_FUNCTIONS:
+            continue
+        labels = []
+        while frame is not None:
+            labels.append(_frame_label(frame))
+            frame = frame.f_back
+        labels.append(names.get(thread_id, f'thread-{thread_id}'))
+        labels.reverse()
+        stacks[';'.join(labels)] += 1
+
+def profile(seconds: float, interval: float = DEFAULT_INTERVAL, include_idle: bool = False) -> Dict:
+    """seconds davomida barcha threadlarni sampling qilish; bir vaqtda faqat bitta profil"""
+    seconds = max(0.1, min(float(seconds), MAX_PROFILE_SECONDS))
+    interval = max(0.001, float(interval))
+    if not _lock.acquire(blocking=False):
+        raise ProfilerBusy("Profil allaqachon ishlamoqda")
+
+    try:
+        stacks = Counter()
+        own_thread = threading.get_ident()
+        samples = 0
+        started = time.perf_counter()
+        deadline = started + seconds
+        names = {}
+        next_names_refresh = 0.0
+        while True:
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            if now >= next_names_refresh:
+                names = {t.ident: t.name for t in threading.enumerate()}
+                next_names_refresh = now + 1.0
+            _sample(stacks, own_thread, names, include_idle)
+            samples += 1
+            time.sleep(interval)
+        return {
+            'seconds': round(time.perf_counter() - started, 3),
+            'samples': samples,
+            'stacks': stacks
+        }
+    finally:
+        _lock.release()
+
+def collapsed(result: Dict) -> str:
+    """Brendan Gregg collapsed formati: 'thread;func (file:line);... count'"""
+    lines = [f"{stack} {count}" for stack, count in result['stacks'].most_common()]
+    return '\n'.join(lines) + ('\n' if lines else '')
+
+def is_running() -> bool:
+    return _lock.locked()
+
+def top_functions(result: Dict, limit: int = 10) -> list:
+    """Eng ko'p uchragan (o'zi ishlayotgan) funksiyalar: [(label, ulush), ...]"""
+    own = Counter()
+    total = 0
+    for stack, count in result['stacks'].items():
+        own[stack.rsplit(';', 1)[-1]] += count
+        total += count
+    return [(label, count / total) for label, count in own.most_common(limit)] if total else []
+
+# =========== FON PROFILLARI ===========
+
+# Admin API uchun: profil so'rov threadidan tashqarida ishlaydi, natija job_id bo'yicha olinadi.
+# Joblar shu jarayon xotirasida - bir nechta gunicorn worker bo'lsa so'rov boshqa workerga tushishi mumkin.
+MAX_JOBS = 5
+_jobs = OrderedDict()
+_jobs_lock = threading.Lock()
+
+def start_job(seconds: float, interval: float = DEFAULT_INTERVAL, include_idle: bool = False) -> Dict:
+    """Profilni fon threadida boshlash; job (id, status, seconds) qaytaradi"""
+    if is_running():
+        raise ProfilerBusy("Profil allaqachon ishlamoqda")
+
+    job = {
+        'id': uuid.uuid4().hex[:12],
+        'status': 'running',
+        'seconds': max(0.1, min(float(seconds), MAX_PROFILE_SECONDS)),
+        'result': None,
+        'error': None
+    }
+    with _jobs_lock:
+        _jobs[job['id']] = job
+        while len(_jobs) > MAX_JOBS:
+            _jobs.popitem(last=False)
+
+    def run():
+        try:
+            job['result'] = profile(seconds, interval=interval, include_idle=include_idle)
+            job['status'] = 'done'
+        except Exception as e:
+            job['error'] = str(e)
+            job['status'] = 'failed'
+
+    threading.Thread(target=run, name='profile', daemon=True).start()
+    return job
+
+def get_job(job_id: str) -> Optional[Dict]:
+    with _jobs_lock:
+        return _jobs.get(job_id)
@@ -0,0 +1,176 @@
+# query_log.py - So'rov darajasidagi o'lchov: vaqt, qatorlar soni, chaqiruvchi funksiya, sekin so'rovlar logi
+import json
+import logging
+import os
+import re
+import threading
+import time
+from functools import lru_cache
+from typing import Callable, List, NamedTuple, Optional
+
+import psycopg2
+import psycopg2.extensions
+from psycopg2 import sql as pg_sql
+
+logger = logging.getLogger('db.queries')
+
+# DB_QUERY_LOG=0 - cursorlar o'ralmaydi
+QUERY_LOG_ENABLED = os.getenv('DB_QUERY_LOG', '1').lower() not in ('0', 'false', 'no')
+# Shundan uzoq davom etgan so'rovlar sekin deb log qilinadi (millisekund)
+SLOW_QUERY_MS = float(os.getenv('DB_SLOW_QUERY_MS', 200))
+# Sekin SELECT lar uchun EXPLAIN (ANALYZE, BUFFERS); bir xil so'rov uchun EXPLAIN_INTERVAL soniyada bir marta
+EXPLAIN_SLOW = os.getenv('DB_EXPLAIN_SLOW', '').lower() in ('1', 'true', 'yes')
+EXPLAIN_INTERVAL = float(os.getenv('DB_EXPLAIN_INTERVAL', 300))
+
+class QueryEvent(NamedTuple):
+    function: str
+    sql: str
+    duration: float
+    rows: int
+    error: Optional[str]
+
+    @property
+    def normalized(self) -> str:
+        return normalize_sql(self.sql)
+
+_listeners: List[Callable[[QueryEvent], None]] = []
+_explained_at = {}
+_explain_lock = threading.Lock()
+
+def add_listener(listener: Callable[[QueryEvent], None]):
+    """Har bir so'rovdan keyin chaqiriladigan funksiya (tracing, testlar va h.k.)"""
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+def remove_listener(listener: Callable[[QueryEvent], None]):
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_LIST_RE = re.compile(r"\(\s*(?:\?|%s)(?:\s*,\s*(?:\?|%s))+\s*\)")
+_SPACE_RE = re.compile(r"\s+")
+
+@lru_cache(maxsize=1024)
+def normalize_sql(sql: str) -> str:
+    """Literal va bo'shliqlarsiz so'rov shakli (bir xil so'rovlarni guruhlash uchun)"""
+    sql = _STRING_RE.sub('?', sql)
+    sql = _NUMBER_RE.sub('?', sql)
+    sql = _LIST_RE.sub('(...)', sql)
+    return _SPACE_RE.sub(' ', sql).strip()
+
+def _query_text(cursor, query) -> str:
+    if isinstance(query, bytes):
+        return query.decode('utf-8', 'replace')
+    if isinstance(query, pg_sql.Composable):
+        try:
+            return query.as_string(cursor)
+        except Exception:
+            return repr(query)
+    return str(query)
+
+def _explain(cursor, query, vars, normalized: str) -> Optional[str]:
+    """Sekin SELECT uchun reja; xato tranzaksiyani buzmasligi uchun savepoint ichida"""
+    now = time.monotonic()
+    with _explain_lock:
+        if now - _explained_at.get(normalized, -EXPLAIN_INTERVAL) < EXPLAIN_INTERVAL:
+            return None
+        _explained_at[normalized] = now
+
+    conn = cursor.connection
+    explain_cursor = conn.cursor()
+    try:
+        use_savepoint = not conn.autocommit
+        if use_savepoint:
+            explain_cursor.execute("SAVEPOINT query_log_explain")
+        try:
+            explain_cursor.execute(b"EXPLAIN (ANALYZE, BUFFERS) " + cursor.mogrify(query, vars))
+            plan = '\n'.join(row[0] for row in explain_cursor.fetchall())
+        except psycopg2.Error as e:
+            if use_savepoint:
+                explain_cursor.execute("ROLLBACK TO SAVEPOINT query_log_explain")
+            return f"EXPLAIN xatosi: {e}".strip()
+        if use_savepoint:
+            explain_cursor.execute("RELEASE SAVEPOINT query_log_explain")
+        return plan
+    finally:
+        explain_cursor.close()
+
+def _record(cursor, query, vars, duration: float, error: Optional[str]):
+    slow = duration * 1000 >= SLOW_QUERY_MS
+    if not (_listeners or slow or error):
+        return
+
+    event = QueryEvent(
+        function=cursor.query_caller,
+        sql=_query_text(cursor, query),
+        duration=duration,
+        rows=cursor.rowcount if error is None else -1,
+        error=error
+    )
+    for listener in list(_listeners):
+        try:
+            listener(event)
+        except Exception as e:
+            logger.debug(f"Query listener xatosi: {e}")
+
+    if not (slow or error):
+        return
+
+    record = {
+        'event': 'query_error' if error else 'slow_query',
+        'function': event.function,
+        'duration_ms': round(duration * 1000, 2),
+        'rows': event.rows,
+        'sql': event.normalized
+    }
+    if error:
+        record['error'] = error
+        logger.error(json.dumps(record, ensure_ascii=False))
+        return
+
+    if EXPLAIN_SLOW and event.normalized[:6].upper() == 'SELECT' and 'FOR UPDATE' not in event.normalized.upper():
+        try:
+            plan = _explain(cursor, query, vars, event.normalized)
+        except Exception as e:
+            plan = f"EXPLAIN xatosi: {e}".strip()
+        if plan:
+            record['plan'] = plan
+    logger.warning(json.dumps(record, ensure_ascii=False))
+
+class LoggingCursorMixin:
+    """execute/executemany ni o'lchaydigan cursor qatlami"""
+    query_caller = 'unknown'
+
+    def execute(self, query, vars=None):
+        start = time.perf_counter()
+        error = None
+        try:
+            return super().execute(query, vars)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}".strip()
+            raise
+        finally:
+            _record(self, query, vars, time.perf_counter() - start, error)
+
+    def executemany(self, query, vars_list):
+        start = time.perf_counter()
+        error = None
+        try:
+            return super().executemany(query, vars_list)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}".strip()
+            raise
+        finally:
+            _record(self, query, None, time.perf_counter() - start, error)
+
+_cursor_classes = {}
+
+def logging_cursor(base=None):
+    """Berilgan cursor klassi (RealDictCursor va h.k.) ning o'lchanadigan varianti"""
+    base = base or psycopg2.extensions.cursor
+    cls = _cursor_classes.get(base)
+    if cls is None:
+        cls = type(f"Logging{base.__name__}", (LoggingCursorMixin, base), {})
+        _cursor_classes[base] = cls
+    return cls
@@ -10,29 +10,32 @@ import threading
 import time
 from dotenv import load_dotenv
 
-from db import check_database_connection
+from json_provider import FastJSONProvider
+from http_cache import response_cache
+from compression import Compressor
+import static_assets
+import metrics
+import telegram_api
+import tracing
+import profiler
+from exports import EXPORT_FORMATS, ExportBusy, export_response
+from health import health_monitor
+from media import MAX_CAPTION_LENGTH, MAX_PHOTO_SIZE, PhotoFanout
 
 # Load environment variables
 load_dotenv()
 
-# Database import
-try:
-    from db import (
-        init_db,
-        get_user, save_user, update_user_field,
-        create_startup, get_startup, get_startups_by_owner,
-        get_pending_startups, get_active_startups, update_startup_status,
-        get_statistics, get_all_users, get_recent_users, get_recent_startups,
-        get_completed_startups, get_rejected_startups, get_startup_members,
-        save_broadcast_message, log_admin_action
-    )
-    DB_AVAILABLE = True
-except ImportError as e:
-    print(f"⚠️ Database import xatosi: {e}")
-    DB_AVAILABLE = False
-    # Database bo'lmasa xatolik qaytarish
-    def database_error():
-        return jsonify({'success': False, 'error': 'Database ulanmagan'}), 500
+# Database import (ulanish birinchi so'rovda ochiladi)
+from db import (
+    init_db, db_instance, is_db_ready,
+    get_user, save_user, update_user_field,
+    create_startup, get_startup, get_startups_by_owner,
+    get_pending_startups, get_active_startups, update_startup_status,
+    get_statistics, get_all_users, get_recent_users, get_users_page, get_recent_startups,
+    get_completed_startups, get_rejected_startups, get_startup_members,
+    save_broadcast_message, log_admin_action, gather,
+    iter_users_export, iter_startups_export, USER_EXPORT_COLUMNS, STARTUP_EXPORT_COLUMNS
+)
 
 # Bot import
 try:
@@ -40,6 +43,8 @@ try:
     BOT_TOKEN = os.getenv('BOT_TOKEN')
     if BOT_TOKEN:
         bot = telebot.TeleBot(BOT_TOKEN)
+        # Broadcast ham umumiy transport (rate limiter, 429 retry, metrikalar) orqali
+        telegram_api.install()
         BOT_AVAILABLE = True
     else:
         print("⚠️ BOT_TOKEN environment variable o'rnatilmagan!")
@@ -48,7 +53,24 @@ except ImportError as e:
     print(f"⚠️ Telegram bot import xatosi: {e}")
     BOT_AVAILABLE = False
 
+# Login talab qiluvchi decorator
+def login_required(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if 'admin_logged_in' not in session:
+            return jsonify({'error': 'Unauthorized'}), 401
+        return f(*args, **kwargs)
+    return decorated_function
+
 app = Flask(__name__, template_folder='templates', static_folder='static')
+app.json = FastJSONProvider(app)
+
+# after_request hooklar teskari tartibda ishlaydi: tracing va metrikalar siqishdan keyin o'lchanadi
+tracing.init_app(app)
+# /metrics: METRICS_TOKEN bo'lmasa admin sessiyasi talab qilinadi
+metrics.init_app(app, auth=login_required)
+Compressor(app, min_size=int(os.getenv('COMPRESS_MIN_SIZE', 500)))
+static_assets.init_app(app)
 
 # Environment variables
 SECRET_KEY = os.environ.get('SECRET_KEY', 'dev-secret-key-' + str(os.urandom(24).hex()))
@@ -77,14 +99,18 @@ ADMINS = {
     }
 }
 
-# Login talab qiluvchi decorator
-def login_required(f):
-    @wraps(f)
-    def decorated_function(*args, **kwargs):
-        if 'admin_logged_in' not in session:
-            return jsonify({'error': 'Unauthorized'}), 401
-        return f(*args, **kwargs)
-    return decorated_function
+# Ko'rish harakatlarini admin logga yozish. @response_cache.cached dan tashqarida qo'yiladi: 304 va kesh
+# HIT javoblarida view chaqirilmaydi, log esa har so'rovda yoziladi
+def audit(action, details=None):
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            response = app.make_response(f(*args, **kwargs))
+            if response.status_code < 400:
+                log_admin_action(session.get('admin_username'), action, details() if details else None)
+            return response
+        return decorated_function
+    return decorator
 
 # Botni ishga tushirish funksiyasi
 def start_bot():
@@ -171,27 +197,22 @@ def check_auth():
 
 @app.route('/api/statistics')
 @login_required
+@audit('view_statistics')
+@response_cache.cached
 def get_statistics_data():
     """Statistika ma'lumotlari"""
     try:
-        if not DB_AVAILABLE:
+        if not is_db_ready():
             return jsonify({'success': False, 'error': 'Database ulanmagan'}), 500
         
         stats = get_statistics()
         
-        # Activity rate calculation
-        today = datetime.now().strftime('%Y-%m-%d')
-        recent_users = get_recent_users(1000)
-        new_today = sum(1 for user in recent_users if user.get('joined_at', '').startswith(today))
-        
-        week_ago = (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')
-        active_last_week = sum(1 for user in recent_users if user.get('joined_at', '') >= week_ago)
+        # Activity rate: bugungi va oxirgi hafta ro'yxatdan o'tganlar get_statistics dagi COUNT lardan
+        new_today = stats.get('new_users_today', 0)
+        active_last_week = stats.get('new_users_last_week', 0)
         total_users = stats.get('total_users', 1)
         activity_rate = round((active_last_week / total_users) * 100) if total_users > 0 else 0
         
-        # Log admin action
-        log_admin_action(session.get('admin_username'), 'view_statistics')
-        
         return jsonify({
             'success': True,
             'data': {
@@ -214,45 +235,18 @@ def get_statistics_data():
 def get_users():
     """Foydalanuvchilar ro'yxati"""
     try:
-        if not DB_AVAILABLE:
+        if not is_db_ready():
             return jsonify({'success': False, 'error': 'Database ulanmagan'}), 500
         
         page = int(request.args.get('page', 1))
         per_page = int(request.args.get('per_page', 20))
         search = request.args.get('search', '')
         
-        # Database dan foydalanuvchilarni olish
-        users = get_recent_users(10000)
-        
-        # Filtrlash
-        if search:
-            filtered_users = []
-            for user in users:
-                first_name = user.get('first_name', '').lower()
-                last_name = user.get('last_name', '').lower()
-                phone = user.get('phone', '').lower()
-                search_lower = search.lower()
-                
-                if (search_lower in first_name or 
-                    search_lower in last_name or 
-                    search_lower in phone or
-                    search_lower in str(user.get('user_id', '')).lower()):
-                    filtered_users.append(user)
-            users = filtered_users
-        
-        # Tartiblash
-        users.sort(key=lambda x: x.get('joined_at', ''), reverse=True)
-        
-        # Pagination
-        total = len(users)
-        start_idx = (page - 1) * per_page
-        end_idx = start_idx + per_page
-        paginated_users = users[start_idx:end_idx]
+        # Qidiruv va pagination SQL da - faqat so'ralgan sahifa o'qiladi
+        paginated_users, total = get_users_page(page, per_page, search)
         
-        # Formatlash
-        formatted_users = []
-        for user in paginated_users:
-            formatted_users.append({
+        formatted_users = [
+            {
                 'id': user.get('user_id', ''),
                 'user_id': user.get('user_id', ''),
                 'first_name': user.get('first_name', 'Noma\'lum'),
@@ -262,7 +256,9 @@ def get_users():
                 'bio': user.get('bio', ''),
                 'joined_at': user.get('joined_at', 'Noma\'lum'),
                 'status': user.get('status', 'active')
-            })
+            }
+            for user in paginated_users
+        ]
         
         # Log admin action
         log_admin_action(session.get('admin_username'), 'view_users', {
@@ -290,10 +286,16 @@ def get_users():
 
 @app.route('/api/startups')
 @login_required
+@audit('view_startups', lambda: {
+    'page': int(request.args.get('page', 1)),
+    'status': request.args.get('status', 'all'),
+    'search': request.args.get('search', '')
+})
+@response_cache.cached
 def get_startups_list():
     """Startaplar ro'yxati"""
     try:
-        if not DB_AVAILABLE:
+        if not is_db_ready():
             return jsonify({'success': False, 'error': 'Database ulanmagan'}), 500
         
         page = int(request.args.get('page', 1))
@@ -368,13 +370,6 @@ def get_startups_list():
         
         total_pages = (total + per_page - 1) // per_page if total > 0 else 1
         
-        # Log admin action
-        log_admin_action(session.get('admin_username'), 'view_startups', {
-            'page': page,
-            'status': status,
-            'search': search
-        })
-        
         return jsonify({
             'success': True,
             'data': formatted_startups,
@@ -397,10 +392,15 @@ def get_startups_list():
 def get_startup_details(startup_id):
     """Startap tafsilotlari"""
     try:
-        if not DB_AVAILABLE:
+        if not is_db_ready():
             return jsonify({'success': False, 'error': 'Database ulanmagan'}), 500
         
-        startup = get_startup(startup_id)
+        # Startap va a'zolar soni parallel (ro'yxat kerak emas - faqat jami son)
+        results = gather(
+            startup=(get_startup, startup_id),
+            members=(get_startup_members, startup_id, 1, 1)
+        )
+        startup = results['startup']
         if not startup:
             return jsonify({'success': False, 'error': 'Startap topilmadi'}), 404
         
@@ -413,11 +413,7 @@ def get_startup_details(startup_id):
         }
         
         # A'zolar soni
-        try:
-            members, member_count = get_startup_members(startup_id, 1, 1000)
-        except:
-            member_count = 0
-            members = []
+        members, member_count = results['members']
         
         # Owner info
         owner_info = None
@@ -460,10 +456,11 @@ def get_startup_details(startup_id):
 
 @app.route('/api/startup/<int:startup_id>/approve', methods=['POST'])
 @login_required
+@response_cache.invalidates
 def approve_startup(startup_id):
     """Startapni tasdiqlash"""
     try:
-        if not DB_AVAILABLE:
+        if not is_db_ready():
             return jsonify({'success': False, 'error': 'Database ulanmagan'}), 500
         
         success = update_startup_status(startup_id, 'active')
@@ -497,10 +494,11 @@ def approve_startup(startup_id):
 
 @app.route('/api/startup/<int:startup_id>/reject', methods=['POST'])
 @login_required
+@response_cache.invalidates
 def reject_startup(startup_id):
     """Startapni rad etish"""
     try:
-        if not DB_AVAILABLE:
+        if not is_db_ready():
             return jsonify({'success': False, 'error': 'Database ulanmagan'}), 500
         
         success = update_startup_status(startup_id, 'rejected')
@@ -535,32 +533,60 @@ def reject_startup(startup_id):
 @app.route('/api/broadcast', methods=['POST'])
 @login_required
 def broadcast_message():
-    """Xabar yuborish"""
+    """Xabar yuborish (multipart/form-data bo'lsa ixtiyoriy rasm - image)"""
     try:
-        data = request.json
+        if request.mimetype == 'multipart/form-data':
+            data = request.form
+            image = request.files.get('image')
+        else:
+            data = request.json
+            image = None
         message = data.get('message')
         recipient_type = data.get('recipient_type', 'all')
         
         if not message:
             return jsonify({'success': False, 'error': 'Xabar matni kiritilmagan'}), 400
         
+        photo = None
+        if image and image.filename:
+            if not (image.mimetype or '').startswith('image/'):
+                return jsonify({'success': False, 'error': 'Faqat rasm yuklash mumkin'}), 400
+            photo = image.read(MAX_PHOTO_SIZE + 1)
+            if len(photo) > MAX_PHOTO_SIZE:
+                return jsonify({'success': False, 'error': 'Rasm hajmi 10 MB dan oshmasligi kerak'}), 400
+        
+        text = f"📢 Admin xabari:\n\n{message}"
+        if photo and len(text) > MAX_CAPTION_LENGTH:
+            return jsonify({'success': False, 'error': f'Rasm bilan xabar {MAX_CAPTION_LENGTH} belgidan oshmasligi kerak'}), 400
+        
         # Bot orqali xabar yuborish
         sent_count = 0
         failed_count = 0
         
-        if BOT_AVAILABLE and DB_AVAILABLE:
+        if BOT_AVAILABLE and is_db_ready():
             try:
                 users = get_all_users()
                 total_users = len(users)
                 
-                for user_id in users:
-                    try:
-                        bot.send_message(user_id, f"📢 Admin xabari:\n\n{message}")
-                        sent_count += 1
-                        time.sleep(0.05)  # Flood dan qochish
-                    except Exception as e:
-                        failed_count += 1
-                        logger.error(f"Foydalanuvchiga xabar yuborishda xato {user_id}: {e}")
+                # Rasm bir marta yuklanadi (yoki avvalgi yuklashdan file_id olinadi), qolganlarga file_id yuboriladi
+                fanout = PhotoFanout(photo, 'broadcast') if photo else None
+                
+                # Tezlik telegram_api limiteri bilan (~30/s), bulk - interaktiv so'rovlarga zaxira qoladi
+                with metrics.BROADCAST_DURATION.time(), telegram_api.bulk():
+                    if fanout:
+                        fanout.preupload(bot)
+                    for user_id in users:
+                        try:
+                            if fanout:
+                                fanout.send(bot, user_id, caption=text)
+                            else:
+                                bot.send_message(user_id, text)
+                            sent_count += 1
+                            metrics.BROADCAST_MESSAGES.labels('sent').inc()
+                        except Exception as e:
+                            failed_count += 1
+                            metrics.BROADCAST_MESSAGES.labels('failed').inc()
+                            logger.error(f"Foydalanuvchiga xabar yuborishda xato {user_id}: {e}")
             except Exception as e:
                 logger.error(f"Xabar yuborishda xato: {e}")
         
@@ -576,6 +602,7 @@ def broadcast_message():
         # Log admin action
         log_admin_action(session.get('admin_username'), 'send_broadcast', {
             'message_length': len(message),
+            'has_image': photo is not None,
             'sent_count': sent_count,
             'failed_count': failed_count,
             'recipient_type': recipient_type
@@ -590,6 +617,7 @@ def broadcast_message():
                 'id': message_id,
                 'message': message,
                 'recipient_type': recipient_type,
+                'has_image': photo is not None,
                 'sent_at': datetime.now().isoformat(),
                 'sent_by': session.get('admin_username'),
                 'sent_count': sent_count,
@@ -603,14 +631,14 @@ def broadcast_message():
 
 @app.route('/api/analytics/user-growth')
 @login_required
+@audit('view_analytics', lambda: {'period': request.args.get('period', 'month')})
+@response_cache.cached
 def get_user_growth():
     """Foydalanuvchi o'sishi uchun analytics"""
     try:
-        if not DB_AVAILABLE:
+        if not is_db_ready():
             return jsonify({'success': False, 'error': 'Database ulanmagan'}), 500
         
-        period = request.args.get('period', 'month')
-        
         # Oxirgi 30 kun uchun ma'lumot
         now = datetime.now()
         data = []
@@ -632,11 +660,6 @@ def get_user_growth():
                 'total_users': len([u for u in users if u.get('joined_at', '') <= date_str])
             })
         
-        # Log admin action
-        log_admin_action(session.get('admin_username'), 'view_analytics', {
-            'period': period
-        })
-        
         return jsonify({
             'success': True,
             'data': {
@@ -658,10 +681,11 @@ def get_user_growth():
 
 @app.route('/api/analytics/startup-distribution')
 @login_required
+@response_cache.cached
 def get_startup_distribution():
     """Startap taqsimoti"""
     try:
-        if not DB_AVAILABLE:
+        if not is_db_ready():
             return jsonify({'success': False, 'error': 'Database ulanmagan'}), 500
         
         stats = get_statistics()
@@ -722,7 +746,7 @@ def settings():
                     'bot_username': bot_username,
                     'channel_username': CHANNEL_USERNAME,
                     'bot_status': bot_status,
-                    'database_status': 'online' if DB_AVAILABLE else 'offline',
+                    'database_status': 'online' if is_db_ready() else 'offline',
                     'server_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
                 }
             })
@@ -787,21 +811,128 @@ def get_backups():
         logger.error(f"Backups error: {str(e)}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
+def _export_args():
+    """Eksport parametrlari: format, status, from, to (YYYY-MM-DD)"""
+    fmt = request.args.get('format', 'csv').lower()
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Noma'lum format: {fmt}")
+    
+    filters = {'status': request.args.get('status') or None}
+    for arg, key in (('from', 'date_from'), ('to', 'date_to')):
+        value = request.args.get(arg)
+        if value:
+            datetime.strptime(value, '%Y-%m-%d')
+        filters[key] = value or None
+    return fmt, filters
+
+@app.route('/api/export/users')
+@login_required
+def export_users():
+    """Foydalanuvchilarni to'liq eksport qilish (CSV/JSONL oqim)"""
+    try:
+        if not is_db_ready():
+            return jsonify({'success': False, 'error': 'Database ulanmagan'}), 500
+        
+        fmt, filters = _export_args()
+        response = export_response('users', fmt, USER_EXPORT_COLUMNS, iter_users_export(**filters))
+        log_admin_action(session.get('admin_username'), 'export_users', dict(filters, format=fmt))
+        return response
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except ExportBusy as e:
+        return jsonify({'success': False, 'error': str(e)}), 429
+    except Exception as e:
+        logger.error(f"Export users error: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/export/startups')
+@login_required
+def export_startups():
+    """Startaplarni to'liq eksport qilish (CSV/JSONL oqim)"""
+    try:
+        if not is_db_ready():
+            return jsonify({'success': False, 'error': 'Database ulanmagan'}), 500
+        
+        fmt, filters = _export_args()
+        response = export_response('startups', fmt, STARTUP_EXPORT_COLUMNS, iter_startups_export(**filters))
+        log_admin_action(session.get('admin_username'), 'export_startups', dict(filters, format=fmt))
+        return response
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except ExportBusy as e:
+        return jsonify({'success': False, 'error': str(e)}), 429
+    except Exception as e:
+        logger.error(f"Export startups error: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/admin/profile', methods=['POST'])
+@login_required
+def profile_process():
+    """Jarayonni N soniya fon threadida sampling qilish; natija /api/admin/profile/<job_id> dan olinadi"""
+    try:
+        seconds = request.args.get('seconds', 10, type=float)
+        interval_ms = request.args.get('interval_ms', 5, type=float)
+        include_idle = request.args.get('idle', 'false').lower() == 'true'
+        
+        # So'rov threadi band qilinmaydi (sync gunicorn worker timeout i va o'zini profil qilish)
+        job = profiler.start_job(seconds, interval=interval_ms / 1000, include_idle=include_idle)
+        
+        log_admin_action(session.get('admin_username'), 'profile_process', {
+            'job_id': job['id'],
+            'seconds': job['seconds']
+        })
+        
+        return jsonify({
+            'success': True,
+            'data': {'job_id': job['id'], 'status': job['status'], 'seconds': job['seconds']}
+        }), 202, {'Location': f"/api/admin/profile/{job['id']}"}
+    except profiler.ProfilerBusy as e:
+        return jsonify({'success': False, 'error': str(e)}), 409
+    except Exception as e:
+        logger.error(f"Profile error: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/admin/profile/<job_id>')
+@login_required
+def profile_result(job_id):
+    """Profil natijasi: tugagan bo'lsa collapsed stack fayl (flamegraph.pl / speedscope), aks holda holati"""
+    job = profiler.get_job(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Profil topilmadi'}), 404
+    if job['status'] == 'running':
+        return jsonify({'success': True, 'data': {'job_id': job_id, 'status': 'running'}}), 202
+    if job['status'] == 'failed':
+        return jsonify({'success': False, 'error': job['error']}), 500
+    
+    result = job['result']
+    filename = f"profile-{job_id}.collapsed"
+    return app.response_class(
+        profiler.collapsed(result),
+        mimetype='text/plain',
+        headers={
+            'Content-Disposition': f'attachment; filename={filename}',
+            'X-Profile-Samples': str(result['samples'])
+        }
+    )
+
 @app.route('/api/dashboard/overview')
 @login_required
+@response_cache.cached
 def dashboard_overview():
     """Dashboard uchun umumiy ma'lumotlar"""
     try:
-        if not DB_AVAILABLE:
+        if not is_db_ready():
             return jsonify({'success': False, 'error': 'Database ulanmagan'}), 500
         
-        stats = get_statistics()
-        
-        # So'nggi startaplar
-        recent_startups = get_recent_startups(5)
-        
-        # So'nggi foydalanuvchilar
-        recent_users = get_recent_users(5)
+        # Uchta mustaqil so'rov parallel - javob vaqti eng sekin so'rovga yaqin
+        results = gather(
+            stats=get_statistics,
+            recent_startups=(get_recent_startups, 5),
+            recent_users=(get_recent_users, 5)
+        )
+        stats = results['stats']
+        recent_startups = results['recent_startups']
+        recent_users = results['recent_users']
         
         return jsonify({
             'success': True,
@@ -851,8 +982,9 @@ def internal_error(error):
 
 @app.route('/health')
 def health_check():
-    """Health check endpoint"""
-    db_status = 'connected' if DB_AVAILABLE and check_database_connection() else 'disconnected'
+    """Health check endpoint (health monitor keshidan, DB ga murojaatsiz)"""
+    readiness = health_monitor.readiness()
+    db_status = 'connected' if readiness['checks'].get('database', {}).get('ok') else 'disconnected'
     
     return jsonify({
         'status': 'healthy',
@@ -862,24 +994,39 @@ def health_check():
         'version': '1.0.0'
     })
 
+@app.route('/livez')
+def liveness_probe():
+    """Liveness: jarayon ishlayapti (tashqi bog'liqliklar tekshirilmaydi)"""
+    result = health_monitor.liveness()
+    return jsonify(result), 200 if result['status'] == 'alive' else 503
+
+@app.route('/readyz')
+def readiness_probe():
+    """Readiness: DB oxirgi tekshiruvda ishlagan va pool to'lib qolmagan"""
+    result = health_monitor.readiness()
+    return jsonify(result), 200 if result['status'] == 'ready' else 503
+
+# Bot holati monitorda (server bot threadisiz ishlashi ham mumkin, shuning uchun readiness ga ta'sir qilmaydi)
+health_monitor.register('bot', lambda: BOT_AVAILABLE)
+
 # ==================== MAIN ====================
 
 if __name__ == '__main__':
-    # Database ni ishga tushirish
-    if DB_AVAILABLE:
-        try:
-            init_db()
-            print("✅ PostgreSQL database ishga tushirildi")
-        except Exception as e:
-            print(f"⚠️ Database ishga tushirishda xato: {e}")
+    # Database sxemasi har ulanishda (qayta ulanishda ham) tekshiriladi
+    db_instance.on_connect(init_db)
+    if is_db_ready():
+        print("✅ PostgreSQL database ishga tushirildi")
     else:
-        print("❌ Database ulanmagan")
+        print("❌ Database ulanmagan, fonda qayta ulanish davom etadi")
+    
+    health_monitor.start()
     
     # Botni alohida threadda ishga tushirish
     if BOT_AVAILABLE:
         try:
             bot_thread = threading.Thread(target=start_bot, daemon=True)
             bot_thread.start()
+            health_monitor.register('bot', bot_thread.is_alive)
             print("✅ Bot thread ishga tushirildi")
         except Exception as e:
             print(f"⚠️ Bot thread ishga tushirishda xato: {e}")
@@ -894,7 +1041,7 @@ if __name__ == '__main__':
     print(f"🌐 Port: {port}")
     print(f"📊 Admin panel tayyor")
     print(f"🤖 Bot status: {'Online' if BOT_AVAILABLE else 'Offline'}")
-    print(f"🗄️ Database status: {'Online' if DB_AVAILABLE else 'Offline'}")
+    print(f"🗄️ Database status: {'Online' if is_db_ready() else 'Offline'}")
     
     # Debug mode'ni environment dan olish
     debug_mode = os.environ.get('DEBUG', 'False').lower() == 'true'
@@ -920,18 +920,30 @@ document.getElementById('broadcastForm')?.addEventListener('submit', async funct
     
     const message = document.getElementById('messageText').value;
     const recipientType = document.getElementById('messageType').value;
+    const image = document.getElementById('messageImage')?.files[0];
     
     try {
-        const response = await fetch('/api/broadcast', {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json'
-            },
-            body: JSON.stringify({
-                message,
-                recipient_type: recipientType
-            })
-        });
+        let request;
+        if (image) {
+            // Rasm bilan - multipart (Content-Type ni brauzer o'zi qo'yadi)
+            const formData = new FormData();
+            formData.append('message', message);
+            formData.append('recipient_type', recipientType);
+            formData.append('image', image);
+            request = { method: 'POST', body: formData };
+        } else {
+            request = {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json'
+                },
+                body: JSON.stringify({
+                    message,
+                    recipient_type: recipientType
+                })
+            };
+        }
+        const response = await fetch('/api/broadcast', request);
         
         const data = await response.json();
         
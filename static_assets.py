@@ -0,0 +1,55 @@
+# static_assets.py - Statik fayllar uchun kontent-xeshli (fingerprint) URL lar va uzoq keshlash
+import hashlib
+import os
+import threading
+
+from flask import request
+
+# Versiyalangan URL (?v=<xesh>) bir yil o'zgarmas deb keshlanadi
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+_hashes = {}
+_lock = threading.Lock()
+
+def static_hash(static_folder: str, filename: str):
+    """Fayl mazmunining qisqa xeshi; fayl o'zgarmaguncha (mtime/size) keshlanadi"""
+    path = os.path.join(static_folder, filename)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+
+    key = (stat.st_mtime_ns, stat.st_size)
+    with _lock:
+        cached = _hashes.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(65536), b''):
+            digest.update(block)
+    value = digest.hexdigest()[:12]
+    with _lock:
+        _hashes[path] = (key, value)
+    return value
+
+def init_app(app):
+    """url_for('static', ...) ga ?v=<xesh> qo'shish va versiyalangan so'rovlarga immutable header"""
+
+    @app.url_defaults
+    def add_static_version(endpoint, values):
+        if endpoint == 'static' and 'filename' in values and 'v' not in values:
+            version = static_hash(app.static_folder, values['filename'])
+            if version:
+                values['v'] = version
+
+    @app.after_request
+    def static_cache_headers(response):
+        if request.endpoint != 'static' or response.status_code not in (200, 304):
+            return response
+        version = request.args.get('v')
+        filename = (request.view_args or {}).get('filename')
+        if version and filename and version == static_hash(app.static_folder, filename):
+            response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+        return response
@@ -0,0 +1,491 @@
+# telegram_api.py - Telegram Bot API so'rovlari uchun umumiy transport (apihelper.CUSTOM_REQUEST_SENDER)
+#
+# Barcha chiqish so'rovlari token-bucket rate limiter dan o'tadi: umumiy (~30/s), chat bo'yicha (shaxsiy ~1/s,
+# guruh/kanal ~20/min) va ixtiyoriy metod bo'yicha. 429 javobidagi retry_after hisobga olinadi va so'rov qayta
+# yuboriladi. Har so'rovning ustuvorlik klassi bor (callback javobi > oddiy javob > xabarnoma > broadcast):
+# yuqori klass umumiy bucket ni kutib turgan bo'lsa bo'shagan token avval unga beriladi. Har klass navbati
+# cheklangan va muddati (deadline) o'tib ketgan past ustuvor so'rovlar yuborilmaydi (OutboundDropped).
+# Limiter jarayon ichida: bot (main.py) va admin panel (server.py) har biri o'z limitidan foydalanadi;
+# main_async.py da AsyncTeleBot (install_async) va sinxron handlerlar bitta limiterni bo'lishadi.
+# So'rovlar bitta umumiy requests.Session orqali yuboriladi: keep-alive ulanishlar barcha threadlar orasida
+# qayta ishlatiladi (har so'rovda yangi TCP/TLS handshake yo'q), pool hajmi bir vaqtda yuboradigan threadlar
+# soniga moslanadi, ulanish xatolarida urllib3 qayta urinadi.
+import asyncio
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+import requests
+import telebot.apihelper as apihelper
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import tracing
+from metrics import (
+    TELEGRAM_API_DROPPED, TELEGRAM_API_DURATION, TELEGRAM_API_RATE_LIMITED, TELEGRAM_API_REQUESTS,
+    TELEGRAM_API_THROTTLE_WAIT, track_http_session, track_limiter
+)
+
+logger = logging.getLogger(__name__)
+
+# Lokal Bot API (masalan tools.fake_telegram) uchun: http://127.0.0.1:8081/bot{0}/{1}
+API_URL = os.getenv('TELEGRAM_API_URL')
+
+# TELEGRAM_RATE_LIMIT=0 - limiter o'chirilgan (faqat 429 retry ishlaydi)
+RATE_LIMIT_ENABLED = os.getenv('TELEGRAM_RATE_LIMIT', '1').lower() not in ('0', 'false', 'no')
+# Tarmoqdagi kechikish farqi tufayli so'rovlar Telegram ga zichroq yetib borishi mumkin - limitdan biroz past
+RATE_SAFETY = float(os.getenv('TELEGRAM_RATE_SAFETY', 0.95))
+GLOBAL_RATE = float(os.getenv('TELEGRAM_GLOBAL_RATE', 30)) * RATE_SAFETY
+PRIVATE_CHAT_RATE = float(os.getenv('TELEGRAM_CHAT_RATE', 1)) * RATE_SAFETY
+GROUP_CHAT_RATE = float(os.getenv('TELEGRAM_GROUP_RATE_PER_MIN', 20)) / 60 * RATE_SAFETY
+# Bucket sig'imi: 1 - so'rovlar tekis taqsimlanadi (har qanday 1 soniyalik oynada limitdan oshmaydi);
+# kattaroq qiymat qisqa portlashga ruxsat beradi. Shaxsiy chat: bitta handler odatda 2-3 ta xabar yuboradi
+# (sarlavha + sahifa + menyu) - ular kutmaydi, o'rtacha tezlik baribir ~1/s. Guruh limiti daqiqalik - tekis
+GLOBAL_BURST = float(os.getenv('TELEGRAM_GLOBAL_BURST', 1))
+CHAT_BURST = float(os.getenv('TELEGRAM_CHAT_BURST', 3))
+GROUP_CHAT_BURST = float(os.getenv('TELEGRAM_GROUP_BURST', 1))
+# 429 dan keyin qayta urinishlar; retry_after bundan uzoq bo'lsa xato darhol qaytariladi
+MAX_RETRIES = int(os.getenv('TELEGRAM_MAX_RETRIES', 3))
+MAX_RETRY_AFTER = float(os.getenv('TELEGRAM_MAX_RETRY_AFTER', 60))
+
+# HTTP ulanishlar: pool hajmi - Telegram ga bir vaqtda so'rov yuboradigan threadlar soni (telebot handler
+# threadlari + getUpdates + admin panel / broadcast). Kichik bo'lsa ortiqcha ulanishlar har safar yopiladi.
+HTTP_POOL_SIZE = int(os.getenv('TELEGRAM_HTTP_POOL_SIZE', 16))
+CONNECT_TIMEOUT = float(os.getenv('TELEGRAM_CONNECT_TIMEOUT', 5))
+READ_TIMEOUT = float(os.getenv('TELEGRAM_READ_TIMEOUT', 30))
+# Faqat ulanish o'rnatilmagan holatlar qayta uriniladi (so'rov Telegram ga yetib bormagan - takror xabar yo'q)
+CONNECT_RETRIES = int(os.getenv('TELEGRAM_CONNECT_RETRIES', 3))
+
+def _parse_method_rates(value: str) -> Dict[str, float]:
+    """'getChatMember=20,sendPhoto=10' -> {'getChatMember': 20.0, 'sendPhoto': 10.0} (so'rov/soniya)"""
+    rates = {}
+    for part in filter(None, (item.strip() for item in value.split(','))):
+        method, _, rate = part.partition('=')
+        try:
+            rates[method.strip()] = float(rate)
+        except ValueError:
+            logger.warning(f"TELEGRAM_METHOD_RATES noto'g'ri qiymat: {part}")
+    return rates
+
+# Metod bo'yicha qo'shimcha limitlar
+METHOD_RATES = _parse_method_rates(os.getenv('TELEGRAM_METHOD_RATES', ''))
+
+# Telegram limitlari xabar yuboruvchi metodlarga tegishli; getUpdates, answerCallbackQuery va h.k. kutmaydi
+_MESSAGE_METHOD_PREFIXES = ('send', 'copyMessage', 'forwardMessage', 'editMessage')
+
+# Ustuvorlik klasslari (kichik son - yuqori ustuvorlik)
+CALLBACK, REPLY, NOTIFICATION, BROADCAST = range(4)
+PRIORITY_NAMES = ('callback', 'reply', 'notification', 'broadcast')
+
+def _parse_class_values(name: str, default: Dict[str, float]) -> list:
+    """'notification=600,broadcast=0' -> klass tartibidagi ro'yxat; 0 - cheklov yo'q"""
+    values = dict(default)
+    values.update(_parse_method_rates(os.getenv(name, '')))
+    return [values.get(priority_name) or None for priority_name in PRIORITY_NAMES]
+
+# Klass navbatidagi (limiter ni kutayotgan) so'rovlar chegarasi; oshsa yangi so'rov darhol tashlanadi
+QUEUE_LIMITS = _parse_class_values('TELEGRAM_QUEUE_LIMITS', {
+    'callback': 1000, 'reply': 1000, 'notification': 200, 'broadcast': 50})
+# Navbatda kutish muddati (soniya): callback javobi ~15s dan keyin baribir qabul qilinmaydi
+DEADLINES = _parse_class_values('TELEGRAM_DEADLINES', {
+    'callback': 10, 'reply': 0, 'notification': 600, 'broadcast': 0})
+
+class OutboundDropped(Exception):
+    """So'rov yuborilmadi: klass navbati to'la yoki muddati o'tdi"""
+
+_priority = contextvars.ContextVar('telegram_priority', default=(REPLY, None))
+
+@contextmanager
+def priority(level: int, deadline: Optional[float] = None):
+    """Ichidagi API chaqiruvlari ustuvorligi; deadline (soniya) berilmasa klass standarti (DEADLINES)"""
+    token = _priority.set((level, deadline))
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+def bulk():
+    """Ommaviy yuborish (broadcast) - eng past ustuvorlik"""
+    return priority(BROADCAST)
+
+def current_priority() -> int:
+    return _priority.get()[0]
+
+class TokenBucket:
+    __slots__ = ('rate', 'capacity', 'tokens', 'updated', 'blocked_until')
+
+    def __init__(self, rate: float, capacity: float, now: float):
+        self.rate = rate
+        self.capacity = max(capacity, 1.0)
+        self.tokens = self.capacity
+        self.updated = now
+        self.blocked_until = 0.0
+
+    def _refill(self, now: float):
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def wait_time(self, now: float, need: float = 1.0) -> float:
+        """need ta token bo'lguncha qolgan vaqt (0 - hozir olish mumkin)"""
+        if self.blocked_until > now:
+            return self.blocked_until - now
+        self._refill(now)
+        if self.tokens >= need:
+            return 0.0
+        return (need - self.tokens) / self.rate
+
+    def take(self, now: float):
+        self._refill(now)
+        self.tokens -= 1
+
+    def idle(self, now: float) -> bool:
+        self._refill(now)
+        return self.tokens >= self.capacity and self.blocked_until <= now
+
+class Reservation:
+    """Limiter navbatidagi bitta so'rov: klass, navbatga kirgan vaqt, umumiy bucketni kutayotganmi"""
+    __slots__ = ('level', 'start', 'waiting')
+
+    def __init__(self, level: int):
+        self.level = level
+        self.start = time.monotonic()
+        self.waiting = False
+
+class RateLimiter:
+    """Umumiy, chat va metod bucketlari; barcha bucketlarda token bo'lgandagina so'rov yuboriladi"""
+
+    # Shundan ko'p chat bucket bo'lsa to'lib turganlari (bo'sh turgan chatlar) tozalanadi
+    MAX_CHAT_BUCKETS = 10000
+
+    def __init__(self, global_rate: float = GLOBAL_RATE, private_rate: float = PRIVATE_CHAT_RATE,
+                 group_rate: float = GROUP_CHAT_RATE, global_burst: float = GLOBAL_BURST,
+                 chat_burst: float = CHAT_BURST, group_burst: float = GROUP_CHAT_BURST,
+                 method_rates: Optional[Dict[str, float]] = None, queue_limits: Optional[list] = None):
+        now = time.monotonic()
+        self.private_rate = private_rate
+        self.group_rate = group_rate
+        self.chat_burst = chat_burst
+        self.group_burst = group_burst
+        self._global = TokenBucket(global_rate, global_burst, now)
+        self._methods = {method: TokenBucket(rate, 1, now) for method, rate in (method_rates or {}).items()}
+        self._chats: Dict[object, TokenBucket] = {}
+        self._cond = threading.Condition()
+        self.queue_limits = queue_limits or QUEUE_LIMITS
+        # Klass bo'yicha: limiter dagi barcha so'rovlar va faqat umumiy bucket to'sib turganlari
+        self._queued = [0] * len(PRIORITY_NAMES)
+        self._waiting = [0] * len(PRIORITY_NAMES)
+
+    @staticmethod
+    def is_group(chat_id) -> bool:
+        # @username (kanal) yoki manfiy ID - guruh/kanal
+        if isinstance(chat_id, str):
+            if chat_id.startswith('@'):
+                return True
+            try:
+                chat_id = int(chat_id)
+            except ValueError:
+                return False
+        return chat_id < 0
+
+    def _chat_bucket(self, chat_id, now: float) -> TokenBucket:
+        key = str(chat_id)
+        bucket = self._chats.get(key)
+        if bucket is None:
+            if len(self._chats) >= self.MAX_CHAT_BUCKETS:
+                for stale in [k for k, b in self._chats.items() if b.idle(now)]:
+                    del self._chats[stale]
+            if self.is_group(chat_id):
+                bucket = TokenBucket(self.group_rate, self.group_burst, now)
+            else:
+                bucket = TokenBucket(self.private_rate, self.chat_burst, now)
+            self._chats[key] = bucket
+        return bucket
+
+    def _buckets(self, method: str, chat_id, now: float) -> list:
+        buckets = []
+        if method.startswith(_MESSAGE_METHOD_PREFIXES):
+            buckets.append(self._global)
+            if chat_id is not None:
+                buckets.append(self._chat_bucket(chat_id, now))
+        method_bucket = self._methods.get(method)
+        if method_bucket is not None:
+            buckets.append(method_bucket)
+        return buckets
+
+    def reserve(self, level: int = REPLY) -> 'Reservation':
+        """Klass navbatiga kirish (to'la bo'lsa OutboundDropped); oxirida release() chaqirilishi shart"""
+        with self._cond:
+            limit = self.queue_limits[level]
+            if limit is not None and self._queued[level] >= limit:
+                raise OutboundDropped(f"{PRIORITY_NAMES[level]} navbati to'la ({limit})")
+            self._queued[level] += 1
+        return Reservation(level)
+
+    def release(self, reservation: 'Reservation'):
+        with self._cond:
+            self._queued[reservation.level] -= 1
+            if reservation.waiting:
+                reservation.waiting = False
+                self._waiting[reservation.level] -= 1
+                self._cond.notify_all()
+
+    def try_acquire(self, reservation: 'Reservation', method: str, chat_id=None,
+                    deadline: Optional[float] = None) -> float:
+        """Bloklamaydigan urinish: 0 - token olindi, aks holda qayta urinishgacha kutish (soniya).
+
+        Muddatigacha yuborib bo'lmasa OutboundDropped. deadline - time.monotonic() bo'yicha.
+        """
+        with self._cond:
+            level = reservation.level
+            now = time.monotonic()
+            buckets = self._buckets(method, chat_id, now)
+            wait = max((bucket.wait_time(now) for bucket in buckets), default=0.0)
+            uses_global = self._global in buckets
+            global_wait = self._global.wait_time(now) if uses_global else 0.0
+            if deadline is not None and now + wait > deadline:
+                # Muddatigacha yuborib bo'lmaydi - kutib o'tirmasdan tashlanadi
+                raise OutboundDropped(
+                    f"{PRIORITY_NAMES[level]} muddati o'tdi ({now - reservation.start:.1f}s navbatda)")
+            if uses_global and any(self._waiting[:level]):
+                # Yuqori klass navbatda - bo'shagan token unga qoladi
+                wait = max(wait, global_wait, 1 / self._global.rate)
+            if wait <= 0:
+                for bucket in buckets:
+                    bucket.take(now)
+                return 0.0
+            # Faqat umumiy bucket to'sib turgan bo'lsa (chat bucket ham kutsa - past klasslarni ushlab turmaydi)
+            blocked_by_global = uses_global and global_wait > 0 and all(
+                bucket.wait_time(now) <= 0 for bucket in buckets if bucket is not self._global)
+            if blocked_by_global != reservation.waiting:
+                reservation.waiting = blocked_by_global
+                self._waiting[level] += 1 if blocked_by_global else -1
+            if deadline is not None:
+                wait = min(wait, max(deadline - now, 0.001))
+            return wait
+
+    def acquire(self, method: str, chat_id=None, level: int = REPLY, deadline: Optional[float] = None) -> float:
+        """Token olinguncha kutish (thread bloklanadi); kutilgan vaqt (soniya)"""
+        reservation = self.reserve(level)
+        try:
+            with self._cond:
+                while True:
+                    wait = self.try_acquire(reservation, method, chat_id, deadline)
+                    if wait <= 0:
+                        return time.monotonic() - reservation.start
+                    self._cond.wait(wait)
+        finally:
+            self.release(reservation)
+
+    async def acquire_async(self, method: str, chat_id=None, level: int = REPLY,
+                            deadline: Optional[float] = None) -> float:
+        """acquire ning asyncio varianti: kutish event loop da (asyncio.sleep), thread band qilinmaydi.
+
+        Ustuvorlik va navbat hisoblagichlari sinxron so'rovlar bilan umumiy.
+        """
+        reservation = self.reserve(level)
+        try:
+            while True:
+                wait = self.try_acquire(reservation, method, chat_id, deadline)
+                if wait <= 0:
+                    return time.monotonic() - reservation.start
+                await asyncio.sleep(wait)
+        finally:
+            self.release(reservation)
+
+    def queue_sizes(self) -> Dict[str, int]:
+        with self._cond:
+            return dict(zip(PRIORITY_NAMES, self._queued))
+
+    def limits(self, method: str) -> bool:
+        """Metod biror bucket orqali cheklanadimi"""
+        return method.startswith(_MESSAGE_METHOD_PREFIXES) or method in self._methods
+
+    def penalize(self, method: str, chat_id, retry_after: float):
+        """429: tegishli bucket (chat, umumiy yoki metod) retry_after davomida yopiladi"""
+        with self._cond:
+            now = time.monotonic()
+            if method.startswith(_MESSAGE_METHOD_PREFIXES):
+                bucket = self._chat_bucket(chat_id, now) if chat_id is not None else self._global
+            else:
+                bucket = self._methods.get(method)
+                if bucket is None:
+                    return
+            bucket.blocked_until = max(bucket.blocked_until, now + retry_after)
+            bucket.tokens = min(bucket.tokens, 0.0)
+            self._cond.notify_all()
+
+limiter = RateLimiter(method_rates=METHOD_RATES)
+track_limiter(limiter)
+
+# =========== HTTP SESSION ===========
+
+def build_session(pool_size: int = HTTP_POOL_SIZE) -> requests.Session:
+    """Keep-alive pool li Session; 429 va 5xx bu yerda emas, send_request da ko'riladi"""
+    retry = Retry(
+        total=CONNECT_RETRIES, connect=CONNECT_RETRIES, read=0, status=0, other=0,
+        backoff_factor=0.2, raise_on_status=False, respect_retry_after_header=False
+    )
+    adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+session = build_session()
+track_http_session(session)
+
+def _timeout(timeout):
+    """telebot (connect, read) juftligi: request_timeout berilsa connect ham shunga teng bo'lib qoladi"""
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return min(connect, CONNECT_TIMEOUT), read
+    return CONNECT_TIMEOUT, timeout or READ_TIMEOUT
+
+def _method_name(url: str) -> str:
+    # .../bot<token>/<method> - token metrikalarga tushmasligi uchun faqat oxirgi qism olinadi
+    return url.rsplit('/', 1)[-1]
+
+def _retry_after(response) -> Optional[float]:
+    try:
+        return float(response.json()['parameters']['retry_after'])
+    except (ValueError, KeyError, TypeError, json.JSONDecodeError):
+        return None
+
+def _request_class(api_method: str):
+    """Joriy kontekstdagi ustuvorlik klassi va muddat (time.monotonic() bo'yicha yoki None)"""
+    level, deadline = _priority.get()
+    if api_method == 'answerCallbackQuery':
+        level = CALLBACK
+    if deadline is None:
+        deadline = DEADLINES[level]
+    return level, (time.monotonic() + deadline if deadline else None)
+
+def _acquire(api_method: str, chat_id, level: int, deadline_at: Optional[float]):
+    try:
+        waited = limiter.acquire(api_method, chat_id, level, deadline_at)
+    except OutboundDropped:
+        TELEGRAM_API_DROPPED.labels(api_method, PRIORITY_NAMES[level]).inc()
+        raise
+    TELEGRAM_API_THROTTLE_WAIT.labels(PRIORITY_NAMES[level]).observe(waited)
+
+async def _acquire_async(api_method: str, chat_id, level: int, deadline_at: Optional[float]):
+    try:
+        waited = await limiter.acquire_async(api_method, chat_id, level, deadline_at)
+    except OutboundDropped:
+        TELEGRAM_API_DROPPED.labels(api_method, PRIORITY_NAMES[level]).inc()
+        raise
+    TELEGRAM_API_THROTTLE_WAIT.labels(PRIORITY_NAMES[level]).observe(waited)
+
+def _should_retry(api_method: str, chat_id, retry_after: float, files, attempt: int) -> bool:
+    """429 dan keyin: bucket yopiladi; qayta urinish mumkinmi"""
+    TELEGRAM_API_RATE_LIMITED.labels(api_method).inc()
+    limiter.penalize(api_method, chat_id, retry_after)
+    # Fayl oqimi bir marta o'qiladi - fayl bilan so'rov qayta yuborilmaydi
+    if files or attempt >= MAX_RETRIES or retry_after > MAX_RETRY_AFTER:
+        logger.warning(f"Telegram 429: {api_method}, retry_after={retry_after}s (qayta urinilmaydi)")
+        return False
+    logger.warning(f"Telegram 429: {api_method}, {retry_after}s dan keyin qayta urinish ({attempt + 1}/{MAX_RETRIES})")
+    return True
+
+def _retry_sleep(api_method: str, retry_after: float) -> float:
+    # Limiter yoqilgan bo'lsa keyingi acquire yopilgan bucketni o'zi kutadi
+    return 0.0 if RATE_LIMIT_ENABLED and limiter.limits(api_method) else retry_after
+
+def send_request(method, url, params=None, files=None, timeout=None, proxies=None):
+    """telebot ning har bir API so'rovi shu yerdan o'tadi"""
+    api_method = _method_name(url)
+    chat_id = params.get('chat_id') if params else None
+    level, deadline_at = _request_class(api_method)
+    timeout = _timeout(timeout)
+    attempt = 0
+    while True:
+        if RATE_LIMIT_ENABLED:
+            _acquire(api_method, chat_id, level, deadline_at)
+
+        start = time.perf_counter()
+        status = 'error'
+        try:
+            with tracing.span(api_method, 'telegram'):
+                response = session.request(
+                    method, url, params=params, files=files, timeout=timeout, proxies=proxies)
+            status = response.status_code
+        finally:
+            TELEGRAM_API_DURATION.labels(api_method).observe(time.perf_counter() - start)
+            TELEGRAM_API_REQUESTS.labels(api_method, status).inc()
+
+        if status != 429:
+            return response
+
+        retry_after = _retry_after(response) or 1.0
+        if not _should_retry(api_method, chat_id, retry_after, files, attempt):
+            return response
+        attempt += 1
+        time.sleep(_retry_sleep(api_method, retry_after))
+
+async def send_request_async(token, url, method='get', params=None, files=None, **kwargs):
+    """AsyncTeleBot so'rovlari (asyncio_helper._process_request o'rniga): shu limiter va 429 qayta urinish.
+
+    Token event loop ichida kutiladi (limiter.acquire_async) - executor threadlari band qilinmaydi.
+    """
+    from telebot.asyncio_helper import ApiTelegramException
+
+    api_method = url
+    chat_id = params.get('chat_id') if params else None
+    level, deadline_at = _request_class(api_method)
+    attempt = 0
+    while True:
+        if RATE_LIMIT_ENABLED:
+            await _acquire_async(api_method, chat_id, level, deadline_at)
+
+        start = time.perf_counter()
+        status = 'error'
+        try:
+            with tracing.span(api_method, 'telegram'):
+                # _process_request params dan 'timeout' ni olib tashlaydi - har urinishga nusxa
+                result = await _async_process_request(token, url, method, dict(params) if params else params,
+                                                      files, **kwargs)
+            status = 200
+            return result
+        except ApiTelegramException as e:
+            status = e.error_code
+            if e.error_code != 429:
+                raise
+            parameters = (e.result_json or {}).get('parameters') or {}
+            retry_after = float(parameters.get('retry_after') or 1.0)
+            if not _should_retry(api_method, chat_id, retry_after, files, attempt):
+                raise
+        finally:
+            TELEGRAM_API_DURATION.labels(api_method).observe(time.perf_counter() - start)
+            TELEGRAM_API_REQUESTS.labels(api_method, status).inc()
+        attempt += 1
+        await asyncio.sleep(_retry_sleep(api_method, retry_after))
+
+def install():
+    """Transportni telebot ga o'rnatish (bir necha marta chaqirish xavfsiz)"""
+    apihelper.CUSTOM_REQUEST_SENDER = send_request
+    # download_file va boshqa to'g'ridan-to'g'ri so'rovlar ham shu pooldan; TTL bo'yicha qayta yaratilmaydi
+    apihelper.session = session
+    apihelper.SESSION_TIME_TO_LIVE = None
+    apihelper.CONNECT_TIMEOUT = CONNECT_TIMEOUT
+    apihelper.READ_TIMEOUT = READ_TIMEOUT
+    if API_URL:
+        apihelper.API_URL = API_URL
+
+_async_process_request = None
+
+def install_async():
+    """AsyncTeleBot (asyncio_helper) uchun: barcha so'rovlar send_request_async orqali (aiohttp kerak)"""
+    global _async_process_request
+    from telebot import asyncio_helper
+
+    if _async_process_request is None:
+        _async_process_request = asyncio_helper._process_request
+    asyncio_helper._process_request = send_request_async
+    if API_URL:
+        asyncio_helper.API_URL = API_URL
@@ -0,0 +1,122 @@
+# tests/test_bulk_import.py - tools.bulk_import: startap id larini qayta xaritalash (vaqtinchalik PostgreSQL)
+#
+#   python -m pytest -q tests      # initdb topilmasa (PG_BIN) testlar o'tkazib yuboriladi
+import csv
+import os
+import tempfile
+import unittest
+
+from tools.bench_db import TempPostgres
+from tools.generate_data import MEMBER_FIELDS, STARTUP_FIELDS, USER_FIELDS
+
+try:
+    import psycopg2
+except ImportError:
+    psycopg2 = None
+
+TABLE_FIELDS = {'users': USER_FIELDS, 'startups': STARTUP_FIELDS, 'startup_members': MEMBER_FIELDS}
+
+def write_dump(directory: str, **tables):
+    for table, rows in tables.items():
+        with open(os.path.join(directory, f"{table}.csv"), 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=TABLE_FIELDS[table])
+            writer.writeheader()
+            writer.writerows(rows)
+
+def user(user_id: int, **fields):
+    return dict({'user_id': user_id, 'first_name': f"User {user_id}"}, **fields)
+
+def startup(source_id: int, owner_id: int, name: str, **fields):
+    return dict({'id': source_id, 'owner_id': owner_id, 'name': name, 'status': 'active'}, **fields)
+
+def member(startup_id: int, user_id: int):
+    return {'startup_id': startup_id, 'user_id': user_id, 'status': 'accepted'}
+
+class BulkImportTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        if psycopg2 is None:
+            raise unittest.SkipTest("psycopg2 o'rnatilmagan")
+        try:
+            cls.cluster = TempPostgres()
+            dsn = cls.cluster.__enter__()
+        except (RuntimeError, OSError) as e:
+            raise unittest.SkipTest(f"Vaqtinchalik PostgreSQL yo'q: {e}")
+        from migrate import migrate
+
+        cls.conn = psycopg2.connect(dsn)
+        migrate(cls.conn)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.conn.close()
+        cls.cluster.__exit__(None, None, None)
+
+    def setUp(self):
+        with self.conn.cursor() as cur:
+            cur.execute("TRUNCATE startup_members, startups, users RESTART IDENTITY CASCADE")
+        self.conn.commit()
+
+    def run_import(self, update_existing: bool = True, **tables):
+        from tools.bulk_import import import_directory
+
+        with tempfile.TemporaryDirectory() as directory:
+            write_dump(directory, **tables)
+            return import_directory(self.conn, directory, update_existing, report=lambda message: None)
+
+    def query(self, sql: str, *params):
+        with self.conn.cursor() as cur:
+            cur.execute(sql, params)
+            return cur.fetchall()
+
+    def test_duplicate_keys_in_one_dump_become_one_startup(self):
+        self.run_import(
+            users=[user(1), user(2), user(3)],
+            startups=[startup(10, 1, 'Alpha', description='birinchi'), startup(11, 1, 'Alpha'),
+                      startup(12, 1, 'Beta')],
+            startup_members=[member(10, 2), member(11, 3), member(12, 2)])
+
+        startups = self.query("SELECT id, name, description FROM startups ORDER BY name")
+        self.assertEqual([(name, description) for _, name, description in startups],
+                         [('Alpha', 'birinchi'), ('Beta', None)])
+        alpha_id = startups[0][0]
+        # Ikkala fayl id sidagi a'zolar bitta startapda
+        self.assertEqual(self.query("SELECT user_id FROM startup_members WHERE startup_id = %s ORDER BY user_id",
+                                    alpha_id), [(2,), (3,)])
+
+    def test_existing_startup_is_matched_and_not_overwritten_by_source_id(self):
+        self.run_import(users=[user(1), user(2), user(3)],
+                        startups=[startup(1, 1, 'Alpha'), startup(2, 2, 'Gamma', description='eski')])
+        alpha_id, gamma_id = (row[0] for row in self.query("SELECT id FROM startups ORDER BY name"))
+
+        # Boshqa bazadan: Alpha id=2 bilan (bazada Gamma ning id si), yangi startap id=1 bilan
+        self.run_import(
+            startups=[startup(2, 1, 'Alpha', description='yangi'), startup(1, 3, 'Delta')],
+            startup_members=[member(2, 3), member(1, 2)])
+
+        rows = {name: (startup_id, owner_id, description) for startup_id, owner_id, name, description
+                in self.query("SELECT id, owner_id, name, description FROM startups")}
+        self.assertEqual(rows['Alpha'], (alpha_id, 1, 'yangi'))
+        self.assertEqual(rows['Gamma'], (gamma_id, 2, 'eski'))
+        self.assertNotIn(rows['Delta'][0], (alpha_id, gamma_id))
+        members = set(self.query("SELECT startup_id, user_id FROM startup_members"))
+        self.assertEqual(members, {(alpha_id, 3), (rows['Delta'][0], 2)})
+
+    def test_skip_existing_keeps_existing_rows(self):
+        self.run_import(users=[user(1)], startups=[startup(5, 1, 'Alpha', description='eski')])
+        self.run_import(update_existing=False, startups=[startup(9, 1, 'Alpha', description='yangi')])
+        self.assertEqual(self.query("SELECT description FROM startups"), [('eski',)])
+
+    def test_members_without_startups_csv_use_database_ids(self):
+        self.run_import(users=[user(1), user(2)], startups=[startup(40, 1, 'Alpha')])
+        (alpha_id,), = self.query("SELECT id FROM startups")
+        self.run_import(startup_members=[member(alpha_id, 2), member(alpha_id + 100, 1)])
+        self.assertEqual(self.query("SELECT startup_id, user_id FROM startup_members"), [(alpha_id, 2)])
+
+    def test_empty_username_keeps_existing(self):
+        self.run_import(users=[user(1, username='ozod')])
+        self.run_import(users=[user(1, username='', first_name='Yangi')])
+        self.assertEqual(self.query("SELECT username, first_name FROM users"), [('ozod', 'Yangi')])
+
+if __name__ == '__main__':
+    unittest.main()
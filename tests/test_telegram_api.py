@@ -0,0 +1,206 @@
+# tests/test_telegram_api.py - RateLimiter: portlash, ustuvorlik, 429 (penalize), muddat va navbat chegarasi
+#
+#   python -m pytest -q tests
+import asyncio
+import threading
+import time
+import unittest
+
+import telegram_api
+from telegram_api import BROADCAST, CALLBACK, NOTIFICATION, REPLY, OutboundDropped, RateLimiter
+
+def make_limiter(**kwargs) -> RateLimiter:
+    # Testlar tez bo'lishi uchun haqiqiy limitlardan ancha yuqori tezliklar
+    options = dict(global_rate=1000, private_rate=10, group_rate=10, global_burst=10,
+                   chat_burst=3, group_burst=1, queue_limits=[None] * 4)
+    options.update(kwargs)
+    return RateLimiter(**options)
+
+def acquire_in_thread(limiter, done: list, name: str, *args, **kwargs) -> threading.Thread:
+    def target():
+        try:
+            limiter.acquire(*args, **kwargs)
+            done.append(name)
+        except OutboundDropped:
+            done.append(f"{name}:dropped")
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    return thread
+
+def wait_for(predicate, timeout: float = 1.0):
+    stop_at = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > stop_at:
+            raise AssertionError("Shart bajarilmadi")
+        time.sleep(0.005)
+
+class BurstTest(unittest.TestCase):
+    def test_private_chat_burst_then_rate(self):
+        limiter = make_limiter()
+        waits = [limiter.acquire('sendMessage', 1) for _ in range(3)]
+        self.assertTrue(all(wait < 0.01 for wait in waits), waits)
+        # To'rtinchisi - bucket bo'sh, 1/private_rate kutadi
+        self.assertGreaterEqual(limiter.acquire('sendMessage', 1), 0.08)
+
+    def test_group_chat_has_no_burst(self):
+        limiter = make_limiter()
+        self.assertLess(limiter.acquire('sendMessage', -100123), 0.01)
+        self.assertGreaterEqual(limiter.acquire('sendMessage', -100123), 0.08)
+        limiter.acquire('sendMessage', '@channel')
+        self.assertGreaterEqual(limiter.acquire('sendMessage', '@channel'), 0.08)
+
+    def test_chats_are_independent(self):
+        limiter = make_limiter(chat_burst=1)
+        limiter.acquire('sendMessage', 1)
+        self.assertLess(limiter.acquire('sendMessage', 2), 0.01)
+
+    def test_global_bucket_limits_all_chats(self):
+        limiter = make_limiter(global_rate=10, global_burst=1)
+        limiter.acquire('sendMessage', 1)
+        self.assertGreaterEqual(limiter.acquire('sendMessage', 2), 0.08)
+
+    def test_non_message_methods_are_not_limited(self):
+        limiter = make_limiter(global_rate=1, global_burst=1)
+        limiter.acquire('sendMessage', 1)
+        self.assertFalse(limiter.limits('getUpdates'))
+        self.assertLess(limiter.acquire('getUpdates'), 0.01)
+
+class PriorityTest(unittest.TestCase):
+    def test_higher_class_gets_global_token_first(self):
+        limiter = make_limiter(global_rate=5, global_burst=1)
+        limiter.acquire('sendMessage', 1)
+        done = []
+        broadcast = acquire_in_thread(limiter, done, 'broadcast', 'sendMessage', 2, BROADCAST)
+        wait_for(lambda: limiter.queue_sizes()['broadcast'] == 1)
+        callback = acquire_in_thread(limiter, done, 'callback', 'sendMessage', 3, CALLBACK)
+        broadcast.join(2)
+        callback.join(2)
+        self.assertEqual(done, ['callback', 'broadcast'])
+
+    def test_chat_limited_request_does_not_hold_lower_classes(self):
+        limiter = make_limiter(global_rate=1000, private_rate=2, chat_burst=1)
+        limiter.acquire('sendMessage', 1)
+        done = []
+        # Callback faqat o'z chati bucketini kutadi - broadcast umumiy bucketdan darhol oladi
+        callback = acquire_in_thread(limiter, done, 'callback', 'sendMessage', 1, CALLBACK)
+        wait_for(lambda: limiter.queue_sizes()['callback'] == 1)
+        start = time.monotonic()
+        limiter.acquire('sendMessage', 2, BROADCAST)
+        self.assertLess(time.monotonic() - start, 0.1)
+        callback.join(2)
+        self.assertEqual(done, ['callback'])
+
+class PenalizeTest(unittest.TestCase):
+    def test_penalize_blocks_chat_bucket(self):
+        limiter = make_limiter()
+        limiter.penalize('sendMessage', 1, 0.2)
+        self.assertGreaterEqual(limiter.acquire('sendMessage', 1), 0.18)
+        self.assertLess(limiter.acquire('sendMessage', 2), 0.01)
+
+    def test_penalize_without_chat_blocks_global_bucket(self):
+        limiter = make_limiter()
+        limiter.penalize('sendMessage', None, 0.2)
+        self.assertGreaterEqual(limiter.acquire('sendMessage', 5), 0.18)
+
+    def test_penalize_method_bucket(self):
+        limiter = make_limiter(method_rates={'getChatMember': 100})
+        limiter.penalize('getChatMember', 1, 0.2)
+        self.assertGreaterEqual(limiter.acquire('getChatMember', 1), 0.18)
+        # Cheklanmagan metod uchun 429 hech narsani yopmaydi
+        limiter.penalize('getUpdates', None, 5)
+        self.assertLess(limiter.acquire('getUpdates'), 0.01)
+
+class DropTest(unittest.TestCase):
+    def test_deadline_drop_does_not_wait(self):
+        limiter = make_limiter(private_rate=1, chat_burst=1)
+        limiter.acquire('sendMessage', 1)
+        start = time.monotonic()
+        with self.assertRaises(OutboundDropped):
+            limiter.acquire('sendMessage', 1, BROADCAST, deadline=start + 0.05)
+        self.assertLess(time.monotonic() - start, 0.05)
+        self.assertEqual(limiter.queue_sizes()['broadcast'], 0)
+
+    def test_deadline_met_sends(self):
+        limiter = make_limiter(chat_burst=1)
+        limiter.acquire('sendMessage', 1)
+        self.assertGreaterEqual(limiter.acquire('sendMessage', 1, deadline=time.monotonic() + 1), 0.08)
+
+    def test_queue_limit(self):
+        limiter = make_limiter(global_rate=5, global_burst=1, queue_limits=[None, None, None, 1])
+        limiter.acquire('sendMessage', 1)
+        done = []
+        queued = acquire_in_thread(limiter, done, 'first', 'sendMessage', 2, BROADCAST)
+        wait_for(lambda: limiter.queue_sizes()['broadcast'] == 1)
+        with self.assertRaises(OutboundDropped):
+            limiter.acquire('sendMessage', 3, BROADCAST)
+        # Boshqa klass navbati alohida
+        limiter.acquire('sendMessage', 4, CALLBACK)
+        queued.join(2)
+        self.assertEqual(done, ['first'])
+
+class AsyncTest(unittest.TestCase):
+    def test_concurrent_coroutines_keep_priority(self):
+        limiter = make_limiter(global_rate=100, global_burst=1)
+        done = []
+
+        async def send(name, chat_id, level):
+            await limiter.acquire_async('sendMessage', chat_id, level)
+            done.append(name)
+
+        async def main():
+            # Avval 60 ta broadcast navbatga tushadi, keyin callback va oddiy javoblar keladi
+            tasks = [asyncio.create_task(send('broadcast', 1000 + i, BROADCAST)) for i in range(60)]
+            await asyncio.sleep(0.05)
+            tasks += [asyncio.create_task(send(name, 2000 + i, level))
+                      for i, (name, level) in enumerate([('callback', CALLBACK), ('reply', REPLY)] * 10)]
+            await asyncio.gather(*tasks)
+
+        start = time.monotonic()
+        asyncio.run(main())
+        self.assertEqual(len(done), 80)
+        # Executor hajmi bilan cheklanmaydi: 80 ta token ~0.8s (umumiy 100/s)
+        self.assertLess(time.monotonic() - start, 1.5)
+        last_priority = max(i for i, name in enumerate(done) if name != 'broadcast')
+        # Yuqori klasslar keyin kelgan bo'lsa ham navbatdagi broadcastlardan oldin o'tadi
+        self.assertLess(last_priority, 35, done)
+        self.assertEqual(limiter.queue_sizes(), dict.fromkeys(telegram_api.PRIORITY_NAMES, 0))
+
+    def test_waiting_sends_do_not_hold_other_sends(self):
+        finished = {}
+
+        async def process_request(token, url, method='get', params=None, files=None, **kwargs):
+            await asyncio.sleep(0.05)
+            finished.setdefault(telegram_api.current_priority(), []).append(time.monotonic())
+            return {'ok': True}
+
+        async def notify(chat_id):
+            with telegram_api.priority(NOTIFICATION):
+                await telegram_api.send_request_async('1:x', 'sendMessage', params={'chat_id': chat_id})
+
+        async def main():
+            # Bitta chatga 8 ta javob: har biri chat bucketini ~0.5s dan kutadi (jami ~3.5s)
+            replies = [asyncio.create_task(telegram_api.send_request_async('1:x', 'sendMessage',
+                                                                           params={'chat_id': 1}))
+                       for _ in range(8)]
+            await asyncio.sleep(0.05)
+            await asyncio.gather(*(notify(100 + i) for i in range(40)))
+            notified_at = time.monotonic()
+            await asyncio.gather(*replies)
+            return notified_at
+
+        saved = telegram_api.limiter, telegram_api._async_process_request
+        telegram_api.limiter = make_limiter(global_rate=200, global_burst=5, private_rate=2, chat_burst=1)
+        telegram_api._async_process_request = process_request
+        try:
+            start = time.monotonic()
+            notified_at = asyncio.run(main())
+        finally:
+            telegram_api.limiter, telegram_api._async_process_request = saved
+        self.assertEqual(len(finished[NOTIFICATION]), 40)
+        self.assertEqual(len(finished[REPLY]), 8)
+        # Kutayotgan javoblar executor threadlarini band qilsa boshqa chatlar ham ular ortida qolardi
+        self.assertLess(notified_at - start, 1.0)
+        self.assertGreater(max(finished[REPLY]) - start, 3.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1 @@
+# tools - benchmark, yuklama testi va ma'lumot yuklash skriptlari (python -m tools.<nomi>)
@@ -0,0 +1,312 @@
+# tools/bench_db.py - db.py funksiyalari benchmarki (vaqtinchalik lokal PostgreSQL da)
+#
+#   python -m tools.bench_db --scale 100k                      # initdb + seed + o'lchash
+#   python -m tools.bench_db --scale 1k --out bench/base.json  # natijani saqlash
+#   python -m tools.bench_db --scale 1k --compare bench/base.json --threshold 0.2
+#   python -m tools.bench_db --dsn postgresql://...            # mavjud bazada, faqat o'qish
+#   python -m tools.bench_db --dsn postgresql://... --populate --allow-writes   # to'ldirib, yozuvlar bilan
+#
+# --dsn bilan baza o'zgartirilmaydi: seed (--populate) va yozuvchi funksiyalar (--allow-writes) faqat so'ralsa.
+#
+# PostgreSQL binarlari PATH dan, PG_BIN dan yoki /usr/lib/postgresql/*/bin dan olinadi.
+import argparse
+import glob
+import json
+import os
+import platform
+import random
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+SCALES = {'1k': 1000, '10k': 10000, '100k': 100000, '1m': 1000000}
+
+def _find_pg_bin() -> str:
+    candidates = [os.getenv('PG_BIN')] if os.getenv('PG_BIN') else []
+    which = shutil.which('initdb')
+    if which:
+        candidates.append(os.path.dirname(which))
+    candidates.extend(sorted(glob.glob('/usr/lib/postgresql/*/bin'), reverse=True))
+    candidates.extend(sorted(glob.glob('/usr/local/opt/postgresql*/bin'), reverse=True))
+    for path in candidates:
+        if path and os.path.exists(os.path.join(path, 'initdb')):
+            return path
+    raise RuntimeError("initdb topilmadi: PostgreSQL o'rnating yoki PG_BIN ni ko'rsating")
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+class TempPostgres:
+    """initdb bilan vaqtinchalik klaster; chiqishda to'xtatiladi va o'chiriladi"""
+
+    def __init__(self, keep: bool = False):
+        self.bin = _find_pg_bin()
+        self.keep = keep
+        self.directory = None
+        self.port = None
+
+    def _run(self, name: str, *args):
+        subprocess.run([os.path.join(self.bin, name), *args], check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+
+    def __enter__(self) -> str:
+        self.directory = tempfile.mkdtemp(prefix='garajhub-bench-')
+        data = os.path.join(self.directory, 'data')
+        self.port = _free_port()
+        self._run('initdb', '-D', data, '-U', 'postgres', '-A', 'trust', '-E', 'UTF8', '--no-sync')
+        # Benchmark uchun: diskka majburiy yozishsiz (faqat vaqtinchalik klaster)
+        options = (f"-p {self.port} -k {self.directory} -c listen_addresses='' -c fsync=off "
+                   f"-c synchronous_commit=off -c full_page_writes=off -c shared_buffers=256MB")
+        self._run('pg_ctl', '-D', data, '-o', options, '-l', os.path.join(self.directory, 'postgres.log'), '-w', 'start')
+        return f"postgresql://postgres@/postgres?host={self.directory}&port={self.port}"
+
+    def __exit__(self, *exc):
+        try:
+            self._run('pg_ctl', '-D', os.path.join(self.directory, 'data'), '-m', 'fast', '-w', 'stop')
+        finally:
+            if not self.keep:
+                shutil.rmtree(self.directory, ignore_errors=True)
+        return False
+
+def seed(dsn: str, users: int, seed_value: int = 42):
+    """Sxema + tools.generate_data to'plami (COPY orqali)"""
+    import psycopg2
+    from migrate import migrate
+    from tools.bulk_import import import_directory
+    from tools.generate_data import generate
+
+    conn = psycopg2.connect(dsn)
+    try:
+        migrate(conn)
+        with tempfile.TemporaryDirectory() as directory:
+            start = time.perf_counter()
+            counts = generate(directory, users, seed=seed_value)
+            print(f"🧪 Generatsiya: {counts} ({time.perf_counter() - start:.1f}s)")
+            import_directory(conn, directory, report=lambda line: None if line.startswith('   ') else print(line))
+    finally:
+        conn.close()
+
+def _samples(db, rng: random.Random) -> Dict[str, List]:
+    """Benchmark argumentlari: haqiqiy id lar (eng og'ir holatlar ham kiradi)"""
+    with db.db_instance.get_cursor() as cur:
+        cur.execute("SELECT user_id, username FROM users WHERE username IS NOT NULL ORDER BY random() LIMIT 200")
+        users = cur.fetchall()
+        cur.execute("SELECT id, owner_id FROM startups ORDER BY random() LIMIT 200")
+        startups = cur.fetchall()
+        cur.execute("""
+            SELECT startup_id FROM startup_members WHERE status = 'accepted'
+            GROUP BY startup_id ORDER BY COUNT(*) DESC LIMIT 20
+        """)
+        busy_startups = [row[0] for row in cur.fetchall()]
+        cur.execute("SELECT user_id FROM startup_members GROUP BY user_id ORDER BY COUNT(*) DESC LIMIT 20")
+        busy_members = [row[0] for row in cur.fetchall()]
+        cur.execute("SELECT COUNT(*) FROM startups WHERE status = 'active'")
+        active_pages = max(1, cur.fetchone()[0] // 10)
+    return {
+        'user_ids': [row[0] for row in users],
+        'usernames': [row[1] for row in users],
+        'startup_ids': [row[0] for row in startups] or [1],
+        'owner_ids': [row[1] for row in startups] or [0],
+        'busy_startups': busy_startups or [1],
+        'busy_members': busy_members or [0],
+        'active_pages': active_pages
+    }
+
+def build_cases(db, samples: Dict, rng: random.Random, writes: bool = False) -> Dict[str, Callable[[], object]]:
+    """Nomi -> argumentsiz chaqiruv; har chaqiruvda tasodifiy (lekin seed bo'yicha takrorlanuvchi) argument.
+
+    writes=False bo'lsa bazaga yozadigan funksiyalar (haqiqiy foydalanuvchilar qatorlarini o'zgartiradi) kirmaydi.
+    """
+    pick = rng.choice
+    cases = {
+        'get_user': lambda: db.get_user(pick(samples['user_ids'])),
+        'get_user_by_username': lambda: db.get_user_by_username(pick(samples['usernames'])),
+        'get_recent_users(10)': lambda: db.get_recent_users(10),
+        'get_recent_users(1000)': lambda: db.get_recent_users(1000),
+        'get_all_users': db.get_all_users,
+        'get_startup': lambda: db.get_startup(pick(samples['startup_ids'])),
+        'get_startups_by_owner': lambda: db.get_startups_by_owner(pick(samples['owner_ids'])),
+        'get_pending_startups(1)': lambda: db.get_pending_startups(1),
+        'get_active_startups(1)': lambda: db.get_active_startups(1),
+        'get_active_startups(last)': lambda: db.get_active_startups(samples['active_pages']),
+        'get_completed_startups(1)': lambda: db.get_completed_startups(1),
+        'get_rejected_startups(1)': lambda: db.get_rejected_startups(1),
+        'search_startups': lambda: db.search_startups(pick(['Edu', 'Tech', 'Hub 1', 'yo\'q-narsa'])),
+        'get_startup_members(busy)': lambda: db.get_startup_members(pick(samples['busy_startups'])),
+        'get_all_startup_members(busy)': lambda: db.get_all_startup_members(pick(samples['busy_startups'])),
+        'get_user_startups(busy)': lambda: db.get_user_startups(pick(samples['busy_members'])),
+        'get_recent_startups(10)': lambda: db.get_recent_startups(10),
+        'get_statistics': db.get_statistics,
+        'get_user_activity_stats': lambda: db.get_user_activity_stats(pick(samples['busy_members'])),
+        'get_collection_stats': db.get_collection_stats,
+        'get_data_version': db.get_data_version,
+    }
+    if writes:
+        cases['update_user_field'] = lambda: db.update_user_field(pick(samples['user_ids']), 'bio', 'benchmark')
+    return cases
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(q * (len(ordered) - 1)))))
+    return ordered[index]
+
+def measure(fn: Callable[[], object], iterations: int, warmup: int, alloc_calls: int = 5) -> Dict:
+    """Vaqt persentillari (ms) va bitta chaqiruvdagi Python ajratmalari (tracemalloc)"""
+    for _ in range(warmup):
+        fn()
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    peaks = []
+    blocks = []
+    for _ in range(alloc_calls):
+        tracemalloc.start()
+        try:
+            before = tracemalloc.take_snapshot()
+            result = fn()
+            _, peak = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot()
+        finally:
+            tracemalloc.stop()
+        peaks.append(peak)
+        # Natija ushlab turgan bloklar soni (qaytgan qatorlar/modellar hajmi)
+        blocks.append(sum(stat.count_diff for stat in after.compare_to(before, 'filename') if stat.count_diff > 0))
+        del result
+
+    return {
+        'iterations': iterations,
+        'mean_ms': round(statistics.fmean(timings), 3),
+        'p50_ms': round(_percentile(timings, 0.50), 3),
+        'p90_ms': round(_percentile(timings, 0.90), 3),
+        'p99_ms': round(_percentile(timings, 0.99), 3),
+        'min_ms': round(min(timings), 3),
+        'max_ms': round(max(timings), 3),
+        'alloc_peak_kb': round(statistics.median(peaks) / 1024, 1),
+        'alloc_blocks': int(statistics.median(blocks))
+    }
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(current: Dict, baseline: Dict, threshold: float, metric: str = 'p50_ms') -> List[str]:
+    """Baseline dan threshold (ulush) dan ko'p sekinlashgan funksiyalar"""
+    regressions = []
+    print(f"\n📊 Baseline ({baseline['meta'].get('commit')}, {baseline['meta'].get('scale')}) bilan, {metric}:")
+    for name, result in current['results'].items():
+        base = baseline['results'].get(name)
+        if base is None:
+            print(f"  {name:<32} {result[metric]:9.3f} ms  (yangi)")
+            continue
+        # Juda tez funksiyalarda shovqin katta - 0.05 ms dan kichik farq hisobga olinmaydi
+        delta = (result[metric] - base[metric]) / base[metric] if base[metric] else 0.0
+        flag = ''
+        if delta > threshold and result[metric] - base[metric] > 0.05:
+            flag = '  ❌ REGRESSIYA'
+            regressions.append(name)
+        elif delta < -threshold:
+            flag = '  ✅ tezlashdi'
+        print(f"  {name:<32} {base[metric]:9.3f} -> {result[metric]:9.3f} ms  {delta * 100:+6.1f}%{flag}")
+    return regressions
+
+def run(dsn: str, args) -> Dict:
+    os.environ['DATABASE_URL'] = dsn
+    # db.py DATABASE_URL ni birinchi ulanishda o'qiydi; query log shovqinini o'chirish
+    os.environ.setdefault('DB_SLOW_QUERY_MS', '1000000')
+    import db
+
+    rng = random.Random(args.seed)
+    samples = _samples(db, rng)
+    cases = build_cases(db, samples, rng, writes=args.allow_writes)
+    if not args.allow_writes:
+        print("ℹ️ Yozuvchi funksiyalar (update_user_field) o'tkazib yuborildi: --allow-writes bilan yoqiladi")
+    if args.only:
+        cases = {name: fn for name, fn in cases.items() if any(part in name for part in args.only.split(','))}
+
+    with db.db_instance.get_cursor() as cur:
+        cur.execute("SELECT current_setting('server_version'), (SELECT COUNT(*) FROM users), (SELECT COUNT(*) FROM startups), (SELECT COUNT(*) FROM startup_members)")
+        server_version, users, startups, members = cur.fetchone()
+
+    print(f"\n⏱️ {len(cases)} ta funksiya, {args.iterations} iteratsiya "
+          f"(users {users}, startups {startups}, members {members}):")
+    results = {}
+    for name, fn in cases.items():
+        result = measure(fn, args.iterations, args.warmup)
+        results[name] = result
+        print(f"  {name:<32} p50 {result['p50_ms']:8.3f}  p90 {result['p90_ms']:8.3f}  p99 {result['p99_ms']:8.3f} ms"
+              f"  alloc {result['alloc_peak_kb']:8.1f} KB / {result['alloc_blocks']} blok")
+
+    return {
+        'meta': {
+            'commit': _git_commit(),
+            'scale': args.scale,
+            'rows': {'users': users, 'startups': startups, 'startup_members': members},
+            'postgres': server_version,
+            'python': platform.python_version(),
+            'iterations': args.iterations,
+            'timestamp': datetime.now().isoformat(timespec='seconds')
+        },
+        'results': results
+    }
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="db.py funksiyalari benchmarki")
+    parser.add_argument('--scale', default='1k', help=f"Foydalanuvchilar soni: {', '.join(SCALES)} yoki son")
+    parser.add_argument('--dsn', help="Mavjud PostgreSQL (berilmasa vaqtinchalik klaster yaratiladi)")
+    parser.add_argument('--populate', action='store_true',
+                        help="--dsn bazasini sintetik to'plam bilan to'ldirish (mavjud ma'lumotlarga yoziladi)")
+    parser.add_argument('--allow-writes', action='store_true',
+                        help="Yozuvchi funksiyalarni ham o'lchash (--dsn bilan; sampled foydalanuvchilar bio si o'zgaradi)")
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--only', help="Faqat nomida shu qismlar bor funksiyalar (vergul bilan)")
+    parser.add_argument('--out', help="Natijani JSON faylga yozish")
+    parser.add_argument('--compare', help="Baseline JSON bilan solishtirish")
+    parser.add_argument('--threshold', type=float, default=0.2, help="Regressiya chegarasi (0.2 = +20%%)")
+    parser.add_argument('--metric', default='p50_ms', choices=['p50_ms', 'p90_ms', 'p99_ms', 'mean_ms'])
+    parser.add_argument('--keep', action='store_true', help="Vaqtinchalik klaster papkasini o'chirmaslik")
+    args = parser.parse_args()
+
+    users = SCALES.get(args.scale.lower()) or int(args.scale)
+
+    if args.dsn:
+        if args.populate:
+            seed(args.dsn, users, args.seed)
+        report = run(args.dsn, args)
+    else:
+        # Vaqtinchalik klaster - to'ldirish va yozuvlar xavfsiz
+        args.allow_writes = True
+        with TempPostgres(keep=args.keep) as dsn:
+            seed(dsn, users, args.seed)
+            report = run(dsn, args)
+
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 {args.out}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold, args.metric)
+        if regressions:
+            print(f"\n❌ {len(regressions)} ta regressiya (> {args.threshold * 100:.0f}%): {', '.join(regressions)}")
+            sys.exit(1)
+        print("\n✅ Regressiya yo'q")
@@ -0,0 +1,67 @@
+# tools/bench_json.py - Flask standart JSON va FastJSONProvider ni solishtirish
+#
+#   python -m tools.bench_json [--rows 10000]
+import argparse
+import time
+import tracemalloc
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from json_provider import FastJSONProvider, orjson, stream_json
+from models import User
+
+def _users(count: int):
+    make = User.mapper(['user_id', 'username', 'first_name', 'last_name', 'phone', 'joined_at', 'status'])
+    return [
+        make((1000 + i, f'user{i}', "Oʻktam", 'Familiya', '+998901234567', '2024-01-01 10:00', 'active'))
+        for i in range(count)
+    ]
+
+def _payload(users):
+    return {
+        'success': True,
+        'data': [
+            {'id': u.user_id, 'name': f"{u.first_name} {u.last_name}", 'username': u.username, 'joined_at': u.joined_at}
+            for u in users
+        ],
+        'pagination': {'page': 1, 'per_page': len(users), 'total': len(users)}
+    }
+
+def _measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    size = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, size
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="JSON serializatsiya benchmarki")
+    parser.add_argument('--rows', type=int, default=10000)
+    args = parser.parse_args()
+
+    users = _users(args.rows)
+    app = Flask(__name__)
+    default_provider = DefaultJSONProvider(app)
+    fast_provider = FastJSONProvider(app)
+
+    def run_default():
+        with app.app_context():
+            return len(default_provider.response(_payload(users)).get_data())
+
+    def run_fast():
+        with app.app_context():
+            return len(fast_provider.response(_payload(users)).get_data())
+
+    def run_stream():
+        rows = ({'id': u.user_id, 'name': f"{u.first_name} {u.last_name}", 'username': u.username,
+                 'joined_at': u.joined_at} for u in users)
+        response = stream_json({'success': True}, 'data', rows)
+        return sum(len(chunk) for chunk in response.response)
+
+    print(f"orjson: {'bor' if orjson is not None else 'yoq (stdlib json)'}, {args.rows} qator")
+    for label, fn in (('flask default jsonify', run_default), ('FastJSONProvider', run_fast), ('stream_json', run_stream)):
+        elapsed, peak, size = _measure(fn)
+        print(f"{label:<24} {elapsed * 1000:8.2f} ms  peak {peak / 1024 / 1024:6.2f} MB  body {size / 1024:8.1f} KB")
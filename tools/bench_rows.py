@@ -0,0 +1,188 @@
+# tools/bench_rows.py - Qatorlarni mapping qilish usullarini solishtirish
+#
+#   python -m tools.bench_rows                  # sintetik 10k qator, faqat Python tomoni
+#   python -m tools.bench_rows --dsn postgresql://...   # + haqiqiy PostgreSQL so'rovi
+import argparse
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+import pytz
+from psycopg2.extras import RealDictRow
+
+from db import TZ, TZ_NAME, TIMESTAMP_SQL_FORMAT, _format_timestamp
+from models import Startup
+
+COLUMNS = [
+    'id', 'name', 'description', 'logo', 'group_link', 'owner_id', 'status',
+    'created_at', 'started_at', 'ended_at', 'results', 'updated_at',
+    'owner_first_name', 'owner_last_name'
+]
+TIMESTAMP_FIELDS = ['created_at', 'started_at', 'ended_at', 'updated_at']
+
+class LazyRow:
+    """Tuple qator; timestamp faqat murojaat qilinganda formatlanadi"""
+    __slots__ = ('_row', '_index')
+
+    def __init__(self, row, index):
+        self._row = row
+        self._index = index
+
+    def __getitem__(self, key):
+        value = self._row[self._index[key]]
+        if key in TIMESTAMP_FIELDS:
+            return _format_timestamp(value)
+        return value
+
+def _synthetic_rows(count: int):
+    """psycopg2 qaytaradigan ko'rinishdagi (tz-aware datetime) qatorlar"""
+    base = datetime(2024, 1, 1, tzinfo=pytz.utc)
+    rows = []
+    for i in range(count):
+        created = base + timedelta(minutes=i)
+        rows.append((
+            i, f'Startup {i}', 'Tavsif ' * 10, None, 'https://t.me/group', 1000 + i, 'active',
+            created, created + timedelta(days=1), None, None, created + timedelta(days=2),
+            'Ism', 'Familiya'
+        ))
+    return rows
+
+def _preformatted(rows):
+    """SQL da to_char qilingan holatni taqlid qilish"""
+    idx = [COLUMNS.index(f) for f in TIMESTAMP_FIELDS]
+    result = []
+    for row in rows:
+        row = list(row)
+        for i in idx:
+            row[i] = _format_timestamp(row[i])
+        result.append(tuple(row))
+    return result
+
+def map_legacy(rows):
+    """Eski usul: RealDictRow -> dict nusxa -> har maydonni Python da formatlash"""
+    result = []
+    for row in rows:
+        startup_dict = dict(row)
+        for field in TIMESTAMP_FIELDS:
+            startup_dict[field] = _format_timestamp(startup_dict.get(field))
+        result.append(startup_dict)
+    return result
+
+def map_sql_formatted(rows):
+    """Yangi usul: SQL da formatlangan tuple qatorlar -> dict(zip(...))"""
+    return [dict(zip(COLUMNS, row)) for row in rows]
+
+def map_lazy(rows):
+    """Muqobil: tuple qatorlar, formatlash murojaatda"""
+    index = {name: i for i, name in enumerate(COLUMNS)}
+    return [LazyRow(row, index) for row in rows]
+
+def map_models(rows):
+    """Model usuli: SQL da formatlangan tuple qatorlar -> __slots__ li Startup"""
+    make = Startup.mapper(COLUMNS)
+    return [make(row) for row in rows]
+
+def _allocated(fn, arg) -> int:
+    """Natija saqlanib turgan holatdagi xotira (bayt)"""
+    tracemalloc.start()
+    try:
+        result = fn(arg)
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return size
+
+def _best_of(fn, arg, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(arg)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def _report(label: str, seconds: float, count: int, baseline: float = None):
+    line = f"{label:<42} {seconds * 1000:9.2f} ms  {seconds / count * 1e6:7.2f} us/qator"
+    if baseline:
+        line += f"  x{baseline / seconds:.1f}"
+    print(line)
+
+def bench_python(count: int, repeat: int):
+    raw = _synthetic_rows(count)
+    real_dict_rows = []
+    for row in raw:
+        r = RealDictRow()
+        r.update(zip(COLUMNS, row))
+        real_dict_rows.append(r)
+    formatted = _preformatted(raw)
+
+    print(f"\n🐍 Python tomoni, {count} qator (eng yaxshi {repeat} ta urinishdan):")
+    legacy = _best_of(map_legacy, real_dict_rows, repeat)
+    _report('legacy: dict copy + _format_timestamp', legacy, count)
+    _report('sql: tuple + dict(zip)', _best_of(map_sql_formatted, formatted, repeat), count, legacy)
+    _report('lazy: tuple, formatlashsiz', _best_of(map_lazy, raw, repeat), count, legacy)
+
+    def lazy_all_fields(rows):
+        for row in map_lazy(rows):
+            for field in TIMESTAMP_FIELDS:
+                row[field]
+    _report('lazy: barcha timestamp larga murojaat', _best_of(lazy_all_fields, raw, repeat), count, legacy)
+    _report('models: tuple -> Startup (__slots__)', _best_of(map_models, formatted, repeat), count, legacy)
+
+    print(f"\n💾 Natija xotirasi, {count} qator:")
+    for label, fn in (('sql: dict(zip)', map_sql_formatted), ('models: Startup', map_models)):
+        size = _allocated(fn, formatted)
+        print(f"{label:<42} {size / 1024 / 1024:9.2f} MB  {size / count:7.0f} B/qator")
+
+def bench_database(dsn: str, count: int, repeat: int):
+    import psycopg2
+    from psycopg2.extras import RealDictCursor
+
+    base_sql = """
+        SELECT g AS id, 'Startup ' || g AS name, {ts} AS created_at, {ts2} AS updated_at
+        FROM generate_series(1, %s) g
+    """
+    raw_ts = "now() - g * interval '1 minute'"
+    legacy_sql = base_sql.format(ts=raw_ts, ts2=raw_ts)
+    fmt = f"to_char(({raw_ts}) AT TIME ZONE '{TZ_NAME}', '{TIMESTAMP_SQL_FORMAT}')"
+    sql_formatted = base_sql.format(ts=fmt, ts2=fmt)
+
+    conn = psycopg2.connect(dsn)
+    try:
+        def legacy(_):
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(legacy_sql, (count,))
+                result = []
+                for row in cur.fetchall():
+                    row_dict = dict(row)
+                    row_dict['created_at'] = _format_timestamp(row_dict['created_at'])
+                    row_dict['updated_at'] = _format_timestamp(row_dict['updated_at'])
+                    result.append(row_dict)
+                return result
+
+        def formatted(_):
+            with conn.cursor() as cur:
+                cur.execute(sql_formatted, (count,))
+                columns = [col[0] for col in cur.description]
+                return [dict(zip(columns, row)) for row in cur.fetchall()]
+
+        assert legacy(None)[0] == formatted(None)[0], "Natijalar mos kelmadi"
+
+        print(f"\n🗄️ PostgreSQL so'rovi + mapping, {count} qator:")
+        base = _best_of(legacy, None, repeat)
+        _report('legacy: RealDictCursor + Python formatlash', base, count)
+        _report('sql: to_char + tuple cursor', _best_of(formatted, None, repeat), count, base)
+    finally:
+        conn.close()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Qator mapping usullari benchmarki")
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--dsn', help="Haqiqiy so'rovni ham o'lchash uchun PostgreSQL DSN")
+    args = parser.parse_args()
+
+    print(f"Timezone: {TZ}")
+    bench_python(args.rows, args.repeat)
+    if args.dsn:
+        bench_database(args.dsn, args.rows, args.repeat)
@@ -0,0 +1,300 @@
+# tools/bot_load.py - main.py handlerlari uchun yuklama generatori (tools.fake_telegram orqali)
+#
+#   python -m tools.bot_load --rate 20 --duration 60                    # vaqtinchalik PostgreSQL + seed
+#   python -m tools.bot_load --dsn postgresql://... --rate 50 --mix start=1,browse=4,join=2,create=1
+#   python -m tools.bot_load --dsn postgresql://... --populate      # bazani avval sintetik to'plam bilan to'ldirish
+#   python -m tools.bot_load --rate 30 --enforce-limits --rate-limit-rate 0.02 --out bench/bot.json
+#
+# Bot, fake Bot API va generator bitta jarayonda ishlaydi; kechikish - update getUpdates orqali
+# yetkazilgandan botning shu chatga birinchi (first) va oxirgi (last) chiquvchi chaqiruvigacha.
+import argparse
+import json
+import logging
+import os
+import random
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Optional
+
+from tools.bench_db import TempPostgres, _git_commit, _percentile, seed
+from tools.fake_telegram import FakeTelegram, add_config_arguments, config_from_args, serve
+
+# Ssenariy qadamlari: (nomi, turi, qiymat); 'button' - oxirgi xabarlardagi shu prefiksli inline tugma
+SCENARIOS = {
+    'start': [('start', 'text', '/start')],
+    'profile': [('profile', 'text', '👤 Profil')],
+    'browse': [('list', 'text', '🌐 Startaplar'), ('next_page', 'button', 'startup_page_')],
+    'join': [('list', 'text', '🌐 Startaplar'), ('join', 'button', 'join_startup_')],
+    'create': [
+        ('menu', 'text', '➕ Startup yaratish'),
+        ('name', 'text', 'Load startup {user_id}'),
+        ('description', 'text', "Yuklama testi uchun yaratilgan startap tavsifi"),
+        ('logo', 'photo', None),
+        ('group_link', 'text', 'https://t.me/load_{user_id}')
+    ]
+}
+DEFAULT_MIX = 'start=2,profile=1,browse=4,join=2,create=1'
+
+FIRST_USER_ID = 990000000
+
+def parse_mix(value: str) -> Dict[str, float]:
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        if name.strip() not in SCENARIOS:
+            raise ValueError(f"Noma'lum ssenariy: {name}")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+class VirtualUser:
+    def __init__(self, user_id: int):
+        self.user_id = user_id
+        self.user = {'id': user_id, 'is_bot': False, 'first_name': 'Load', 'last_name': str(user_id),
+                     'username': f"load_{user_id}", 'language_code': 'uz'}
+        self.message_id = 0
+
+    def message(self, kind: str, value) -> Dict:
+        self.message_id += 1
+        message = {
+            'message_id': self.message_id,
+            'date': int(time.time()),
+            'chat': {'id': self.user_id, 'type': 'private', 'first_name': 'Load'},
+            'from': self.user
+        }
+        if kind == 'photo':
+            message['photo'] = [{'file_id': f"load_photo_{self.user_id}_{size}", 'file_unique_id': f"lp{self.user_id}{size}",
+                                 'width': size, 'height': size} for size in (90, 320, 800)]
+        else:
+            message['text'] = value.format(user_id=self.user_id)
+        return {'message': message}
+
+    def callback(self, source: Dict, data: str) -> Dict:
+        self.message_id += 1
+        return {'callback_query': {'id': f"{self.user_id}{self.message_id}", 'from': self.user,
+                                   'chat_instance': str(self.user_id), 'data': data, 'message': source}}
+
+def _button(message: Dict, prefix: str) -> Optional[str]:
+    for row in (message.get('reply_markup') or {}).get('inline_keyboard', []):
+        for button in row:
+            if button.get('callback_data', '').startswith(prefix):
+                return button['callback_data']
+    return None
+
+class LoadGenerator:
+    def __init__(self, fake: FakeTelegram, users: int, timeout: float = 10.0, settle: float = 0.05, seed_value: int = 42):
+        self.fake = fake
+        self.timeout = timeout
+        self.settle = settle
+        self.rng = random.Random(seed_value)
+        self._idle = [VirtualUser(FIRST_USER_ID + i) for i in range(users)]
+        self._lock = threading.Lock()
+        # (ssenariy, qadam) -> update_id lar; kechikishlar oxirida trackerlardan hisoblanadi
+        self.steps = defaultdict(list)
+        self.counters = Counter()
+
+    def _take_user(self) -> Optional[VirtualUser]:
+        with self._lock:
+            return self._idle.pop(self.rng.randrange(len(self._idle))) if self._idle else None
+
+    def _release(self, user: VirtualUser):
+        with self._lock:
+            self._idle.append(user)
+
+    def _send(self, user: VirtualUser, update: Dict, label) -> Optional[int]:
+        update_id = self.fake.push_update(update, user.user_id, f"{label[0]}/{label[1]}")
+        if not self.fake.wait_for_response(update_id, self.timeout):
+            self.counters['timeouts'] += 1
+            return None
+        # Keyingi update kelishidan oldin handler next_step ni ro'yxatdan o'tkazib ulgurishi uchun
+        self.fake.wait_settled(update_id, self.settle, self.timeout)
+        return update_id
+
+    def run_scenario(self, name: str, user: VirtualUser, record: bool = True):
+        try:
+            started = time.perf_counter()
+            update_id = None
+            for step, kind, value in SCENARIOS[name]:
+                if kind == 'button':
+                    # Tugma oldingi qadamga javoban kelgan xabardan olinadi
+                    source = self.fake.wait_for_message(user.user_id, update_id, lambda message: _button(message, value),
+                                                        self.timeout)
+                    if source is None:
+                        self.counters[f"{name}/{step}: tugma yo'q"] += 1
+                        break
+                    update = user.callback(source, _button(source, value))
+                else:
+                    update = user.message(kind, value)
+                update_id = self._send(user, update, (name, step))
+                if update_id is None:
+                    break
+                if record:
+                    self.steps[(name, step)].append(update_id)
+            else:
+                if record:
+                    self.steps[(name, 'total')].append(time.perf_counter() - started)
+                    self.counters['scenarios'] += 1
+        finally:
+            self._release(user)
+
+    def warmup(self, workers: int):
+        """Har bir virtual foydalanuvchi /start bilan ro'yxatdan o'tadi (o'lchanmaydi)"""
+        users = list(self._idle)
+        self._idle.clear()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for user in users:
+                pool.submit(self.run_scenario, 'start', user, False)
+
+    def run(self, mix: Dict[str, float], rate: float, duration: float, workers: int):
+        """Ochiq tsikl: ssenariylar rate/s tezlikda boshlanadi; bo'sh foydalanuvchi bo'lmasa - dropped"""
+        names, weights = list(mix), list(mix.values())
+        interval = 1.0 / rate
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            start = time.perf_counter()
+            next_at = start
+            while next_at - start < duration:
+                delay = next_at - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                next_at += interval
+                user = self._take_user()
+                if user is None:
+                    self.counters['dropped'] += 1
+                    continue
+                self.counters['started'] += 1
+                pool.submit(self.run_scenario, self.rng.choices(names, weights)[0], user)
+        return time.perf_counter() - start
+
+    def report(self) -> Dict:
+        results = {}
+        for (name, step), values in sorted(self.steps.items()):
+            if step == 'total':
+                latencies = {'total': [v * 1000 for v in values]}
+                calls = []
+            else:
+                trackers = [self.fake.trackers[update_id] for update_id in values]
+                latencies = {
+                    'first': [(t.first_call_at - t.delivered_at) * 1000 for t in trackers],
+                    'last': [(t.last_call_at - t.delivered_at) * 1000 for t in trackers],
+                    'queue': [(t.delivered_at - t.created_at) * 1000 for t in trackers]
+                }
+                calls = [t.calls for t in trackers]
+            entry = {'count': len(values)}
+            for kind, samples in latencies.items():
+                entry[kind] = {f"p{q}_ms": round(_percentile(samples, q / 100), 2) for q in (50, 90, 99)}
+            if calls:
+                entry['calls_per_update'] = round(sum(calls) / len(calls), 2)
+            results[f"{name}/{step}"] = entry
+        return results
+
+def _print_report(results: Dict, stats: Dict, counters: Counter, elapsed: float):
+    print(f"\n⏱️ {counters['scenarios']} ssenariy {elapsed:.1f}s da "
+          f"({counters['scenarios'] / max(elapsed, 1e-9):.1f}/s), dropped {counters['dropped']}, timeout {counters['timeouts']}")
+    for name, entry in results.items():
+        if 'total' in entry:
+            total = entry['total']
+            print(f"  {name:<24} {entry['count']:6}  jami p50 {total['p50_ms']:8.1f}  p90 {total['p90_ms']:8.1f}  p99 {total['p99_ms']:8.1f} ms")
+            continue
+        first, last = entry['first'], entry['last']
+        print(f"  {name:<24} {entry['count']:6}  first p50 {first['p50_ms']:7.1f} p99 {first['p99_ms']:7.1f}"
+              f"  last p50 {last['p50_ms']:7.1f} p99 {last['p99_ms']:7.1f} ms  queue p99 {entry['queue']['p99_ms']:6.1f}"
+              f"  {entry['calls_per_update']} chaqiruv")
+    print("\n📤 Chiquvchi chaqiruvlar: " + ', '.join(f"{method} {count}" for method, count in sorted(stats['calls'].items())))
+    print("   Javoblar: " + ', '.join(f"{status} {count}" for status, count in sorted(stats['statuses'].items())))
+    for key, value in counters.items():
+        if key not in ('scenarios', 'dropped', 'timeouts', 'started'):
+            print(f"   ⚠️ {key}: {value}")
+
+def run(dsn: str, args) -> Dict:
+    fake = FakeTelegram(config_from_args(args), seed=args.seed)
+    server = serve(fake)
+
+    # main.py import qilinishidan oldin: token, baza va API manzili
+    os.environ['BOT_TOKEN'] = '123456:LOAD-TEST'
+    os.environ['DATABASE_URL'] = dsn
+    os.environ['TELEGRAM_API_URL'] = f"http://127.0.0.1:{server.server_address[1]}/bot{{0}}/{{1}}"
+    os.environ.setdefault('DB_SLOW_QUERY_MS', '1000000')
+    import telebot.util
+    import main
+
+    if not args.verbose:
+        logging.getLogger().setLevel(logging.WARNING)
+    if args.bot_threads:
+        main.bot.worker_pool = telebot.util.ThreadPool(main.bot, num_threads=args.bot_threads)
+    main.db_instance.on_connect(main.init_db)
+    if not main.is_db_ready():
+        raise RuntimeError("PostgreSQL ga ulanib bo'lmadi")
+
+    polling = threading.Thread(target=main.bot.infinity_polling,
+                               kwargs={'timeout': 10, 'long_polling_timeout': 1, 'logger_level': None}, daemon=True)
+    polling.start()
+
+    generator = LoadGenerator(fake, args.users, args.timeout, args.settle / 1000, args.seed)
+    print(f"🔥 Warmup: {args.users} foydalanuvchi /start")
+    generator.warmup(args.workers)
+    fake.calls.clear()
+    fake.statuses.clear()
+
+    mix = parse_mix(args.mix)
+    print(f"🚀 {args.rate}/s, {args.duration}s, mix {mix}")
+    elapsed = generator.run(mix, args.rate, args.duration, args.workers)
+    main.bot.stop_polling()
+    server.shutdown()
+
+    results = generator.report()
+    stats = fake.stats()
+    _print_report(results, stats, generator.counters, elapsed)
+    return {
+        'meta': {
+            'commit': _git_commit(),
+            'rate': args.rate,
+            'duration': args.duration,
+            'users': args.users,
+            'mix': mix,
+            'fake': fake.config.to_dict(),
+            'timestamp': datetime.now().isoformat(timespec='seconds')
+        },
+        'counters': dict(generator.counters),
+        'calls': stats['calls'],
+        'statuses': stats['statuses'],
+        'results': results
+    }
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Bot handlerlari uchun yuklama generatori")
+    parser.add_argument('--dsn', help="Mavjud PostgreSQL (berilmasa vaqtinchalik klaster yaratiladi)")
+    parser.add_argument('--populate', action='store_true',
+                        help="--dsn bazasini sintetik to'plam bilan to'ldirish (mavjud ma'lumotlarga yoziladi)")
+    parser.add_argument('--seed-users', type=int, default=10000, help="Seed to'plamdagi foydalanuvchilar")
+    parser.add_argument('--rate', type=float, default=20.0, help="Sekundiga boshlanadigan ssenariylar")
+    parser.add_argument('--duration', type=float, default=30.0)
+    parser.add_argument('--users', type=int, default=200, help="Virtual foydalanuvchilar (bir vaqtda bittadan ssenariy)")
+    parser.add_argument('--workers', type=int, default=64, help="Generator threadlari")
+    parser.add_argument('--mix', default=DEFAULT_MIX, help="Ssenariy og'irliklari")
+    parser.add_argument('--bot-threads', type=int, help="Bot worker pool hajmi (standart: telebot)")
+    parser.add_argument('--timeout', type=float, default=10.0, help="Bir qadam javobini kutish (s)")
+    parser.add_argument('--settle', type=float, default=50.0, help="Qadamlar orasidagi jimlik (ms)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--out', help="Natijani JSON faylga yozish")
+    parser.add_argument('--verbose', action='store_true', help="Bot loglarini INFO darajada qoldirish")
+    parser.add_argument('--keep', action='store_true', help="Vaqtinchalik klaster papkasini o'chirmaslik")
+    add_config_arguments(parser)
+    args = parser.parse_args()
+    parse_mix(args.mix)
+
+    if args.dsn:
+        if args.populate:
+            seed(args.dsn, args.seed_users, args.seed)
+        report = run(args.dsn, args)
+    else:
+        with TempPostgres(keep=args.keep) as dsn:
+            seed(dsn, args.seed_users, args.seed)
+            report = run(dsn, args)
+
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 {args.out}")
@@ -0,0 +1,317 @@
+# tools/bulk_import.py - COPY FROM STDIN + staging jadvallar orqali ommaviy import (upsert)
+#
+#   python -m tools.bulk_import DIR [--dsn postgresql://...] [--skip-existing]
+#   python -m tools.bulk_import --generate 200000 [--dsn ...]     # sintetik to'plam yaratib import qilish
+#
+# DIR ichida (ixtiyoriy) users.csv, startups.csv, startup_members.csv - sarlavhali CSV, ustunlar
+# tools.generate_data dagi USER_FIELDS / STARTUP_FIELDS / MEMBER_FIELDS bilan bir xil (tartib muhim emas).
+# Bo'sh katak NULL sifatida o'qiladi. Startaplar yangi (sequence) id oladi: mavjud startap (owner_id, name) bo'yicha
+# topiladi, qolganlari qo'shiladi (faylda bir xil kalitli qatorlar - bitta startap). Fayldagi id -> bazadagi id
+# jadvali (startup_id_map) orqali startup_members.startup_id yangi id ga o'giriladi. startups.csv bo'lmasa
+# a'zoliklardagi startup_id bazadagi id deb olinadi.
+import argparse
+import csv
+import os
+import sys
+import tempfile
+import time
+from typing import Callable, Dict
+
+import psycopg2
+
+# Jadvallar FK tartibida: users -> startups -> startup_members
+STAGING = {
+    'users': """
+        CREATE TEMP TABLE stage_users (
+            user_id BIGINT, username TEXT, first_name TEXT, last_name TEXT, phone TEXT, bio TEXT,
+            gender TEXT, birth_date TEXT, joined_at TIMESTAMPTZ, last_seen TIMESTAMPTZ, status TEXT
+        ) ON COMMIT DROP
+    """,
+    'startups': """
+        CREATE TEMP TABLE stage_startups (
+            id INTEGER, name TEXT, description TEXT, logo TEXT, group_link TEXT, owner_id BIGINT,
+            status TEXT, created_at TIMESTAMPTZ, started_at TIMESTAMPTZ, ended_at TIMESTAMPTZ, results TEXT
+        ) ON COMMIT DROP
+    """,
+    'startup_members': """
+        CREATE TEMP TABLE stage_startup_members (
+            startup_id INTEGER, user_id BIGINT, status TEXT, joined_at TIMESTAMPTZ
+        ) ON COMMIT DROP
+    """
+}
+
+# Staging dan asosiy jadvalga: takrorlar (DISTINCT ON) olib tashlanadi, FK si yo'q qatorlar o'tkazib yuboriladi
+MERGE = {
+    'users': """
+        INSERT INTO users (user_id, username, first_name, last_name, phone, bio, gender, birth_date,
+                           joined_at, last_seen, status, updated_at)
+        SELECT DISTINCT ON (user_id)
+               user_id, username, first_name, last_name, phone, bio, gender, birth_date,
+               COALESCE(joined_at, CURRENT_TIMESTAMP), last_seen, COALESCE(status, 'active'), CURRENT_TIMESTAMP
+        FROM stage_users
+        WHERE user_id IS NOT NULL
+        ORDER BY user_id
+        ON CONFLICT (user_id) DO {conflict}
+    """,
+    'startup_members': """
+        INSERT INTO startup_members (startup_id, user_id, status, joined_at, updated_at)
+        SELECT DISTINCT ON (ids.id, m.user_id)
+               ids.id, m.user_id, COALESCE(m.status, 'pending'),
+               COALESCE(m.joined_at, CURRENT_TIMESTAMP), CURRENT_TIMESTAMP
+        FROM stage_startup_members m
+        JOIN {startup_ids} ids ON ids.source_id = m.startup_id
+        JOIN users u ON u.user_id = m.user_id
+        ORDER BY ids.id, m.user_id
+        ON CONFLICT (startup_id, user_id) DO {conflict}
+    """
+}
+
+UPDATES = {
+    'users': """UPDATE SET
+            username = COALESCE(EXCLUDED.username, users.username),
+            first_name = COALESCE(EXCLUDED.first_name, users.first_name),
+            last_name = COALESCE(EXCLUDED.last_name, users.last_name),
+            phone = COALESCE(EXCLUDED.phone, users.phone), bio = COALESCE(EXCLUDED.bio, users.bio),
+            gender = COALESCE(EXCLUDED.gender, users.gender), birth_date = COALESCE(EXCLUDED.birth_date, users.birth_date),
+            joined_at = LEAST(users.joined_at, EXCLUDED.joined_at),
+            last_seen = GREATEST(users.last_seen, EXCLUDED.last_seen),
+            status = EXCLUDED.status, updated_at = CURRENT_TIMESTAMP""",
+    'startup_members': """UPDATE SET
+            status = EXCLUDED.status, joined_at = EXCLUDED.joined_at, updated_at = CURRENT_TIMESTAMP"""
+}
+
+# Startaplar surrogat id bo'yicha upsert qilinmaydi (boshqa bazadagi id mavjud startapni bosib ketardi).
+# 1) har bir (owner_id, name) uchun bitta bazadagi id: mavjud startap yoki sequence dan yangi id.
+#    Faylda bir xil kalitli bir necha qator (turli id) bo'lsa ham bitta startap bo'ladi
+STARTUP_KEY_MAP = """
+    CREATE TEMP TABLE startup_key_map (
+        owner_id BIGINT NOT NULL, name TEXT NOT NULL, id INTEGER NOT NULL, existing BOOLEAN NOT NULL,
+        PRIMARY KEY (owner_id, name)
+    ) ON COMMIT DROP
+"""
+
+# 2) fayl id -> bazadagi id; a'zoliklar shu jadval orqali o'giriladi
+STARTUP_ID_MAP = """
+    CREATE TEMP TABLE startup_id_map (
+        source_id INTEGER PRIMARY KEY, owner_id BIGINT NOT NULL, name TEXT NOT NULL,
+        id INTEGER NOT NULL, existing BOOLEAN NOT NULL
+    ) ON COMMIT DROP
+"""
+
+# Oldingi (id bilan) importlardan keyin sequence orqada qolgan bo'lsa nextval mavjud id ni qaytarmasligi uchun
+STARTUP_SEQUENCE_SYNC = """
+    SELECT setval(seq, GREATEST(COALESCE((SELECT MAX(id) FROM startups), 1),
+                                COALESCE(pg_sequence_last_value(seq::regclass), 1)))
+    FROM (SELECT pg_get_serial_sequence('startups', 'id') AS seq) s
+"""
+
+# nextval har bir noyob kalit uchun bir marta (alohida jadvalga yoziladi - join qayta hisoblamaydi)
+STARTUP_KEY_FILL = """
+    INSERT INTO startup_key_map (owner_id, name, id, existing)
+    SELECT k.owner_id, k.name, COALESCE(e.id, nextval(pg_get_serial_sequence('startups', 'id'))), e.id IS NOT NULL
+    FROM (
+        SELECT DISTINCT s.owner_id, s.name
+        FROM stage_startups s
+        JOIN users u ON u.user_id = s.owner_id
+        WHERE s.id IS NOT NULL AND s.name IS NOT NULL
+    ) k
+    LEFT JOIN LATERAL (
+        SELECT MIN(t.id) AS id FROM startups t WHERE t.owner_id = k.owner_id AND t.name = k.name
+    ) e ON TRUE
+"""
+
+# Bir fayl id si turli kalitli qatorlarda takrorlansa - kichik bazadagi id li kalit olinadi
+STARTUP_MAP_FILL = """
+    INSERT INTO startup_id_map (source_id, owner_id, name, id, existing)
+    SELECT DISTINCT ON (s.id) s.id, k.owner_id, k.name, k.id, k.existing
+    FROM stage_startups s
+    JOIN startup_key_map k ON k.owner_id = s.owner_id AND k.name = s.name
+    WHERE s.id IS NOT NULL
+    ORDER BY s.id, k.id
+"""
+
+# 3) yangilari ajratilgan id bilan qo'shiladi; bir kalitli qatorlardan eng kichik fayl id lisi
+STARTUP_INSERT = """
+    INSERT INTO startups (id, name, description, logo, group_link, owner_id, status,
+                          created_at, started_at, ended_at, results, updated_at)
+    SELECT DISTINCT ON (m.id)
+           m.id, s.name, s.description, s.logo, s.group_link, s.owner_id, COALESCE(s.status, 'pending'),
+           COALESCE(s.created_at, CURRENT_TIMESTAMP), s.started_at, s.ended_at, s.results, CURRENT_TIMESTAMP
+    FROM stage_startups s
+    JOIN startup_id_map m ON m.source_id = s.id AND m.owner_id = s.owner_id AND m.name = s.name
+    WHERE NOT m.existing
+    ORDER BY m.id, s.id
+"""
+
+# 4) mavjudlari (--skip-existing bo'lmasa) yangilanadi; kalit (owner_id, name) va bo'sh kataklar o'zgarmaydi
+STARTUP_UPDATE = """
+    UPDATE startups t SET
+        description = COALESCE(s.description, t.description), logo = COALESCE(s.logo, t.logo),
+        group_link = COALESCE(s.group_link, t.group_link), status = COALESCE(s.status, t.status),
+        started_at = COALESCE(s.started_at, t.started_at), ended_at = COALESCE(s.ended_at, t.ended_at),
+        results = COALESCE(s.results, t.results), updated_at = CURRENT_TIMESTAMP
+    FROM (
+        SELECT DISTINCT ON (m.id) m.id AS target_id, s.*
+        FROM stage_startups s
+        JOIN startup_id_map m ON m.source_id = s.id AND m.owner_id = s.owner_id AND m.name = s.name
+        WHERE m.existing
+        ORDER BY m.id, s.id
+    ) s
+    WHERE t.id = s.target_id
+"""
+
+# startups.csv siz import: a'zoliklardagi startup_id bazadagi startaplarga to'g'ridan-to'g'ri
+EXISTING_STARTUP_IDS = "(SELECT id AS source_id, id FROM startups)"
+
+def _merge_startups(cur, update_existing: bool):
+    """(inserted, updated); startup_id_map tranzaksiya oxirigacha a'zoliklar importi uchun qoladi"""
+    cur.execute(STARTUP_KEY_MAP)
+    cur.execute(STARTUP_ID_MAP)
+    cur.execute(STARTUP_SEQUENCE_SYNC)
+    cur.execute(STARTUP_KEY_FILL)
+    cur.execute(STARTUP_MAP_FILL)
+    cur.execute(STARTUP_INSERT)
+    inserted = cur.rowcount
+    updated = 0
+    if update_existing:
+        cur.execute(STARTUP_UPDATE)
+        updated = cur.rowcount
+    return inserted, updated
+
+class ProgressReader:
+    """COPY ga beriladigan fayl; o'qilgan baytlar bo'yicha progress chiqaradi"""
+
+    def __init__(self, f, total: int, label: str, report: Callable[[str], None], every: float = 1.0):
+        self._f = f
+        self.total = max(total, 1)
+        self.label = label
+        self.report = report
+        self.every = every
+        self.done = 0
+        self._last = 0.0
+
+    def read(self, size: int = -1):
+        data = self._f.read(size)
+        self.done += len(data)
+        now = time.monotonic()
+        if now - self._last >= self.every or not data:
+            self._last = now
+            self.report(f"   {self.label}: {min(100.0, self.done * 100 / self.total):5.1f}% "
+                        f"({self.done / 1024 / 1024:.1f} / {self.total / 1024 / 1024:.1f} MB)")
+        return data
+
+    def readline(self, size: int = -1):
+        return self._f.readline(size)
+
+def _csv_columns(path: str):
+    with open(path, newline='', encoding='utf-8') as f:
+        return next(csv.reader(f))
+
+def import_table(cur, table: str, path: str, update_existing: bool = True,
+                 report: Callable[[str], None] = print, startup_ids: str = EXISTING_STARTUP_IDS) -> Dict:
+    """Bitta jadval: staging ga COPY, keyin upsert; {'staged', 'inserted', 'updated', 'skipped'}
+
+    startup_ids - a'zoliklardagi startup_id ni bazadagi id ga o'giruvchi (source_id, id) jadval/so'rov.
+    """
+    columns = _csv_columns(path)
+    cur.execute(STAGING[table])
+
+    start = time.perf_counter()
+    with open(path, 'rb') as f:
+        reader = ProgressReader(f, os.path.getsize(path), f"{table} COPY", report)
+        # Ustun nomlari CSV sarlavhasidan - tartib fayldagidek bo'ladi
+        column_list = ', '.join(f'"{name}"' for name in columns)
+        cur.copy_expert(
+            f"COPY stage_{table} ({column_list}) FROM STDIN WITH (FORMAT csv, HEADER true, ENCODING 'UTF8')",
+            reader, size=1 << 20)
+    cur.execute(f"SELECT COUNT(*) FROM stage_{table}")
+    staged = cur.fetchone()[0]
+    copy_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    if table == 'startups':
+        inserted, updated = _merge_startups(cur, update_existing)
+    else:
+        conflict = UPDATES[table] if update_existing else 'NOTHING'
+        merge = MERGE[table].format(conflict=conflict, startup_ids=startup_ids)
+        cur.execute(f"""
+            WITH merged AS ({merge} RETURNING (xmax = 0) AS inserted)
+            SELECT COUNT(*) FILTER (WHERE inserted), COUNT(*) FILTER (WHERE NOT inserted) FROM merged
+        """)
+        inserted, updated = cur.fetchone()
+    merge_seconds = time.perf_counter() - start
+
+    result = {
+        'staged': staged,
+        'inserted': inserted,
+        'updated': updated,
+        'skipped': staged - inserted - updated,
+        'copy_seconds': round(copy_seconds, 2),
+        'merge_seconds': round(merge_seconds, 2)
+    }
+    report(f"✅ {table}: {staged} qator o'qildi, {inserted} qo'shildi, {updated} yangilandi, "
+           f"{result['skipped']} o'tkazib yuborildi (takror/FK yo'q) - COPY {copy_seconds:.1f}s, merge {merge_seconds:.1f}s")
+    return result
+
+def import_directory(conn, directory: str, update_existing: bool = True,
+                     report: Callable[[str], None] = print) -> Dict[str, Dict]:
+    """Papkadagi CSV larni FK tartibida, bitta tranzaksiyada import qilish"""
+    results = {}
+    with conn.cursor() as cur:
+        cur.execute("SET LOCAL synchronous_commit = off")
+        for table in STAGING:
+            path = os.path.join(directory, f"{table}.csv")
+            if os.path.exists(path):
+                # startups importidan keyin a'zoliklar fayldagi startap id lari bo'yicha (startup_id_map)
+                startup_ids = 'startup_id_map' if 'startups' in results else EXISTING_STARTUP_IDS
+                results[table] = import_table(cur, table, path, update_existing, report, startup_ids)
+    conn.commit()
+
+    # Rejalashtiruvchi statistikasi yangi hajmga moslashishi uchun
+    old_autocommit = conn.autocommit
+    conn.autocommit = True
+    try:
+        with conn.cursor() as cur:
+            for table in results:
+                cur.execute(f"ANALYZE {table}")
+    finally:
+        conn.autocommit = old_autocommit
+    return results
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="users / startups / startup_members ommaviy importi")
+    parser.add_argument('directory', nargs='?', help="users.csv, startups.csv, startup_members.csv joylashgan papka")
+    parser.add_argument('--dsn', default=os.getenv('DATABASE_URL'), help="PostgreSQL DSN (standart: DATABASE_URL)")
+    parser.add_argument('--skip-existing', action='store_true', help="Mavjud qatorlarni yangilamaslik")
+    parser.add_argument('--generate', type=int, metavar='USERS', help="Sintetik to'plam yaratib import qilish")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    if not args.dsn:
+        parser.error("--dsn yoki DATABASE_URL kerak")
+    if not args.directory and not args.generate:
+        parser.error("papka yoki --generate kerak")
+
+    from migrate import migrate
+
+    conn = None
+    try:
+        conn = psycopg2.connect(args.dsn)
+        # Sxema oxirgi versiyada bo'lishi kerak (gender, birth_date va h.k.)
+        migrate(conn)
+        start = time.perf_counter()
+        if args.generate:
+            from tools.generate_data import generate
+            with tempfile.TemporaryDirectory() as directory:
+                counts = generate(directory, args.generate, seed=args.seed)
+                print(f"🧪 Sintetik to'plam: {counts} ({time.perf_counter() - start:.1f}s)")
+                import_directory(conn, directory, not args.skip_existing)
+        else:
+            import_directory(conn, args.directory, not args.skip_existing)
+        print(f"🏁 Jami: {time.perf_counter() - start:.1f}s")
+    except (psycopg2.Error, OSError) as e:
+        print(f"❌ Import xatosi: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        if conn is not None:
+            conn.close()
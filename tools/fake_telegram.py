@@ -0,0 +1,395 @@
+# tools/fake_telegram.py - Yuklama testlari uchun lokal Telegram Bot API o'rinbosari
+#
+#   python -m tools.fake_telegram --port 8081 --latency-ms 40 --rate-limit-rate 0.01 --enforce-limits
+#   TELEGRAM_API_URL=http://127.0.0.1:8081/bot{0}/{1} python main.py
+#
+# Boshqaruv: POST /_control/updates {"updates": [...]}, GET /_control/stats, POST /_control/config, POST /_control/reset
+import argparse
+import json
+import random
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+BOT_USER = {'id': 7000000001, 'is_bot': True, 'first_name': 'GarajHub Load', 'username': 'garajhub_load_bot'}
+
+# Bu metodlarga kechikish/xato kiritilmaydi va ular limitlarga kirmaydi
+SERVICE_METHODS = {'getUpdates', 'getMe', 'deleteWebhook', 'setWebhook', 'getWebhookInfo', 'close', 'logOut'}
+# Yangi xabar qaytaradigan metodlar
+MESSAGE_METHODS = {'sendMessage', 'sendPhoto', 'sendDocument', 'sendVideo', 'sendAnimation', 'sendAudio',
+                   'sendVoice', 'sendSticker', 'sendLocation', 'sendContact', 'forwardMessage'}
+EDIT_METHODS = {'editMessageText', 'editMessageCaption', 'editMessageReplyMarkup', 'editMessageMedia'}
+# Shaxsiy chat: o'rtacha 1/s, lekin Telegram qisqa portlashni (bir nechta ketma-ket javob) qabul qiladi
+PRIVATE_CHAT_BURST = 3
+
+class FakeConfig:
+    def __init__(self, latency_ms: float = 30.0, jitter_ms: float = 10.0, error_rate: float = 0.0,
+                 rate_limit_rate: float = 0.0, retry_after: int = 3, enforce_limits: bool = False,
+                 member_status: str = 'member'):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.enforce_limits = enforce_limits
+        self.member_status = member_status
+
+    def update(self, values: Dict):
+        for key, value in values.items():
+            if not hasattr(self, key):
+                continue
+            if isinstance(getattr(self, key), bool):
+                value = value in (True, 1, '1', 'true', 'yes')
+            setattr(self, key, type(getattr(self, key))(value))
+
+    def to_dict(self) -> Dict:
+        return dict(vars(self))
+
+class UpdateTracker:
+    """Har bir update: yetkazilgan vaqt va shu chatga keyingi chiquvchi chaqiruvlar"""
+    __slots__ = ('update_id', 'chat_id', 'kind', 'created_at', 'delivered_at', 'first_call_at', 'last_call_at', 'calls')
+
+    def __init__(self, update_id: int, chat_id: int, kind: str):
+        self.update_id = update_id
+        self.chat_id = chat_id
+        self.kind = kind
+        self.created_at = time.perf_counter()
+        self.delivered_at = None
+        self.first_call_at = None
+        self.last_call_at = None
+        self.calls = 0
+
+class FakeTelegram:
+    """Bot API holati: update navbati, yuborilgan xabarlar, statistika"""
+
+    def __init__(self, config: Optional[FakeConfig] = None, seed: int = 0):
+        self.config = config or FakeConfig()
+        self._rng = random.Random(seed)
+        self._cond = threading.Condition()
+        self.reset()
+
+    def reset(self):
+        with self._cond:
+            self._updates: List[Dict] = []
+            self._next_update_id = 1
+            self._message_ids = defaultdict(int)
+            self._file_counter = 0
+            self.messages = defaultdict(lambda: deque(maxlen=20))
+            self.trackers: Dict[int, UpdateTracker] = {}
+            self._chat_update: Dict[int, int] = {}
+            self.calls = Counter()
+            self.statuses = Counter()
+            self._chat_sends = defaultdict(deque)
+            self._chat_tokens: Dict[int, tuple] = {}
+            self._global_sends = deque()
+
+    # ---------- update navbati ----------
+
+    def push_update(self, update: Dict, chat_id: int, kind: str = '') -> int:
+        """Update ni navbatga qo'shish; update_id qaytaradi"""
+        with self._cond:
+            update_id = self._next_update_id
+            self._next_update_id += 1
+            update = dict(update, update_id=update_id)
+            self._updates.append(update)
+            self.trackers[update_id] = UpdateTracker(update_id, chat_id, kind)
+            self._cond.notify_all()
+            return update_id
+
+    def _get_updates(self, offset: int, timeout: float, limit: int) -> List[Dict]:
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            # offset dan kichik update lar tasdiqlangan - navbatdan olib tashlanadi
+            self._updates = [u for u in self._updates if u['update_id'] >= offset]
+            while not self._updates:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return []
+                self._cond.wait(remaining)
+            batch = self._updates[:limit]
+            now = time.perf_counter()
+            for update in batch:
+                tracker = self.trackers.get(update['update_id'])
+                if tracker is not None and tracker.delivered_at is None:
+                    tracker.delivered_at = now
+                    self._chat_update[tracker.chat_id] = tracker.update_id
+            return batch
+
+    def wait_for_response(self, update_id: int, timeout: float) -> bool:
+        """Bot shu update ga javob (birinchi chiquvchi chaqiruv) berguncha kutish"""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            tracker = self.trackers[update_id]
+            while tracker.first_call_at is None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            return True
+
+    def wait_settled(self, update_id: int, settle: float, timeout: float):
+        """Oxirgi chiquvchi chaqiruvdan keyin settle soniya jimlik (handler tugashi taxmini)"""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            tracker = self.trackers[update_id]
+            while True:
+                quiet = time.perf_counter() - (tracker.last_call_at or tracker.delivered_at or tracker.created_at)
+                remaining = deadline - time.monotonic()
+                if quiet >= settle or remaining <= 0:
+                    return
+                self._cond.wait(min(settle - quiet, remaining))
+
+    def wait_for_message(self, chat_id: int, update_id: int, predicate, timeout: float) -> Optional[Dict]:
+        """update_id ga javoban chatga yuborilgan, predicate ga mos xabarni kutish"""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                for source, message in reversed(self.messages.get(chat_id, ())):
+                    if source == update_id and predicate(message):
+                        return message
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+
+    # ---------- limitlar va xatolar ----------
+
+    def _limit_retry_after(self, chat_id) -> int:
+        """Telegram limitlari: chatga 1/s (PRIVATE_CHAT_BURST gacha portlash), guruhga 20/min, jami 30/s;
+        oshsa retry_after (soniya)"""
+        now = time.monotonic()
+        global_window = self._global_sends
+        while global_window and now - global_window[0] >= 1:
+            global_window.popleft()
+        if len(global_window) >= 30:
+            return 1
+        is_group = isinstance(chat_id, int) and chat_id < 0 or isinstance(chat_id, str)
+        if chat_id is not None and is_group:
+            chat_window = self._chat_sends[chat_id]
+            while chat_window and now - chat_window[0] >= 60:
+                chat_window.popleft()
+            if len(chat_window) >= 20:
+                return max(1, int(60 - (now - chat_window[0])) + 1)
+            chat_window.append(now)
+        elif chat_id is not None:
+            tokens, updated = self._chat_tokens.get(chat_id, (PRIVATE_CHAT_BURST, now))
+            tokens = min(PRIVATE_CHAT_BURST, tokens + (now - updated))
+            if tokens < 1:
+                return max(1, int(1 - tokens) + 1)
+            self._chat_tokens[chat_id] = (tokens - 1, now)
+        global_window.append(now)
+        return 0
+
+    def _error(self, code: int, description: str, retry_after: int = None) -> Dict:
+        body = {'ok': False, 'error_code': code, 'description': description}
+        if retry_after is not None:
+            body['parameters'] = {'retry_after': retry_after}
+        return body
+
+    # ---------- Bot API ----------
+
+    def _message(self, chat_id, method: str, params: Dict) -> Dict:
+        numeric = int(chat_id) if str(chat_id).lstrip('-').isdigit() else chat_id
+        self._message_ids[numeric] += 1
+        message = {
+            'message_id': self._message_ids[numeric],
+            'date': int(time.time()),
+            'chat': {'id': numeric if isinstance(numeric, int) else -1000000000001,
+                     'type': 'private' if isinstance(numeric, int) and numeric > 0 else 'supergroup'},
+            'from': BOT_USER
+        }
+        if 'text' in params:
+            message['text'] = params['text']
+        if 'caption' in params:
+            message['caption'] = params['caption']
+        if method == 'sendPhoto':
+            self._file_counter += 1
+            file_id = params.get('photo') if isinstance(params.get('photo'), str) else f"fake_photo_{self._file_counter}"
+            message['photo'] = [{'file_id': file_id, 'file_unique_id': f"u{self._file_counter}", 'width': 640, 'height': 640}]
+        elif method == 'sendDocument':
+            self._file_counter += 1
+            message['document'] = {'file_id': f"fake_document_{self._file_counter}", 'file_unique_id': f"d{self._file_counter}"}
+        # Telegram Message ichida faqat inline klaviaturani qaytaradi
+        if params.get('reply_markup'):
+            try:
+                markup = json.loads(params['reply_markup'])
+            except (TypeError, ValueError):
+                markup = None
+            if isinstance(markup, dict) and 'inline_keyboard' in markup:
+                message['reply_markup'] = markup
+        return message
+
+    def handle(self, method: str, params: Dict) -> (int, Dict):
+        """(HTTP status, JSON javob)"""
+        if method == 'getUpdates':
+            updates = self._get_updates(int(params.get('offset', 0) or 0), float(params.get('timeout', 0) or 0),
+                                        int(params.get('limit', 100) or 100))
+            return 200, {'ok': True, 'result': updates}
+
+        config = self.config
+        if method not in SERVICE_METHODS:
+            delay = max(0.0, self._rng.gauss(config.latency_ms, config.jitter_ms)) / 1000
+            if delay:
+                time.sleep(delay)
+
+        with self._cond:
+            self.calls[method] += 1
+            chat_id = params.get('chat_id')
+            numeric_chat = int(chat_id) if chat_id is not None and str(chat_id).lstrip('-').isdigit() else chat_id
+
+            if method not in SERVICE_METHODS:
+                if config.error_rate and self._rng.random() < config.error_rate:
+                    self.statuses[500] += 1
+                    return 500, self._error(500, 'Internal Server Error')
+                retry_after = 0
+                if config.rate_limit_rate and self._rng.random() < config.rate_limit_rate:
+                    retry_after = config.retry_after
+                elif config.enforce_limits and (method in MESSAGE_METHODS or method in EDIT_METHODS):
+                    retry_after = self._limit_retry_after(numeric_chat)
+                if retry_after:
+                    self.statuses[429] += 1
+                    return 429, self._error(429, f'Too Many Requests: retry after {retry_after}', retry_after)
+
+            self.statuses[200] += 1
+            # Chiquvchi chaqiruvni shu chatning oxirgi yetkazilgan update iga bog'lash
+            source = self._chat_update.get(numeric_chat)
+            if numeric_chat is not None:
+                tracker = self.trackers.get(source)
+                if tracker is not None:
+                    now = time.perf_counter()
+                    if tracker.first_call_at is None:
+                        tracker.first_call_at = now
+                    tracker.last_call_at = now
+                    tracker.calls += 1
+                    self._cond.notify_all()
+
+            if method == 'getMe':
+                result = BOT_USER
+            elif method == 'getWebhookInfo':
+                result = {'url': '', 'has_custom_certificate': False, 'pending_update_count': len(self._updates)}
+            elif method == 'getChatMember':
+                user_id = int(params.get('user_id', 0))
+                result = {'user': {'id': user_id, 'is_bot': False, 'first_name': 'User'}, 'status': config.member_status}
+            elif method == 'getChat':
+                result = {'id': numeric_chat if isinstance(numeric_chat, int) else -1000000000001, 'type': 'private'}
+            elif method in MESSAGE_METHODS or method == 'copyMessage':
+                message = self._message(chat_id, method, params)
+                self.messages[message['chat']['id']].append((source, message))
+                result = {'message_id': message['message_id']} if method == 'copyMessage' else message
+            elif method in EDIT_METHODS and params.get('message_id'):
+                message = self._message(chat_id, method, params)
+                message['message_id'] = int(params['message_id'])
+                self.messages[message['chat']['id']].append((source, message))
+                result = message
+            else:
+                result = True
+            return 200, {'ok': True, 'result': result}
+
+    def stats(self) -> Dict:
+        with self._cond:
+            return {
+                'calls': dict(self.calls),
+                'statuses': {str(k): v for k, v in self.statuses.items()},
+                'pending_updates': len(self._updates),
+                'config': self.config.to_dict()
+            }
+
+def make_handler(fake: FakeTelegram):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, format, *args):
+            pass
+
+        def _params(self) -> Dict:
+            url = urlsplit(self.path)
+            params = dict(parse_qsl(url.query, keep_blank_values=True))
+            length = int(self.headers.get('Content-Length') or 0)
+            body = self.rfile.read(length) if length else b''
+            content_type = self.headers.get('Content-Type', '')
+            if body and content_type.startswith('application/json'):
+                params.update(json.loads(body))
+            elif body and content_type.startswith('application/x-www-form-urlencoded'):
+                params.update(parse_qsl(body.decode('utf-8'), keep_blank_values=True))
+            # multipart (fayllar) tanasi o'qiladi, lekin saqlanmaydi
+            return params
+
+        def _send(self, status: int, body: Dict):
+            data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _dispatch(self):
+            path = urlsplit(self.path).path.strip('/')
+            params = self._params()
+            parts = path.split('/')
+            if parts[0] == '_control':
+                return self._control(parts[1] if len(parts) > 1 else '', params)
+            if len(parts) != 2 or not parts[0].startswith('bot'):
+                return self._send(404, {'ok': False, 'error_code': 404, 'description': 'Not Found'})
+            status, body = fake.handle(parts[1], params)
+            self._send(status, body)
+
+        def _control(self, action: str, params: Dict):
+            if action == 'updates':
+                ids = [fake.push_update({k: v for k, v in u.items() if not k.startswith('_')},
+                                        u.get('_chat_id', 0), u.get('_kind', '')) for u in params.get('updates', [])]
+                return self._send(200, {'ok': True, 'update_ids': ids})
+            if action == 'config':
+                fake.config.update({k: v for k, v in params.items() if not k.startswith('_')})
+                return self._send(200, {'ok': True, 'config': fake.config.to_dict()})
+            if action == 'reset':
+                fake.reset()
+                return self._send(200, {'ok': True})
+            if action == 'stats':
+                return self._send(200, {'ok': True, 'result': fake.stats()})
+            return self._send(404, {'ok': False, 'description': 'Unknown control action'})
+
+        do_GET = _dispatch
+        do_POST = _dispatch
+
+    return Handler
+
+def serve(fake: FakeTelegram, host: str = '127.0.0.1', port: int = 0) -> ThreadingHTTPServer:
+    """Fon threadida server; server.server_address[1] - port"""
+    server = ThreadingHTTPServer((host, port), make_handler(fake))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='fake-telegram', daemon=True).start()
+    return server
+
+def add_config_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument('--latency-ms', type=float, default=30.0, help="O'rtacha javob kechikishi")
+    parser.add_argument('--jitter-ms', type=float, default=10.0)
+    parser.add_argument('--error-rate', type=float, default=0.0, help="500 javoblar ulushi")
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help="Tasodifiy 429 javoblar ulushi")
+    parser.add_argument('--retry-after', type=int, default=3)
+    parser.add_argument('--enforce-limits', action='store_true', help="Telegram limitlarini (1/s chat, 30/s jami) qo'llash")
+    parser.add_argument('--member-status', default='member', help="getChatMember natijasi (kanal obunasi)")
+
+def config_from_args(args) -> FakeConfig:
+    return FakeConfig(args.latency_ms, args.jitter_ms, args.error_rate, args.rate_limit_rate,
+                      args.retry_after, args.enforce_limits, args.member_status)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Lokal Telegram Bot API o'rinbosari")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8081)
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    fake = FakeTelegram(config_from_args(args))
+    server = serve(fake, args.host, args.port)
+    print(f"🤖 Fake Bot API: http://{args.host}:{server.server_address[1]}/bot{{token}}/{{method}}")
+    print(f"   TELEGRAM_API_URL=http://{args.host}:{server.server_address[1]}/bot{{0}}/{{1}}")
+    try:
+        while True:
+            time.sleep(10)
+            print(f"   {fake.stats()['calls']}")
+    except KeyboardInterrupt:
+        server.shutdown()
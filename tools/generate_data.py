@@ -0,0 +1,171 @@
+# tools/generate_data.py - Yuklama testlari uchun sintetik (realistik) ma'lumotlar to'plami
+#
+#   python -m tools.generate_data --users 200000 --out data/synthetic
+#   python -m tools.bulk_import data/synthetic
+import argparse
+import csv
+import os
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterator
+
+import pytz
+
+USER_FIELDS = ['user_id', 'username', 'first_name', 'last_name', 'phone', 'bio',
+               'gender', 'birth_date', 'joined_at', 'last_seen', 'status']
+STARTUP_FIELDS = ['id', 'name', 'description', 'logo', 'group_link', 'owner_id', 'status',
+                  'created_at', 'started_at', 'ended_at', 'results']
+MEMBER_FIELDS = ['startup_id', 'user_id', 'status', 'joined_at']
+
+MALE_NAMES = ['Ozodbek', 'Jasur', 'Sardor', 'Bekzod', 'Aziz', 'Javohir', 'Shohruh', 'Akmal', 'Doston', 'Otabek',
+              'Sherzod', 'Islom', 'Ulugbek', 'Timur', 'Asadbek', 'Muhammadali', 'Abdulloh', 'Nodir']
+FEMALE_NAMES = ['Madina', 'Dilnoza', 'Nilufar', 'Malika', 'Sevara', 'Shahzoda', 'Kamola', 'Zarina', 'Gulnoza',
+                'Mohira', 'Sitora', 'Munisa', 'Dildora', 'Nodira']
+SURNAMES = ['Karimov', 'Rahimov', 'Tursunov', 'Aliyev', 'Yusupov', "Qodirov", 'Ismoilov', 'Abdullayev',
+            'Xolmatov', 'Nazarov', 'Ergashev', 'Saidov', 'Usmonov', 'Mirzayev', 'Sobirov']
+BIOS = ['Python dasturchi', 'Dizayner', 'Marketolog', 'Talaba', 'Mobil dasturchi', 'Frontend dasturchi',
+        'Data analyst', 'Tadbirkor', 'Product manager', 'SMM mutaxassis', '']
+STARTUP_WORDS = ['Edu', 'Agro', 'Med', 'Pay', 'Food', 'Eco', 'Smart', 'Travel', 'Job', 'Build', 'Auto', 'Kids']
+STARTUP_SUFFIXES = ['Hub', 'Tech', 'Lab', 'Go', 'Uz', 'Box', 'Mate', 'Point', 'Net', 'Pro']
+
+# Holatlar taqsimoti (real botdagi nisbatlarga yaqin)
+USER_STATUSES = [('active', 0.93), ('blocked', 0.05), ('inactive', 0.02)]
+STARTUP_STATUSES = [('active', 0.45), ('pending', 0.2), ('completed', 0.2), ('rejected', 0.15)]
+MEMBER_STATUSES = [('accepted', 0.7), ('pending', 0.2), ('rejected', 0.1)]
+
+TZ = pytz.timezone('Asia/Tashkent')
+
+def _weighted(rng: random.Random, choices):
+    point = rng.random()
+    for value, weight in choices:
+        point -= weight
+        if point <= 0:
+            return value
+    return choices[-1][0]
+
+def _timestamp(value: datetime) -> str:
+    return value.isoformat(timespec='seconds')
+
+def iter_users(count: int, days: int, rng: random.Random, first_user_id: int = 100000000) -> Iterator[Dict]:
+    """Foydalanuvchilar; qo'shilish vaqti o'sib boruvchi (oxirgi kunlarda ko'proq)"""
+    now = datetime.now(TZ)
+    start = now - timedelta(days=days)
+    for i in range(count):
+        gender = 'Erkak' if rng.random() < 0.6 else 'Ayol'
+        first_name = rng.choice(MALE_NAMES if gender == 'Erkak' else FEMALE_NAMES)
+        last_name = rng.choice(SURNAMES) + ('a' if gender == 'Ayol' else '')
+        # sqrt - vaqt bo'yicha o'sib boruvchi auditoriya
+        joined = start + timedelta(seconds=days * 86400 * (rng.random() ** 0.5))
+        last_seen = joined + timedelta(seconds=rng.random() * (now - joined).total_seconds())
+        yield {
+            'user_id': first_user_id + i,
+            'username': f"{first_name.lower()}_{i}" if rng.random() < 0.8 else '',
+            'first_name': first_name,
+            'last_name': last_name,
+            'phone': f"+99890{rng.randrange(10 ** 7):07d}" if rng.random() < 0.85 else '',
+            'bio': rng.choice(BIOS),
+            'gender': gender if rng.random() < 0.7 else '',
+            # Bot formati: KK-OO-YYYY
+            'birth_date': f"{rng.randint(1, 28):02d}-{rng.randint(1, 12):02d}-{rng.randint(1985, 2008)}" if rng.random() < 0.5 else '',
+            'joined_at': _timestamp(joined),
+            'last_seen': _timestamp(last_seen),
+            'status': _weighted(rng, USER_STATUSES)
+        }
+
+def iter_startups(count: int, user_ids, rng: random.Random) -> Iterator[Dict]:
+    """Startaplar; egasi mavjud foydalanuvchilardan, vaqtlari egasi qo'shilgandan keyin"""
+    now = datetime.now(TZ)
+    for startup_id in range(1, count + 1):
+        owner_id, owner_joined = user_ids[rng.randrange(len(user_ids))]
+        created = owner_joined + timedelta(seconds=rng.random() * (now - owner_joined).total_seconds())
+        status = _weighted(rng, STARTUP_STATUSES)
+        started = ended = None
+        if status in ('active', 'completed'):
+            started = min(now, created + timedelta(hours=rng.randint(1, 72)))
+        if status == 'completed':
+            ended = min(now, started + timedelta(days=rng.randint(7, 120)))
+        name = f"{rng.choice(STARTUP_WORDS)}{rng.choice(STARTUP_SUFFIXES)} {startup_id}"
+        yield {
+            'id': startup_id,
+            'name': name,
+            'description': f"{name} - {rng.choice(BIOS) or 'jamoa'} uchun platforma. " * rng.randint(1, 4),
+            'logo': '',
+            'group_link': f"https://t.me/+startup{startup_id}",
+            'owner_id': owner_id,
+            'status': status,
+            'created_at': _timestamp(created),
+            'started_at': _timestamp(started) if started else '',
+            'ended_at': _timestamp(ended) if ended else '',
+            'results': 'Natijalar: MVP ishga tushirildi' if status == 'completed' else ''
+        }
+
+def iter_members(startups, user_ids, members_per_startup: float, rng: random.Random) -> Iterator[Dict]:
+    """A'zoliklar; har startapda o'rtacha members_per_startup ta, (startup_id, user_id) takrorlanmaydi"""
+    now = datetime.now(TZ)
+    for startup_id, owner_id, created in startups:
+        count = min(len(user_ids) - 1, int(rng.expovariate(1 / members_per_startup)))
+        seen = {owner_id}
+        for _ in range(count):
+            user_id, _ = user_ids[rng.randrange(len(user_ids))]
+            if user_id in seen:
+                continue
+            seen.add(user_id)
+            yield {
+                'startup_id': startup_id,
+                'user_id': user_id,
+                'status': _weighted(rng, MEMBER_STATUSES),
+                'joined_at': _timestamp(min(now, created + timedelta(hours=rng.randint(1, 240))))
+            }
+
+def _write(path: str, fields, rows) -> int:
+    count = 0
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+def generate(directory: str, users: int, startups_per_user: float = 0.1, members_per_startup: float = 4.0,
+             days: int = 365, seed: int = 42) -> Dict[str, int]:
+    """users.csv, startups.csv, startup_members.csv fayllarini yaratish (tools.bulk_import formati)"""
+    os.makedirs(directory, exist_ok=True)
+    rng = random.Random(seed)
+
+    user_ids = []
+
+    def users_with_ids():
+        for row in iter_users(users, days, rng):
+            user_ids.append((row['user_id'], datetime.fromisoformat(row['joined_at'])))
+            yield row
+
+    counts = {'users': _write(os.path.join(directory, 'users.csv'), USER_FIELDS, users_with_ids())}
+
+    startups = []
+
+    def startups_with_ids():
+        for row in iter_startups(max(1, int(users * startups_per_user)), user_ids, rng):
+            startups.append((row['id'], row['owner_id'], datetime.fromisoformat(row['created_at'])))
+            yield row
+
+    counts['startups'] = _write(os.path.join(directory, 'startups.csv'), STARTUP_FIELDS, startups_with_ids())
+    counts['startup_members'] = _write(os.path.join(directory, 'startup_members.csv'), MEMBER_FIELDS,
+                                       iter_members(startups, user_ids, members_per_startup, rng))
+    return counts
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Sintetik ma'lumotlar generatori")
+    parser.add_argument('--users', type=int, default=100000)
+    parser.add_argument('--startups-per-user', type=float, default=0.1)
+    parser.add_argument('--members-per-startup', type=float, default=4.0)
+    parser.add_argument('--days', type=int, default=365, help="Qo'shilish sanalari oralig'i (kun)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--out', default='data/synthetic')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    counts = generate(args.out, args.users, args.startups_per_user, args.members_per_startup, args.days, args.seed)
+    elapsed = time.perf_counter() - start
+    print(f"✅ {args.out}: " + ', '.join(f"{table} {count}" for table, count in counts.items()) + f" ({elapsed:.1f}s)")
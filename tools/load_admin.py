@@ -0,0 +1,235 @@
+# tools/load_admin.py - Admin API (server.py) uchun yuklama testi: dashboard trafigi N ta admin bilan
+#
+#   python -m tools.load_admin --admins 20 --duration 60                 # vaqtinchalik PostgreSQL + seed + Flask
+#   python -m tools.load_admin --dsn postgresql://... --admins 50
+#   python -m tools.load_admin --dsn postgresql://... --populate --scale 100k   # avval to'ldirish
+#   python -m tools.load_admin --url http://127.0.0.1:5000 --password admin123 --admins 10
+#
+# Har admin /api/login orqali kiradi va static/js/app.js kabi dashboardni yuklaydi: avval /api/statistics,
+# keyin grafiklar va jadvallar parallel. DB chaqiruvlari va SQL so'rovlari soni Server-Timing headeridan olinadi.
+import argparse
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import requests
+
+from tools.bench_db import SCALES, TempPostgres, _git_commit, _percentile, seed
+
+# Dashboard ochilganda: birinchi so'rov, keyin parallel so'rovlar (brauzer kabi)
+DASHBOARD_FIRST = ('statistics', '/api/statistics')
+DASHBOARD_PARALLEL = [
+    ('user-growth', '/api/analytics/user-growth?period={period}'),
+    ('startup-distribution', '/api/analytics/startup-distribution'),
+    ('users', '/api/users?page={page}&search={search}&filter=all'),
+    ('startups', '/api/startups?page={page}&search={search}&status=all')
+]
+PERIODS = ['week', 'month', 'year']
+SEARCHES = ['', '', '', 'Edu', 'Tech', 'ozodbek']
+
+# Server-Timing: total;dur=12.3, db;desc="4";dur=8.1, sql;desc="6";dur=7.2
+_TIMING_RE = re.compile(r'(\w+);desc="(\d+)"')
+
+class Admin:
+    """Bitta admin: o'z sessiyasi (cookie) va ETag keshi bilan"""
+
+    def __init__(self, base_url: str, username: str, password: str, rng: random.Random, revalidate: bool):
+        self.base_url = base_url.rstrip('/')
+        self.username = username
+        self.password = password
+        self.rng = rng
+        self.revalidate = revalidate
+        self.session = requests.Session()
+        self._etags = {}
+
+    def login(self):
+        response = self.session.post(f"{self.base_url}/api/login",
+                                     json={'username': self.username, 'password': self.password}, timeout=30)
+        if response.status_code != 200:
+            raise RuntimeError(f"Login xatosi: {response.status_code} {response.text[:200]}")
+
+    def get(self, path: str) -> Dict:
+        headers = {}
+        if self.revalidate and path in self._etags:
+            headers['If-None-Match'] = self._etags[path]
+        start = time.perf_counter()
+        try:
+            response = self.session.get(f"{self.base_url}{path}", headers=headers, timeout=60)
+            body_size = len(response.content)
+        except requests.RequestException as e:
+            return {'duration': time.perf_counter() - start, 'status': type(e).__name__, 'bytes': 0, 'timing': {}}
+        duration = time.perf_counter() - start
+        if self.revalidate and response.headers.get('ETag'):
+            self._etags[path] = response.headers['ETag']
+        timing = {kind: int(count) for kind, count in _TIMING_RE.findall(response.headers.get('Server-Timing', ''))}
+        return {'duration': duration, 'status': response.status_code, 'bytes': body_size, 'timing': timing}
+
+    def dashboard_requests(self) -> List[tuple]:
+        values = {'period': self.rng.choice(PERIODS), 'page': self.rng.choice([1, 1, 1, 2, 3]),
+                  'search': self.rng.choice(SEARCHES)}
+        return [(name, path.format(**values)) for name, path in DASHBOARD_PARALLEL]
+
+class Recorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+        self.timing = defaultdict(Counter)
+        self.bytes = Counter()
+
+    def add(self, name: str, result: Dict):
+        with self._lock:
+            self.samples[name].append(result['duration'])
+            self.statuses[name][result['status']] += 1
+            self.timing[name].update(result['timing'])
+            self.bytes[name] += result['bytes']
+
+    def report(self, elapsed: float) -> Dict:
+        results = {}
+        for name, durations in self.samples.items():
+            count = len(durations)
+            entry = {
+                'count': count,
+                'rps': round(count / elapsed, 2),
+                'statuses': {str(status): n for status, n in self.statuses[name].items()},
+                'avg_kb': round(self.bytes[name] / count / 1024, 2)
+            }
+            for q in (50, 90, 99):
+                entry[f"p{q}_ms"] = round(_percentile(durations, q / 100) * 1000, 2)
+            entry['max_ms'] = round(max(durations) * 1000, 2)
+            # Bitta so'rovga o'rtacha DB funksiya chaqiruvlari / SQL so'rovlar
+            for kind in ('db', 'sql'):
+                entry[f"{kind}_per_request"] = round(self.timing[name][kind] / count, 2)
+            results[name] = entry
+        return results
+
+def run_admin(admin: Admin, recorder: Recorder, stop_at: float, think: float, parallel: int):
+    # Brauzer bitta hostga ~6 ta parallel ulanish ochadi
+    with ThreadPoolExecutor(max_workers=parallel) as pool:
+        while time.perf_counter() < stop_at:
+            start = time.perf_counter()
+            recorder.add(DASHBOARD_FIRST[0], admin.get(DASHBOARD_FIRST[1]))
+            futures = [(name, pool.submit(admin.get, path)) for name, path in admin.dashboard_requests()]
+            for name, future in futures:
+                recorder.add(name, future.result())
+            recorder.add('dashboard (jami)', {'duration': time.perf_counter() - start, 'status': 200,
+                                              'bytes': 0, 'timing': {}})
+            if think:
+                time.sleep(admin.rng.expovariate(1 / think))
+
+def load(base_url: str, args) -> Dict:
+    rng = random.Random(args.seed)
+    admins = [Admin(base_url, args.username, args.password, random.Random(rng.random()), args.revalidate)
+              for _ in range(args.admins)]
+    for admin in admins:
+        admin.login()
+
+    recorder = Recorder()
+    print(f"🚀 {args.admins} admin, {args.duration}s, think {args.think_ms}ms -> {base_url}")
+    start = time.perf_counter()
+    stop_at = start + args.duration
+    threads = []
+    for admin in admins:
+        thread = threading.Thread(target=run_admin, args=(admin, recorder, stop_at, args.think_ms / 1000, args.parallel),
+                                  daemon=True)
+        threads.append(thread)
+        thread.start()
+        # Bir vaqtda emas - ramp davomida tekis qo'shiladi
+        if args.ramp:
+            time.sleep(args.ramp / args.admins)
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    results = recorder.report(elapsed)
+    total = sum(entry['count'] for name, entry in results.items() if name != 'dashboard (jami)')
+    print(f"\n⏱️ {total} so'rov {elapsed:.1f}s da ({total / elapsed:.1f} req/s)")
+    for name, entry in sorted(results.items()):
+        errors = sum(n for status, n in entry['statuses'].items() if status not in ('200', '304'))
+        print(f"  {name:<22} {entry['count']:6} {entry['rps']:7.1f}/s  p50 {entry['p50_ms']:8.1f}  p90 {entry['p90_ms']:8.1f}"
+              f"  p99 {entry['p99_ms']:8.1f} ms  db {entry['db_per_request']:5.1f}  sql {entry['sql_per_request']:5.1f}"
+              f"  {entry['avg_kb']:7.1f} KB  xato {errors}")
+    return {
+        'meta': {
+            'commit': _git_commit(),
+            'url': base_url,
+            'admins': args.admins,
+            'duration': args.duration,
+            'think_ms': args.think_ms,
+            'revalidate': args.revalidate,
+            'timestamp': datetime.now().isoformat(timespec='seconds')
+        },
+        'throughput_rps': round(total / elapsed, 2),
+        'results': results
+    }
+
+def serve_app(dsn: str, password: str):
+    """server.py ni shu jarayonda (threaded werkzeug) ishga tushirish; (server, base_url)"""
+    from werkzeug.serving import make_server
+
+    os.environ['DATABASE_URL'] = dsn
+    os.environ['ADMIN_PASSWORD'] = password
+    # Broadcast/bot kerak emas; query log shovqinini o'chirish
+    os.environ['BOT_TOKEN'] = ''
+    os.environ.setdefault('DB_SLOW_QUERY_MS', '1000000')
+    import server as flask_server
+
+    flask_server.db_instance.on_connect(flask_server.init_db)
+    if not flask_server.is_db_ready():
+        raise RuntimeError("PostgreSQL ga ulanib bo'lmadi")
+    http_server = make_server('127.0.0.1', 0, flask_server.app, threaded=True)
+    threading.Thread(target=http_server.serve_forever, name='load-admin-server', daemon=True).start()
+    return http_server, f"http://127.0.0.1:{http_server.server_port}"
+
+def run(dsn: Optional[str], args) -> Dict:
+    http_server, base_url = serve_app(dsn, args.password)
+    try:
+        return load(base_url, args)
+    finally:
+        http_server.shutdown()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Admin API yuklama testi")
+    parser.add_argument('--url', help="Ishlab turgan server (berilmasa server.py shu jarayonda ishga tushiriladi)")
+    parser.add_argument('--dsn', help="Mavjud PostgreSQL (berilmasa vaqtinchalik klaster yaratiladi)")
+    parser.add_argument('--populate', action='store_true',
+                        help="--dsn bazasini sintetik to'plam bilan to'ldirish (mavjud ma'lumotlarga yoziladi)")
+    parser.add_argument('--scale', default='10k', help=f"Seed foydalanuvchilar: {', '.join(SCALES)} yoki son")
+    parser.add_argument('--admins', type=int, default=10, help="Bir vaqtdagi adminlar")
+    parser.add_argument('--duration', type=float, default=30.0)
+    parser.add_argument('--ramp', type=float, default=0.0, help="Adminlarni shu soniyalar ichida qo'shish")
+    parser.add_argument('--think-ms', type=float, default=0.0, help="Dashboard yuklamalari orasidagi o'rtacha pauza")
+    parser.add_argument('--parallel', type=int, default=6, help="Admin boshiga parallel so'rovlar")
+    parser.add_argument('--revalidate', action='store_true', help="ETag bilan qayta so'rash (brauzer keshi kabi)")
+    parser.add_argument('--username', default='admin')
+    parser.add_argument('--password', default=os.getenv('ADMIN_PASSWORD', 'admin123'))
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--out', help="Natijani JSON faylga yozish")
+    parser.add_argument('--keep', action='store_true', help="Vaqtinchalik klaster papkasini o'chirmaslik")
+    args = parser.parse_args()
+
+    users = SCALES.get(args.scale.lower()) or int(args.scale)
+
+    if args.url:
+        report = load(args.url, args)
+    elif args.dsn:
+        if args.populate:
+            seed(args.dsn, users, args.seed)
+        report = run(args.dsn, args)
+    else:
+        with TempPostgres(keep=args.keep) as dsn:
+            seed(dsn, users, args.seed)
+            report = run(dsn, args)
+
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 {args.out}")
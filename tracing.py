@@ -0,0 +1,284 @@
+# tracing.py - So'rov darajasidagi tracing: route -> db funksiyalari -> SQL -> Telegram API
+import contextvars
+import inspect
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from functools import wraps
+from typing import Dict, Optional
+
+import query_log
+from metrics import wrap_bot_handlers
+
+logger = logging.getLogger(__name__)
+
+# Shundan uzoq davom etgan tracelar log qilinadi va eksport qilinadi (millisekund)
+TRACE_SLOW_MS = float(os.getenv('TRACE_SLOW_MS', 500))
+# Eksport manzili: fayl yo'li (JSON lines) yoki http(s):// collector; bo'sh bo'lsa eksport yo'q
+TRACE_EXPORT = os.getenv('TRACE_EXPORT', '')
+# TRACE_EXPORT_ALL=1 - sekin bo'lmagan tracelar ham eksport qilinadi
+TRACE_EXPORT_ALL = os.getenv('TRACE_EXPORT_ALL', '').lower() in ('1', 'true', 'yes')
+# Bitta tracedagi spanlar chegarasi (broadcast kabi uzun jarayonlar xotirani to'ldirmasligi uchun)
+MAX_SPANS = int(os.getenv('TRACE_MAX_SPANS', 1000))
+
+_current = contextvars.ContextVar('trace_span', default=None)
+
+class Trace:
+    """Bitta trace: span soni va tur (kind) bo'yicha jami vaqt"""
+    __slots__ = ('trace_id', 'span_count', 'dropped', 'totals', '_lock')
+
+    def __init__(self):
+        self.trace_id = uuid.uuid4().hex
+        self.span_count = 0
+        self.dropped = 0
+        self.totals: Dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def account(self, kind: str, duration: float):
+        with self._lock:
+            total = self.totals.get(kind)
+            if total is None:
+                self.totals[kind] = [1, duration]
+            else:
+                total[0] += 1
+                total[1] += duration
+
+    def reserve(self) -> bool:
+        """Yangi span uchun joy; chegaradan keyin faqat jami vaqt hisoblanadi"""
+        with self._lock:
+            if self.span_count >= MAX_SPANS:
+                self.dropped += 1
+                return False
+            self.span_count += 1
+            return True
+
+class Span:
+    __slots__ = ('trace', 'name', 'kind', 'attrs', 'start', 'duration', 'children', 'root_start')
+
+    def __init__(self, trace: Trace, name: str, kind: str, attrs: Dict, root_start: Optional[float] = None,
+                 start: Optional[float] = None):
+        self.trace = trace
+        self.name = name
+        self.kind = kind
+        self.attrs = attrs
+        self.start = time.perf_counter() if start is None else start
+        self.root_start = self.start if root_start is None else root_start
+        self.duration = None
+        self.children = []
+
+    def child(self, name: str, kind: str, attrs: Dict, start: Optional[float] = None) -> 'Span':
+        span = Span(self.trace, name, kind, attrs, self.root_start, start)
+        if self.trace.reserve():
+            self.children.append(span)
+        return span
+
+    def finish(self, duration: Optional[float] = None):
+        self.duration = time.perf_counter() - self.start if duration is None else duration
+
+    def to_dict(self) -> Dict:
+        data = {
+            'name': self.name,
+            'kind': self.kind,
+            'start_ms': round((self.start - self.root_start) * 1000, 3),
+            'duration_ms': round((self.duration or 0) * 1000, 3)
+        }
+        if self.attrs:
+            data['attrs'] = self.attrs
+        if self.children:
+            data['children'] = [child.to_dict() for child in list(self.children)]
+        return data
+
+def current_span() -> Optional[Span]:
+    return _current.get()
+
+def current_trace_id() -> Optional[str]:
+    span = _current.get()
+    return span.trace.trace_id if span is not None else None
+
+def start_trace(name: str, kind: str = 'request', **attrs):
+    """Root span ochish; (span, token) qaytaradi - finish_trace ga beriladi"""
+    root = Span(Trace(), name, kind, attrs)
+    return root, _current.set(root)
+
+def finish_trace(root: Span, token, **attrs) -> Span:
+    """Root span ni yopish va eksportga berish; attrs (masalan status) eksportdan oldin qo'shiladi"""
+    root.attrs.update(attrs)
+    root.finish()
+    try:
+        _current.reset(token)
+    except ValueError:
+        # Boshqa kontekstda yopilmoqda
+        _current.set(None)
+    _report(root)
+    return root
+
+@contextmanager
+def trace(name: str, kind: str = 'job', **attrs):
+    """Fon ishlari va bot handlerlari uchun root span (ichida allaqachon trace bo'lsa - child span)"""
+    if _current.get() is not None:
+        with span(name, kind, **attrs) as child:
+            yield child
+        return
+    root, token = start_trace(name, kind, **attrs)
+    try:
+        yield root
+    finally:
+        finish_trace(root, token)
+
+@contextmanager
+def span(name: str, kind: str = 'internal', **attrs):
+    """Joriy span ichida child span; trace yo'q bo'lsa hech narsa qilmaydi"""
+    parent = _current.get()
+    if parent is None:
+        yield None
+        return
+    child = parent.child(name, kind, attrs)
+    token = _current.set(child)
+    try:
+        yield child
+    finally:
+        child.finish()
+        _current.reset(token)
+        parent.trace.account(kind, child.duration)
+
+def record_span(name: str, kind: str, duration: float, **attrs):
+    """Tugagan amal (masalan SQL) ni joriy spanga qo'shish"""
+    parent = _current.get()
+    if parent is None:
+        return
+    child = parent.child(name, kind, attrs, start=time.perf_counter() - duration)
+    child.finish(duration)
+    parent.trace.account(kind, duration)
+
+def bind(fn):
+    """Joriy trace kontekstini fon thread/executor ga o'tkazish: Thread(target=bind(fn))"""
+    context = contextvars.copy_context()
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        return context.copy().run(fn, *args, **kwargs)
+    return wrapper
+
+def _on_query(event):
+    if _current.get() is not None:
+        record_span('sql', 'sql', event.duration, statement=event.normalized, rows=event.rows,
+                    **({'error': event.error} if event.error else {}))
+
+query_log.add_listener(_on_query)
+
+# =========== HISOBOT VA EKSPORT ===========
+
+def summary(root: Span) -> Dict[str, Dict]:
+    """Tur bo'yicha: {'db': {'count': 3, 'duration_ms': 12.5}, ...}"""
+    return {
+        kind: {'count': count, 'duration_ms': round(duration * 1000, 2)}
+        for kind, (count, duration) in root.trace.totals.items()
+    }
+
+def server_timing(root: Span) -> str:
+    """Server-Timing header qiymati (brauzer DevTools da ko'rinadi)"""
+    duration = root.duration if root.duration is not None else time.perf_counter() - root.start
+    parts = [f'total;dur={duration * 1000:.1f}']
+    for kind, (count, kind_duration) in sorted(root.trace.totals.items()):
+        parts.append(f'{kind};desc="{count}";dur={kind_duration * 1000:.1f}')
+    return ', '.join(parts)
+
+def _report(root: Span):
+    duration_ms = root.duration * 1000
+    slow = duration_ms >= TRACE_SLOW_MS
+    if slow:
+        counts = ', '.join(f"{kind} {item['count']} ta ({item['duration_ms']}ms)" for kind, item in summary(root).items())
+        logger.warning(f"Sekin trace {root.trace.trace_id}: {root.name} {duration_ms:.1f}ms; {counts or 'ichki spanlarsiz'}")
+    if _exporter is not None and (slow or TRACE_EXPORT_ALL):
+        _exporter.submit(root)
+
+class Exporter:
+    """Tracelarni fon threadida faylga (JSON lines) yoki HTTP collector ga yuborish"""
+
+    def __init__(self, target: str, max_queue: int = 1000):
+        self.target = target
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, name='trace-exporter', daemon=True)
+        self._thread.start()
+
+    def submit(self, root: Span):
+        record = {
+            'trace_id': root.trace.trace_id,
+            'timestamp': time.time(),
+            'duration_ms': round(root.duration * 1000, 3),
+            'summary': summary(root),
+            'dropped_spans': root.trace.dropped,
+            'root': root.to_dict()
+        }
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            logger.debug("Trace navbati to'la, trace tashlandi")
+
+    def _run(self):
+        while True:
+            record = self._queue.get()
+            try:
+                if self.target.startswith(('http://', 'https://')):
+                    import requests
+                    requests.post(self.target, json=record, timeout=5)
+                else:
+                    with open(self.target, 'a', encoding='utf-8') as f:
+                        f.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+            except Exception as e:
+                logger.debug(f"Trace eksport xatosi: {e}")
+
+_exporter = Exporter(TRACE_EXPORT) if TRACE_EXPORT else None
+
+# =========== INTEGRATSIYALAR ===========
+
+def init_app(app):
+    """Flask: har so'rov uchun root span, X-Response-Time, Server-Timing va X-Trace-Id headerlari"""
+    from flask import g, request
+
+    @app.before_request
+    def _start_request_trace():
+        route = request.url_rule.rule if request.url_rule is not None else request.path
+        g._trace = start_trace(f"{request.method} {route}", 'http', path=request.path)
+
+    @app.after_request
+    def _finish_request_trace(response):
+        state = g.pop('_trace', None)
+        if state is None:
+            return response
+        root = finish_trace(*state, status=response.status_code)
+        response.headers['X-Response-Time'] = f"{root.duration * 1000:.1f}ms"
+        response.headers['Server-Timing'] = server_timing(root)
+        response.headers['X-Trace-Id'] = root.trace.trace_id
+        return response
+
+    @app.teardown_request
+    def _drop_request_trace(exc):
+        # after_request ishlamagan holatlar uchun
+        state = g.pop('_trace', None)
+        if state is not None:
+            finish_trace(*state, **({'status': 500} if exc is not None else {}))
+
+def instrument_bot(bot):
+    """Har bir bot handleri alohida trace (handler -> db -> SQL -> Telegram)"""
+    def make_wrapper(fn):
+        name = f"bot.{fn.__name__}"
+
+        if inspect.iscoroutinefunction(fn):
+            @wraps(fn)
+            async def wrapper(*args, **kwargs):
+                with trace(name, 'bot'):
+                    return await fn(*args, **kwargs)
+        else:
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                with trace(name, 'bot'):
+                    return fn(*args, **kwargs)
+        return wrapper
+
+    wrap_bot_handlers(bot, make_wrapper, '_trace_wrapped')